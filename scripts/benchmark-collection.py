@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# -----------------------------------------------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# -----------------------------------------------------------------------------------------------------------
+"""
+Benchmark how the collection helpers used by the hooks scale with the size of the packages they collect.
+
+For each size (a number of modules), a synthetic distribution is generated in a temporary site directory: a package of
+that many modules spread over subpackages nested up to --depth levels, with --data-ratio data files per module and a
+.dist-info directory, next to --distributions other small distributions. With --namespace, the package and the other
+distributions are portions of a namespace package. The helpers of PyInstaller.utils.hooks which the hooks call the
+most, and their replacements in _pyinstaller_hooks_contrib.utils, are then timed on it (the best of --repeat runs).
+
+With --json, the results are appended to the runs of a JSON file, so that they can be tracked over time, and the times
+which grew by more than --tolerance since the last comparable run (same parameters, Python, PyInstaller and platform)
+are reported.
+
+    python scripts/benchmark-collection.py --sizes 100,1000,10000 --json collection-benchmark.json
+    python scripts/benchmark-collection.py --namespace --data-ratio 5 'collect_data_files*'
+"""
+
+import argparse
+import fnmatch
+import importlib
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from PyInstaller import __version__ as pyinstaller_version
+from PyInstaller.utils import hooks as hookutils
+
+from _pyinstaller_hooks_contrib.utils import submodules
+
+NAMESPACE = 'synth_ns'
+DISTRIBUTION = 'synth-pkg'
+# The modules per (sub)package of the generated tree.
+MODULES_PER_PACKAGE = 10
+
+
+def _module_name(name, namespace):
+    return f'{NAMESPACE}.{name}' if namespace else name
+
+
+def _write(path, content, record):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding='utf-8')
+    record.append(path)
+
+
+def _write_dist_info(site_dir, distribution, top_level, record):
+    dist_info = site_dir / f'{distribution.replace("-", "_")}-1.0.dist-info'
+    _write(dist_info / 'METADATA', f'Metadata-Version: 2.1\nName: {distribution}\nVersion: 1.0\n', record)
+    _write(dist_info / 'top_level.txt', top_level + '\n', record)
+    _write(dist_info / 'INSTALLER', 'pip\n', record)
+    record.append(dist_info / 'RECORD')
+    lines = [f'{path.relative_to(site_dir).as_posix()},,' for path in record]
+    (dist_info / 'RECORD').write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def generate_distribution(site_dir, distribution, modules, depth, data_ratio, namespace):
+    """
+    Generate an installed distribution in *site_dir*, with a package of *modules* modules and *modules* × *data_ratio*
+    data files, spread over subpackages nested up to *depth* levels. Return the name of the package.
+    """
+    name = distribution.replace('-', '_')
+    package = _module_name(name, namespace)
+    # The (sub)packages form a complete tree, numbered breadth-first, whose branching is just large enough to hold
+    # them all within *depth* levels.
+    count = max(1, math.ceil(modules / MODULES_PER_PACKAGE))
+    branching = max(2, math.ceil(count**(1 / depth))) if depth else count
+    directories = [site_dir.joinpath(*package.split('.'))]
+    for i in range(1, count if depth else 1):
+        directories.append(directories[(i - 1) // branching] / f'p{i}')
+
+    record = []
+    for i, directory in enumerate(directories):
+        _write(directory / '__init__.py', f'PACKAGE = {i}\n', record)
+    for i in range(modules):
+        _write(directories[i % len(directories)] / f'm{i}.py', f'import os\n\nVALUE = {i}\n', record)
+    for i in range(int(modules * data_ratio)):
+        _write(directories[i % len(directories)] / f'd{i}.json', f'{{"value": {i}}}\n', record)
+    _write_dist_info(site_dir, distribution, package.split('.')[0], record)
+    return package
+
+
+def generate_site(site_dir, modules, depth, data_ratio, distributions, namespace):
+    """
+    Generate the benchmarked distribution and the *distributions* other ones in *site_dir*. Return the name of the
+    benchmarked package.
+    """
+    for i in range(distributions):
+        generate_distribution(site_dir, f'synth-other{i}', 1, 0, 0, namespace)
+    return generate_distribution(site_dir, DISTRIBUTION, modules, depth, data_ratio, namespace)
+
+
+def _helpers(package):
+    """
+    Return the benchmarked helpers, as callables of no argument, by name.
+    """
+    pruned = package + '.p1'
+    return {
+        'collect_submodules': lambda: hookutils.collect_submodules(package),
+        'collect_submodules (filter)': lambda: hookutils.collect_submodules(
+            package, filter=lambda name: not hookutils.is_module_or_submodule(name, pruned)
+        ),
+        'contrib collect_submodules': lambda: submodules.collect_submodules(package),
+        'contrib collect_submodules (prune)': lambda: submodules.collect_submodules(package, prune=pruned),
+        'collect_data_files': lambda: hookutils.collect_data_files(package),
+        'collect_data_files (includes)': lambda: hookutils.collect_data_files(package, includes=['**/d1*.json']),
+        'collect_dynamic_libs': lambda: hookutils.collect_dynamic_libs(package),
+        'copy_metadata': lambda: hookutils.copy_metadata(DISTRIBUTION),
+        'is_module_satisfies': lambda: hookutils.is_module_satisfies(f'{DISTRIBUTION} >= 1.0'),
+    }
+
+
+def _rescan_distributions():
+    # With older setuptools-based versions of PyInstaller, the metadata is looked up in pkg_resources' working set,
+    # which is built from sys.path on import.
+    if 'pkg_resources' in sys.modules:
+        sys.modules['pkg_resources']._initialize_master_working_set()
+
+
+def _forget(site_dir):
+    """
+    Forget the modules imported from *site_dir*, and the cached contents of the directories on sys.path.
+    """
+    for name, module in list(sys.modules.items()):
+        if str(getattr(module, '__file__', None) or '').startswith(str(site_dir)) or \
+                name.split('.')[0] in (NAMESPACE, DISTRIBUTION.replace('-', '_')):
+            del sys.modules[name]
+    importlib.invalidate_caches()
+
+
+def time_helper(helper, site_dir, repeat):
+    """
+    Return the best time of *repeat* calls of *helper*, and the number of entries it returned.
+    """
+    best = math.inf
+    for _ in range(repeat):
+        _forget(site_dir)
+        start = time.perf_counter()
+        result = helper()
+        best = min(best, time.perf_counter() - start)
+    return best, len(result) if isinstance(result, (list, tuple, set)) else None
+
+
+def benchmark(args, size, patterns):
+    site_dir = Path(tempfile.mkdtemp(prefix='pyi-benchmark-collection-'))
+    try:
+        start = time.perf_counter()
+        package = generate_site(site_dir, size, args.depth, args.data_ratio, args.distributions, args.namespace)
+        print(f'Generated {size} modules in {time.perf_counter() - start:.2f} s.', file=sys.stderr)
+        sys.path.insert(0, str(site_dir))
+        _rescan_distributions()
+        results = {}
+        for name, helper in _helpers(package).items():
+            if patterns and not any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+                continue
+            elapsed, entries = time_helper(helper, site_dir, args.repeat)
+            results[name] = {'time': elapsed, 'entries': entries}
+            print(f'  {name}: {elapsed:.3f} s', file=sys.stderr)
+        return results
+    finally:
+        if str(site_dir) in sys.path:
+            sys.path.remove(str(site_dir))
+        _forget(site_dir)
+        _rescan_distributions()
+        shutil.rmtree(site_dir, ignore_errors=True)
+
+
+def _git_revision():
+    try:
+        process = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                 capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return process.stdout.strip()
+
+
+def _last_comparable_run(runs, run):
+    keys = ('parameters', 'python', 'pyinstaller', 'platform')
+    for previous in reversed(runs):
+        if all(previous.get(key) == run[key] for key in keys):
+            return previous
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('patterns', nargs='*', help="Only benchmark the helpers matching these patterns.")
+    parser.add_argument(
+        '--sizes', default='100,1000,10000', help='The numbers of modules, comma-separated (default: %(default)s).'
+    )
+    parser.add_argument(
+        '--depth', type=int, default=3, help='The maximal nesting depth of the subpackages (default: %(default)s).'
+    )
+    parser.add_argument(
+        '--data-ratio', type=float, default=1.0, help='The data files per module (default: %(default)s).'
+    )
+    parser.add_argument(
+        '--distributions', type=int, default=100, help='The number of other distributions (default: %(default)s).'
+    )
+    parser.add_argument('--namespace', action='store_true', help='Make the packages portions of a namespace package.')
+    parser.add_argument('--repeat', type=int, default=3, help='The runs of each helper (default: %(default)s).')
+    parser.add_argument('--json', metavar='FILE', help='Append the results to the runs in the JSON file FILE.')
+    parser.add_argument(
+        '--tolerance', type=float, default=0.2,
+        help='The relative growth of the times reported, compared with FILE (default: %(default)s).'
+    )
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    results = {}
+    for size in sizes:
+        for name, result in benchmark(args, size, args.patterns).items():
+            results.setdefault(name, {})[str(size)] = result
+
+    run = {
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'revision': _git_revision(),
+        'pyinstaller': pyinstaller_version,
+        'python': '%d.%d' % sys.version_info[:2],
+        'platform': sys.platform,
+        'parameters': {
+            'depth': args.depth, 'data_ratio': args.data_ratio, 'distributions': args.distributions,
+            'namespace': args.namespace, 'repeat': args.repeat
+        },
+        'results': results,
+    }
+    previous = None
+    if args.json:
+        history = {'runs': []}
+        if os.path.exists(args.json):
+            with open(args.json, encoding='utf-8') as f:
+                history = json.load(f)
+        previous = _last_comparable_run(history['runs'], run)
+        history['runs'].append(run)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(history, f, indent=1, sort_keys=True)
+
+    print(f'{"helper (time in s)":36}' + ''.join(f'{size:>10}' for size in sizes))
+    for name, by_size in results.items():
+        print(f'{name:36}' + ''.join(f'{by_size[str(size)]["time"]:10.3f}' for size in sizes))
+    if previous is not None:
+        print(f'\nCompared with the run of {previous["date"]} ({previous["revision"] or "unknown revision"}):')
+        slower = False
+        for name, by_size in results.items():
+            for size, result in by_size.items():
+                old = previous['results'].get(name, {}).get(size)
+                if old and result['time'] > old['time'] * (1 + args.tolerance):
+                    slower = True
+                    print(f'  {name} with {size} modules: {old["time"]:.3f} s -> {result["time"]:.3f} s '
+                          f'({(result["time"] / old["time"] - 1) * 100:+.0f}%)')
+        if not slower:
+            print('  no helper got slower.')
+
+
+if __name__ == '__main__':
+    main()
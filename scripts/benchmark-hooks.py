@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+# -----------------------------------------------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# -----------------------------------------------------------------------------------------------------------
+"""
+Benchmark the evaluation of the hooks in hooks/stdhooks, without running PyInstaller builds.
+
+Each hook is loaded in turn, and its hook() function (if any) is called with a stand-in hook_api, while the helper
+functions of PyInstaller.utils.hooks, PyInstaller.compat, PyInstaller.isolated and _pyinstaller_hooks_contrib.utils
+which the hooks import are replaced with recording wrappers. The harness reports the evaluation time of each hook, the
+calls it made to each helper, the time spent in them, and the subprocesses they started.
+
+In the "real" mode (the default), the wrappers forward the calls to the helpers, and can save their results with
+--record. In the "replay" mode, they return the results saved by an earlier run, so that the remaining evaluation time
+is the hooks' own, independent of the installed packages; the calls which were not recorded are forwarded, and reported
+as misses.
+
+    python scripts/benchmark-hooks.py --record hook-calls.pickle --json real.json
+    python scripts/benchmark-hooks.py --replay hook-calls.pickle --json replay.json 'hook-[a-m]*'
+"""
+
+import argparse
+import fnmatch
+import functools
+import importlib
+import importlib.util
+import inspect
+import json
+import logging
+import pickle
+import pkgutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+import _pyinstaller_hooks_contrib.utils
+from _pyinstaller_hooks_contrib.hooks import stdhooks
+
+STUBBED_MODULES = ['PyInstaller.utils.hooks', 'PyInstaller.compat', 'PyInstaller.isolated'] + [
+    module.name for module in pkgutil.iter_modules(_pyinstaller_hooks_contrib.utils.__path__,
+                                                   _pyinstaller_hooks_contrib.utils.__name__ + '.')
+]
+
+# Counts the subprocesses started by the current hook.
+_subprocesses = Counter()
+
+
+def _audit(event, args):
+    if event == 'subprocess.Popen':
+        _subprocesses['count'] += 1
+
+
+def _argument_key(value):
+    # Functions (e.g. the filters of collect_submodules(), or the functions run by isolated.call()) and the hook API
+    # are identified by their names, rather than by their addresses.
+    if callable(value):
+        return f'<callable {getattr(value, "__module__", "")}.{getattr(value, "__qualname__", type(value).__name__)}>'
+    if isinstance(value, (list, tuple)):
+        return type(value)(_argument_key(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _argument_key(item) for key, item in value.items()}
+    return value
+
+
+class Recorder:
+    """
+    Wraps helper functions to count, time, record and replay their calls.
+    """
+    def __init__(self, replay=None):
+        self.replay = replay
+        self.recorded = {}
+        self.calls = Counter()
+        self.helper_time = 0.0
+        self.misses = 0
+
+    def reset(self):
+        self.calls = Counter()
+        self.helper_time = 0.0
+        self.misses = 0
+
+    def wrap(self, name, function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            self.calls[name] += 1
+            key = repr((name, _argument_key(args), _argument_key(kwargs)))
+            if self.replay is not None:
+                if key in self.replay:
+                    return self.replay[key]
+                self.misses += 1
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                self.helper_time += time.perf_counter() - start
+            try:
+                pickle.dumps(result)
+            except Exception:
+                pass
+            else:
+                self.recorded[key] = result
+            return result
+
+        return wrapper
+
+
+class HookAPI:
+    """
+    Stands in for PyInstaller's PostGraphAPI when calling the hook() functions of the hooks.
+    """
+    def __init__(self, module_name, hooksconfig):
+        self.__name__ = module_name
+        self.__file__ = None
+        self.__path__ = None
+        self.analysis = type('Analysis', (), {'hooksconfig': hooksconfig})()
+        self.added = Counter()
+
+    def __repr__(self):
+        return '<hook_api>'
+
+    def _add(self, kind, entries):
+        self.added[kind] += len(list(entries))
+
+    def add_imports(self, *module_names):
+        self._add('hiddenimports', module_names)
+
+    def del_imports(self, *module_names):
+        self._add('excludedimports', module_names)
+
+    def add_datas(self, list_of_tuples):
+        self._add('datas', list_of_tuples)
+
+    def add_binaries(self, list_of_tuples):
+        self._add('binaries', list_of_tuples)
+
+    def add_runtime_module(self, module_name):
+        self._add('runtime_modules', [module_name])
+
+    def add_runtime_package(self, package_name):
+        self._add('runtime_modules', [package_name])
+
+    def add_alias_module(self, real_module_name, alias_module_name):
+        self._add('aliases', [alias_module_name])
+
+
+@contextmanager
+def stubbed_modules(recorder):
+    """
+    Replace the STUBBED_MODULES, for the hooks imported meanwhile, with copies whose functions are recorded.
+    """
+    # Import all the modules first, so that the calls between them are not recorded.
+    modules = [importlib.import_module(name) for name in STUBBED_MODULES]
+    saved = {}
+    for name, module in zip(STUBBED_MODULES, modules):
+        stub = type(module)(name)
+        stub.__dict__.update(module.__dict__)
+        for attr, value in vars(module).items():
+            if inspect.isfunction(value) and not attr.startswith('_'):
+                setattr(stub, attr, recorder.wrap(f'{name}.{attr}', value))
+        parent, _, child = name.rpartition('.')
+        saved[name] = module
+        sys.modules[name] = stub
+        setattr(sys.modules[parent], child, stub)
+    try:
+        yield
+    finally:
+        for name, module in saved.items():
+            parent, _, child = name.rpartition('.')
+            sys.modules[name] = module
+            setattr(sys.modules[parent], child, module)
+
+
+def _installed(module_name):
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def hook_files(patterns, installed_only):
+    files = []
+    for hooks_dir in stdhooks.get_hook_dirs():
+        for path in sorted(Path(hooks_dir).glob('hook-*.py')):
+            if patterns and not any(fnmatch.fnmatch(path.stem, pattern) for pattern in patterns):
+                continue
+            # PyInstaller only runs the hooks of the modules it finds.
+            if installed_only and not _installed(path.stem[len('hook-'):]):
+                continue
+            files.append(path)
+    return files
+
+
+def evaluate(path, recorder, hooksconfig):
+    """
+    Load the hook *path* and call its hook() function. Return its statistics.
+    """
+    module_name = path.stem[len('hook-'):]
+    recorder.reset()
+    _subprocesses.clear()
+    error = None
+    hook_api = HookAPI(module_name, hooksconfig)
+    start = time.perf_counter()
+    try:
+        spec = importlib.util.spec_from_file_location('__pyi_benchmark_hook__.' + path.stem, path)
+        hook_module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(hook_module)
+        if hasattr(hook_module, 'hook'):
+            hook_module.hook(hook_api)
+    except BaseException as e:
+        error = f'{type(e).__name__}: {str(e).strip().splitlines()[0] if str(e).strip() else ""}'
+    elapsed = time.perf_counter() - start
+    return {
+        'time': elapsed,
+        'helper_time': recorder.helper_time,
+        'calls': dict(recorder.calls),
+        'subprocesses': _subprocesses['count'],
+        'replay_misses': recorder.misses,
+        'added': dict(hook_api.added),
+        'error': error,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        'patterns', nargs='*', help="Only benchmark the hooks matching these patterns (e.g. 'hook-pyqt*')."
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--record', metavar='FILE', help='Save the results of the helper calls into FILE.')
+    mode.add_argument('--replay', metavar='FILE', help='Return the results of the helper calls saved into FILE.')
+    parser.add_argument('--all', action='store_true', help='Also evaluate the hooks of the packages not installed.')
+    parser.add_argument('--json', metavar='FILE', help='Save the statistics of each hook as JSON into FILE.')
+    parser.add_argument('--hooksconfig', default='{}', help='The hooks configuration, as JSON (default: %(default)s).')
+    parser.add_argument(
+        '--top', type=int, default=20, help='The number of slowest hooks listed (default: %(default)s).'
+    )
+    parser.add_argument('-v', '--verbose', action='store_true', help="Show the hooks' log messages.")
+    args = parser.parse_args()
+
+    logging.getLogger('PyInstaller').setLevel(logging.INFO if args.verbose else logging.ERROR)
+    replay = None
+    if args.replay:
+        with open(args.replay, 'rb') as f:
+            replay = pickle.load(f)
+    recorder = Recorder(replay)
+    hooksconfig = json.loads(args.hooksconfig)
+    sys.addaudithook(_audit)
+
+    # Some hooks read PyInstaller's build configuration.
+    from PyInstaller.config import CONF
+    workpath = tempfile.mkdtemp(prefix='pyi-benchmark-hooks-')
+    CONF.update(workpath=workpath, cachedir=workpath, pathex=[], hiddenimports=[], specpath=workpath)
+
+    results = {}
+    start = time.perf_counter()
+    with stubbed_modules(recorder):
+        for path in hook_files(args.patterns, not args.all):
+            results[path.stem] = evaluate(path, recorder, hooksconfig)
+    total = time.perf_counter() - start
+
+    if args.record:
+        with open(args.record, 'wb') as f:
+            pickle.dump(recorder.recorded, f)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'mode': 'replay' if replay is not None else 'real', 'total': total, 'hooks': results}, f,
+                      indent=1, sort_keys=True)
+
+    calls = Counter()
+    for result in results.values():
+        calls.update(result['calls'])
+    print(f'Evaluated {len(results)} hooks in {total:.2f} s '
+          f'({"replay" if replay is not None else "real"} mode), '
+          f'of which {sum(r["helper_time"] for r in results.values()):.2f} s in helpers, '
+          f'starting {sum(r["subprocesses"] for r in results.values())} subprocesses.')
+    if replay is not None:
+        print(f'Calls missing from the replayed results: {sum(r["replay_misses"] for r in results.values())}')
+    print(f'\n{"hook":40} {"time (s)":>9} {"helpers":>8} {"calls":>6} {"subprocs":>8}')
+    for name, result in sorted(results.items(), key=lambda item: -item[1]['time'])[:args.top]:
+        print(f'{name:40} {result["time"]:9.3f} {result["helper_time"]:8.3f} {sum(result["calls"].values()):6} '
+              f'{result["subprocesses"]:8}')
+    print('\nMost called helpers:')
+    for name, count in calls.most_common(10):
+        print(f'{count:6} {name}')
+    errors = {name: result['error'] for name, result in results.items() if result['error']}
+    if errors:
+        print(f'\n{len(errors)} hooks failed:')
+        for name, error in sorted(errors.items()):
+            print(f'  {name}: {error}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the Apache License 2.0
+#
+# The full license is available in LICENSE.APL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ------------------------------------------------------------------
+
+
+def _pyi_rthook():
+    import os
+    import re
+    import sys
+
+    # Serve the schemas parsed by hook-altair.py (if precompile_data is enabled) to the ``load_schema()`` function of
+    # the modules ``altair.vega[lite].vN.schema.core``, which reads them through ``pkgutil.get_data()`` and parses them
+    # with ``json.loads()``.
+    precompiled = os.path.join(sys._MEIPASS, '_pyi_precompiled', 'altair')
+    if not os.path.isdir(precompiled):
+        return
+
+    import functools
+    import json
+    import marshal
+    import pkgutil
+
+    module_names = re.compile(r'altair\.(vega|vegalite)\.v\d+\.schema\.core$')
+
+    def _precompiled_schema(package, resource):
+        # Named after the path of the schema relative to the altair package, with "/" replaced by "-".
+        filename = os.path.join(precompiled, '-'.join(package.split('.')[1:] + resource.split('/')) + '.marshal')
+        if not os.path.isfile(filename):
+            return None
+        with open(filename, 'rb') as f:
+            return marshal.loads(f.read())
+
+    def _load_schema(load_schema, package, resource):
+        @functools.wraps(load_schema)
+        def wrapper():
+            schema = _precompiled_schema(package, resource)
+            return load_schema() if schema is None else schema
+
+        return wrapper
+
+    # Stand-in for the content of the schema file, while the module is executed.
+    class _SchemaBytes(bytes):
+        def decode(self, *args, **kwargs):
+            return self
+
+    class _PyiLoader:
+        def __init__(self, loader):
+            self._loader = loader
+
+        def __getattr__(self, name):
+            return getattr(self._loader, name)
+
+        def exec_module(self, module):
+            # load_schema() is also called while the module is executed, by the class attribute
+            # VegaLiteSchema._rootschema, so that it cannot be replaced beforehand: get_data() and loads() serve the
+            # precompiled schema until it is replaced.
+            package = module.__name__.rpartition('.')[0]
+            resources = {}
+            get_data, loads = pkgutil.get_data, json.loads
+
+            def _get_data(name, resource):
+                if name == module.__name__:
+                    schema = _precompiled_schema(package, resource)
+                    if schema is not None:
+                        resources[resource] = data = _SchemaBytes()
+                        data.schema = schema
+                        return data
+                return get_data(name, resource)
+
+            def _loads(s, *args, **kwargs):
+                if isinstance(s, _SchemaBytes):
+                    return s.schema
+                return loads(s, *args, **kwargs)
+
+            pkgutil.get_data, json.loads = _get_data, _loads
+            try:
+                self._loader.exec_module(module)
+            finally:
+                pkgutil.get_data, json.loads = get_data, loads
+            if resources and callable(getattr(module, 'load_schema', None)):
+                module.load_schema = _load_schema(module.load_schema, package, next(iter(resources)))
+
+    class _PyiAltairSchemaFinder:
+        @staticmethod
+        def find_spec(fullname, path=None, target=None):
+            if not module_names.match(fullname):
+                return None
+            for finder in sys.meta_path:
+                if finder is _PyiAltairSchemaFinder or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    spec.loader = _PyiLoader(spec.loader)
+                    return spec
+            return None
+
+    sys.meta_path.insert(0, _PyiAltairSchemaFinder)
+
+
+_pyi_rthook()
+del _pyi_rthook
@@ -0,0 +1,41 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the Apache License 2.0
+#
+# The full license is available in LICENSE.APL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ------------------------------------------------------------------
+
+def _pyi_rthook():
+    import os
+    import sys
+
+    # Load the country data pickled by hook-countryinfo.py (if precompile_data is enabled) instead of parsing the JSON
+    # file of each country.
+    precompiled = os.path.join(sys._MEIPASS, '_pyi_precompiled', 'countryinfo', 'countries.pickle')
+    if not os.path.isfile(precompiled):
+        return
+
+    import functools
+
+    import countryinfo  # noqa: F401
+    from countryinfo import _cache
+
+    @functools.lru_cache(maxsize=None)
+    def _pyi_load_countries():
+        import pickle
+        with open(precompiled, 'rb') as f:
+            return pickle.load(f)
+
+    # load_countries() is imported by name into several countryinfo submodules.
+    load_countries = _cache.load_countries
+    for name, module in list(sys.modules.items()):
+        if name.split('.')[0] == 'countryinfo' and getattr(module, 'load_countries', None) is load_countries:
+            module.load_countries = _pyi_load_countries
+
+
+_pyi_rthook()
+del _pyi_rthook
@@ -0,0 +1,56 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the Apache License 2.0
+#
+# The full license is available in LICENSE.APL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ------------------------------------------------------------------
+
+
+def _pyi_rthook():
+    import hashlib
+    import os
+    import sys
+
+    # PyInstaller's run-time hook for gst restricts GStreamer to the collected plugins, and points GST_REGISTRY at a
+    # file in the application's directory. GStreamer rescans all plugins whenever its registry was written for a
+    # different set of plugins, or cannot be written, so keep a registry per frozen application in the user's cache
+    # directory instead, unless GST_REGISTRY was set by the user. The registry records the plugins' paths, so onefile
+    # applications still rescan the plugins extracted to a new temporary directory on each start.
+    #
+    # The order in which both run-time hooks run is not defined: the registry is set when gst._gst, which initializes
+    # GStreamer, is imported.
+    default_registry = os.path.join(sys._MEIPASS, 'registry.bin')
+    if os.environ.get('GST_REGISTRY', default_registry) != default_registry:
+        return
+
+    def _set_registry():
+        if os.environ.get('GST_REGISTRY', default_registry) != default_registry:
+            return
+        if sys.platform.startswith('win'):
+            cache_home = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+        else:
+            cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser(os.path.join('~', '.cache'))
+        registry_dir = os.path.join(cache_home, 'pyinstaller', 'gst-registry')
+        try:
+            os.makedirs(registry_dir, exist_ok=True)
+        except OSError:
+            return
+        key = hashlib.sha1(os.path.abspath(sys.executable).encode('utf-8')).hexdigest()[:16]
+        os.environ['GST_REGISTRY'] = os.path.join(registry_dir, f'registry-{key}.bin')
+
+    class _PyiGstRegistryFinder:
+        @staticmethod
+        def find_spec(fullname, path=None, target=None):
+            if fullname == 'gst._gst':
+                _set_registry()
+            return None
+
+    sys.meta_path.insert(0, _PyiGstRegistryFinder)
+
+
+_pyi_rthook()
+del _pyi_rthook
@@ -0,0 +1,21 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the Apache License 2.0
+#
+# The full license is available in LICENSE.APL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ------------------------------------------------------------------
+
+import os
+import sys
+
+# If hooksconfig={"ffmpeg": {"executable": ...}} was used, the chosen ffmpeg executable is collected next to
+# imageio_ffmpeg's own binaries. An explicitly set IMAGEIO_FFMPEG_EXE still takes precedence.
+for _name in ('ffmpeg.exe', 'ffmpeg'):
+    _ffmpeg_exe = os.path.join(sys._MEIPASS, 'imageio_ffmpeg', 'binaries', _name)
+    if os.path.isfile(_ffmpeg_exe):
+        os.environ.setdefault('IMAGEIO_FFMPEG_EXE', _ffmpeg_exe)
+        break
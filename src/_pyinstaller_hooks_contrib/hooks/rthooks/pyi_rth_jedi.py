@@ -0,0 +1,123 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the Apache License 2.0
+#
+# The full license is available in LICENSE.APL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ------------------------------------------------------------------
+
+
+def _pyi_rthook():
+    import os
+    import sys
+
+    # Serve the stub files packed by hook-jedi.py (if typeshed_archive is enabled) to jedi. They are looked up by
+    # ``jedi.inference.gradual.typeshed``, through ``os.listdir``, ``os.path.isdir``, ``os.path.isfile`` and
+    # ``FileIO``, under their original paths in jedi/third_party. These names are replaced in that module, as soon as
+    # it is imported, by wrappers which look these paths up in the archive.
+    archive = os.path.join(sys._MEIPASS, '_pyi_precompiled', 'jedi', 'typeshed.zip')
+    if not os.path.isfile(archive):
+        return
+
+    import errno
+    import types
+    import zipfile
+
+    root = os.path.join(sys._MEIPASS, 'jedi', 'third_party')
+    index = {}
+
+    def _index():
+        # Maps the directories in the archive to their entries, and the files to their archive member names.
+        if not index:
+            index['zipfile'] = zf = zipfile.ZipFile(archive)
+            index['dirs'] = dirs = {'': set()}
+            index['files'] = files = {}
+            for name in zf.namelist():
+                path = os.path.normpath(name)
+                files[path] = name
+                while path:
+                    parent, entry = os.path.split(path)
+                    dirs.setdefault(parent, set()).add(entry)
+                    path = parent
+        return index
+
+    def _relative(path):
+        path = os.fspath(path)
+        if path.startswith(root + os.sep):
+            return os.path.normpath(path[len(root) + 1:])
+        return None
+
+    def _listdir(path='.'):
+        relative = _relative(path)
+        if relative is None:
+            return os.listdir(path)
+        if relative not in _index()['dirs']:
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), os.fspath(path))
+        return sorted(_index()['dirs'][relative])
+
+    def _isdir(path):
+        relative = _relative(path)
+        if relative is None:
+            return os.path.isdir(path)
+        return relative in _index()['dirs']
+
+    def _isfile(path):
+        relative = _relative(path)
+        if relative is None:
+            return os.path.isfile(path)
+        return relative in _index()['files']
+
+    def _wrap_module(module, **attrs):
+        wrapper = types.ModuleType(module.__name__)
+        wrapper.__dict__.update(module.__dict__)
+        wrapper.__dict__.update(attrs)
+        return wrapper
+
+    os_wrapper = _wrap_module(os, listdir=_listdir, path=_wrap_module(os.path, isdir=_isdir, isfile=_isfile))
+
+    def _wrap_file_io(file_io):
+        from jedi.file_io import ZipFileIO
+
+        def _file_io(path):
+            relative = _relative(path)
+            if relative is None or relative not in _index()['files']:
+                return file_io(path)
+            code = _index()['zipfile'].read(_index()['files'][relative])
+            return ZipFileIO(os.fspath(path), code, archive)
+
+        return _file_io
+
+    class _PyiLoader:
+        def __init__(self, loader):
+            self._loader = loader
+
+        def __getattr__(self, name):
+            return getattr(self._loader, name)
+
+        def exec_module(self, module):
+            self._loader.exec_module(module)
+            module.os = os_wrapper
+            module.FileIO = _wrap_file_io(module.FileIO)
+
+    class _PyiJediTypeshedFinder:
+        @staticmethod
+        def find_spec(fullname, path=None, target=None):
+            if fullname != 'jedi.inference.gradual.typeshed':
+                return None
+            for finder in sys.meta_path:
+                if finder is _PyiJediTypeshedFinder or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    spec.loader = _PyiLoader(spec.loader)
+                    return spec
+            return None
+
+    sys.meta_path.insert(0, _PyiJediTypeshedFinder)
+
+
+_pyi_rthook()
+del _pyi_rthook
@@ -0,0 +1,57 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the Apache License 2.0
+#
+# The full license is available in LICENSE.APL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ------------------------------------------------------------------
+
+def _pyi_rthook():
+    import os
+    import sys
+
+    # Load the language profiles pickled by hook-langdetect.py (if precompile_data is enabled) instead of parsing the
+    # bundled JSON profiles.
+    precompiled = os.path.join(sys._MEIPASS, '_pyi_precompiled', 'langdetect', 'profiles.pickle')
+    if not os.path.isfile(precompiled):
+        return
+
+    import array
+
+    from langdetect import detector_factory
+
+    class _SparseProbMap(dict):
+        # Rows are stored sparsely and only expanded into the list of probabilities that langdetect expects when first
+        # looked up. Membership tests and lookups are all that langdetect does with the map.
+        def __getitem__(self, word):
+            row = dict.__getitem__(self, word)
+            if isinstance(row, tuple):
+                indices, probs = row
+                dense = [0.0] * self.size
+                for i, prob in zip(array.array('H', indices), array.array('d', probs)):
+                    dense[i] = prob
+                dict.__setitem__(self, word, dense)
+                row = dense
+            return row
+
+    load_profile = detector_factory.DetectorFactory.load_profile
+
+    def _pyi_load_profile(self, profile_directory):
+        if self.langlist or \
+                os.path.normpath(profile_directory) != os.path.normpath(detector_factory.PROFILES_DIRECTORY):
+            return load_profile(self, profile_directory)
+        import pickle
+        with open(precompiled, 'rb') as f:
+            langlist, rows = pickle.load(f)
+        self.langlist = langlist
+        self.word_lang_prob_map = _SparseProbMap(rows)
+        self.word_lang_prob_map.size = len(langlist)
+
+    detector_factory.DetectorFactory.load_profile = _pyi_load_profile
+
+
+_pyi_rthook()
+del _pyi_rthook
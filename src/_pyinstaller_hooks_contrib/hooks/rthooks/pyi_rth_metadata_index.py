@@ -0,0 +1,88 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the Apache License 2.0
+#
+# The full license is available in LICENSE.APL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ------------------------------------------------------------------
+
+
+def _pyi_rthook():
+    import os
+    import sys
+
+    # Serve the distributions of the application's top-level directory from the index built by
+    # _pyinstaller_hooks_contrib.utils.metadata_index.add_metadata_index(), rather than by listing that directory.
+    # importlib.metadata looks the distributions up through the find_distributions() method of the finders in
+    # sys.meta_path, so PathFinder is replaced by a subclass which overrides it. importlib.metadata itself is only
+    # imported by the applications which use it.
+    index_file = os.path.join(sys._MEIPASS, '_pyi_precompiled', 'importlib_metadata.json')
+    if sys.version_info < (3, 8) or not os.path.isfile(index_file):
+        return
+
+    import re
+    from importlib.machinery import PathFinder
+
+    top_dir = os.path.normcase(os.path.abspath(sys._MEIPASS))
+    cache = {}
+
+    def _index():
+        if not cache:
+            import json
+            import pathlib
+            from importlib import metadata
+
+            class _PyiIndexedDistribution(metadata.PathDistribution):
+                def __init__(self, entry):
+                    super().__init__(pathlib.Path(sys._MEIPASS, entry['path']))
+                    self._pyi_entry = entry
+
+                @property
+                def name(self):
+                    return self._pyi_entry['name']
+
+                @property
+                def version(self):
+                    return self._pyi_entry['version']
+
+                @property
+                def requires(self):
+                    requires = self._pyi_entry['requires']
+                    return None if requires is None else list(requires)
+
+                def read_text(self, filename):
+                    if filename == 'entry_points.txt':
+                        return self._pyi_entry['entry_points']
+                    return super().read_text(filename)
+
+            with open(index_file, encoding='utf-8') as f:
+                cache['entries'] = json.load(f)
+            cache['distribution'] = _PyiIndexedDistribution
+            cache['context'] = metadata.DistributionFinder.Context
+        return cache
+
+    class _PyiMetadataPathFinder(PathFinder):
+        @classmethod
+        def find_distributions(cls, context=None):
+            index = _index()
+            if context is None:
+                context = index['context']()
+            paths = [path for path in context.path if os.path.normcase(os.path.abspath(path)) != top_dir]
+            if len(paths) < len(context.path):
+                if context.name is None:
+                    entries = [entry for _, entry in sorted(index['entries'].items())]
+                else:
+                    entry = index['entries'].get(re.sub(r'[-_.]+', '_', context.name).lower())
+                    entries = [entry] if entry else []
+                yield from map(index['distribution'], entries)
+            if paths:
+                yield from super().find_distributions(index['context'](name=context.name, path=paths))
+
+    sys.meta_path[:] = [_PyiMetadataPathFinder if finder is PathFinder else finder for finder in sys.meta_path]
+
+
+_pyi_rthook()
+del _pyi_rthook
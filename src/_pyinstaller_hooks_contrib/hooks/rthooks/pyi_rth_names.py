@@ -0,0 +1,46 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the Apache License 2.0
+#
+# The full license is available in LICENSE.APL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ------------------------------------------------------------------
+
+def _pyi_rthook():
+    import os
+    import sys
+
+    # Replace names.get_name(), which scans a name list on each call, by a bisection of the lists parsed by
+    # hook-names.py (if precompile_data is enabled). The same random number is drawn, so the results are identical.
+    precompiled = os.path.join(sys._MEIPASS, '_pyi_precompiled', 'names', 'names.pickle')
+    if not os.path.isfile(precompiled):
+        return
+
+    import names
+
+    get_name = names.get_name
+    tables = {}
+
+    def _pyi_get_name(filename):
+        import bisect
+        import random
+
+        if not tables:
+            import pickle
+            with open(precompiled, 'rb') as f:
+                tables.update((names.FILES[key], table) for key, table in pickle.load(f).items())
+        if filename not in tables:
+            return get_name(filename)
+
+        cumulatives, values = tables[filename]
+        index = bisect.bisect_right(cumulatives, random.random() * 90)
+        return values[index] if index < len(values) else ""
+
+    names.get_name = _pyi_get_name
+
+
+_pyi_rthook()
+del _pyi_rthook
@@ -0,0 +1,142 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the Apache License 2.0
+#
+# The full license is available in LICENSE.APL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ------------------------------------------------------------------
+
+# numba locates its on-disk cache (functions decorated with ``cache=True``) by the absolute path of the directory
+# containing the function's source file. In a frozen application the source files do not exist, so numba falls back
+# to its user-wide cache keyed by a path which changes with the working directory (and, for onefile builds, with each
+# extraction directory). Every start thus recompiles every cached function.
+#
+# This runtime hook installs a cache locator keyed by the source file's path relative to sys._MEIPASS and
+# invalidated by a stamp generated for each build by hook-numba.py. The cache is stored in NUMBA_CACHE_DIR if set,
+# otherwise in a per-application user cache directory, which is emptied when the stamp changes. If hook-numba.py
+# pre-populated the cache at build time, the bundled cache files are used to seed it. The locator is installed when
+# numba.core.caching is imported, so that applications which import numba lazily do not import it on start.
+
+import os
+import sys
+
+
+def _install_numba_cache_locator(cache_dir, stamp, roots):
+    # Also called by hook-numba.py at build time to pre-populate the cache.
+    import hashlib
+    from numba.core import caching
+
+    class _PyInstallerCacheLocator(caching._UserWideCacheLocator):
+        def __init__(self, py_func, py_file):
+            self._py_file = py_file
+            self._lineno = py_func.__code__.co_firstlineno
+            self._cache_path = os.path.join(cache_dir, self.get_suitable_cache_subpath(py_file))
+
+        def get_source_stamp(self):
+            return stamp
+
+        @classmethod
+        def get_suitable_cache_subpath(cls, py_file):
+            path = os.path.dirname(py_file)
+            if os.path.isabs(path):
+                for root in sorted(map(os.path.abspath, roots), key=len, reverse=True):
+                    if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+                        path = os.path.relpath(path, root)
+                        break
+            path = os.path.normpath(path or os.curdir).replace(os.sep, '/')
+            parentdir = 'top' if path == os.curdir else os.path.basename(path)
+            hashed = hashlib.sha1(path.encode()).hexdigest()
+            return '_'.join([parentdir, hashed])
+
+    # _CacheImpl was made public as CacheImpl in newer numba versions.
+    cache_impl = getattr(caching, 'CacheImpl', None) or caching._CacheImpl
+    cache_impl._locator_classes.insert(0, _PyInstallerCacheLocator)
+
+
+def _seed_numba_cache(src, dest, overwrite):
+    import shutil
+
+    for root, _, filenames in os.walk(src):
+        dest_dir = os.path.join(dest, os.path.relpath(root, src))
+        for filename in filenames:
+            if overwrite or not os.path.exists(os.path.join(dest_dir, filename)):
+                os.makedirs(dest_dir, exist_ok=True)
+                shutil.copy2(os.path.join(root, filename), dest_dir)
+
+
+def _setup_numba_cache(bundle_dir):
+    with open(os.path.join(bundle_dir, 'stamp.txt')) as f:
+        stamp = f.read().strip()
+    precompiled = os.path.join(bundle_dir, 'cache')
+
+    cache_dir = os.environ.get('NUMBA_CACHE_DIR')
+    try:
+        if cache_dir:
+            if os.path.isdir(precompiled):
+                _seed_numba_cache(precompiled, cache_dir, overwrite=False)
+        else:
+            # A single directory per application: the entries of previous builds are removed, rather than left behind
+            # in a directory of their own.
+            import shutil
+            from numba.misc.appdirs import AppDirs
+
+            app_name = os.path.splitext(os.path.basename(sys.executable))[0]
+            cache_dir = os.path.join(AppDirs(appname=app_name, appauthor=False).user_cache_dir, 'numba')
+            stamp_file = os.path.join(cache_dir, 'stamp.txt')
+            try:
+                with open(stamp_file) as f:
+                    current = f.read().strip() == stamp
+            except OSError:
+                current = False
+            if not current:
+                shutil.rmtree(cache_dir, ignore_errors=True)
+                if os.path.isdir(precompiled):
+                    _seed_numba_cache(precompiled, cache_dir, overwrite=True)
+                os.makedirs(cache_dir, exist_ok=True)
+                with open(stamp_file, 'w') as f:
+                    f.write(stamp)
+    except OSError:
+        pass
+
+    _install_numba_cache_locator(cache_dir, stamp, [sys._MEIPASS])
+
+
+def _pyi_rthook():
+    bundle_dir = os.path.join(sys._MEIPASS, '_pyi_numba_cache')
+    if not os.path.isfile(os.path.join(bundle_dir, 'stamp.txt')):
+        return
+
+    class _PyiLoader:
+        def __init__(self, loader):
+            self._loader = loader
+
+        def __getattr__(self, name):
+            return getattr(self._loader, name)
+
+        def exec_module(self, module):
+            self._loader.exec_module(module)
+            _setup_numba_cache(bundle_dir)
+
+    class _PyiNumbaCachingFinder:
+        @staticmethod
+        def find_spec(fullname, path=None, target=None):
+            if fullname != 'numba.core.caching':
+                return None
+            for finder in sys.meta_path:
+                if finder is _PyiNumbaCachingFinder or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    spec.loader = _PyiLoader(spec.loader)
+                    return spec
+            return None
+
+    sys.meta_path.insert(0, _PyiNumbaCachingFinder)
+
+
+if getattr(sys, 'frozen', False):
+    _pyi_rthook()
+    del _pyi_rthook
@@ -0,0 +1,72 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the Apache License 2.0
+#
+# The full license is available in LICENSE.APL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ------------------------------------------------------------------
+
+
+def _pyi_rthook():
+    import os
+    import sys
+
+    # Load the parser tables generated by hook-parso.py (if precompile_data is enabled) instead of generating them from
+    # the grammar files. ``parso.grammar.generate_grammar`` is replaced as soon as ``parso.grammar`` is imported; the
+    # tables are looked up by the hash of the grammar text, so unknown grammars are still generated.
+    precompiled = os.path.join(sys._MEIPASS, '_pyi_precompiled', 'parso')
+    if not os.path.isdir(precompiled):
+        return
+
+    import hashlib
+    import pickle
+
+    def _wrap_generate_grammar(generate_grammar):
+        def _generate_grammar(bnf_grammar, token_namespace):
+            name = hashlib.sha256(bnf_grammar.encode("utf-8")).hexdigest()
+            filename = os.path.join(precompiled, name + '.pickle')
+            if token_namespace.__name__ != 'PythonTokenTypes' or not os.path.isfile(filename):
+                return generate_grammar(bnf_grammar, token_namespace)
+
+            class _Unpickler(pickle.Unpickler):
+                def persistent_load(self, pid):
+                    return token_namespace[pid]
+
+            with open(filename, 'rb') as f:
+                return _Unpickler(f).load()
+
+        return _generate_grammar
+
+    class _PyiLoader:
+        def __init__(self, loader):
+            self._loader = loader
+
+        def __getattr__(self, name):
+            return getattr(self._loader, name)
+
+        def exec_module(self, module):
+            self._loader.exec_module(module)
+            module.generate_grammar = _wrap_generate_grammar(module.generate_grammar)
+
+    class _PyiParsoGrammarFinder:
+        @staticmethod
+        def find_spec(fullname, path=None, target=None):
+            if fullname != 'parso.grammar':
+                return None
+            for finder in sys.meta_path:
+                if finder is _PyiParsoGrammarFinder or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    spec.loader = _PyiLoader(spec.loader)
+                    return spec
+            return None
+
+    sys.meta_path.insert(0, _PyiParsoGrammarFinder)
+
+
+_pyi_rthook()
+del _pyi_rthook
@@ -0,0 +1,37 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the Apache License 2.0
+#
+# The full license is available in LICENSE.APL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ------------------------------------------------------------------
+
+def _pyi_rthook():
+    import os
+    import sys
+
+    # Load the public suffix trie pickled by hook-publicsuffix2.py (if precompile_data is enabled) instead of parsing
+    # the vendored public suffix list.
+    precompiled = os.path.join(sys._MEIPASS, '_pyi_precompiled', 'publicsuffix2')
+    if not os.path.isdir(precompiled):
+        return
+
+    import publicsuffix2
+
+    init = publicsuffix2.PublicSuffixList.__init__
+
+    def _pyi_init(self, psl_file=None, idna=True):
+        if psl_file is not None:
+            return init(self, psl_file, idna)
+        import pickle
+        with open(os.path.join(precompiled, 'idna.pickle' if idna else 'utf8.pickle'), 'rb') as f:
+            self.tlds, self.root = pickle.load(f)
+
+    publicsuffix2.PublicSuffixList.__init__ = _pyi_init
+
+
+_pyi_rthook()
+del _pyi_rthook
@@ -0,0 +1,41 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the Apache License 2.0
+#
+# The full license is available in LICENSE.APL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ------------------------------------------------------------------
+
+def _pyi_rthook():
+    import os
+    import sys
+
+    # Load the hyphenation patterns pickled by hook-pyphen.py (if precompile_data is enabled) instead of parsing the
+    # bundled dictionaries.
+    precompiled = os.path.join(sys._MEIPASS, '_pyi_precompiled', 'pyphen')
+    if not os.path.isdir(precompiled):
+        return
+
+    import pyphen
+
+    hyph_dict_init = pyphen.HyphDict.__init__
+    dictionaries = os.path.realpath(os.path.join(sys._MEIPASS, 'pyphen', 'dictionaries'))
+
+    def _pyi_hyph_dict_init(self, path):
+        filename = os.path.join(precompiled, os.path.basename(str(path)) + '.pickle')
+        if os.path.dirname(os.path.realpath(str(path))) != dictionaries or not os.path.isfile(filename):
+            return hyph_dict_init(self, path)
+        import pickle
+        with open(filename, 'rb') as f:
+            self.patterns = pickle.load(f)
+        self.cache = {}
+        self.maxlen = max(len(key) for key in self.patterns)
+
+    pyphen.HyphDict.__init__ = _pyi_hyph_dict_init
+
+
+_pyi_rthook()
+del _pyi_rthook
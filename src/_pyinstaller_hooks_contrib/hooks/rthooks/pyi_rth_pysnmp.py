@@ -0,0 +1,71 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the Apache License 2.0
+#
+# The full license is available in LICENSE.APL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ------------------------------------------------------------------
+
+
+def _pyi_rthook():
+    import os
+    import sys
+
+    # Load the MIB modules compiled by hook-pysnmp.py (if precompile_data is enabled) from an index, instead of
+    # listing and compiling the collected MIB sources.
+    index_file = os.path.join(sys._MEIPASS, '_pyi_precompiled', 'pysnmp', 'mibs.marshal')
+    if not os.path.isfile(index_file):
+        return
+
+    import errno
+    import marshal
+
+    from pysnmp.smi import builder
+
+    with open(index_file, 'rb') as f:
+        index = marshal.load(f)
+
+    class _PyiPrecompiledMibSource(getattr(builder, '__AbstractMibSource')):
+        def _init(self):
+            return self
+
+        def _listdir(self):
+            return tuple(index)
+
+        def read(self, f):
+            try:
+                return index[f], '.py'
+            except KeyError:
+                raise IOError(errno.ENOENT, 'No such MIB module in the precompiled index', f)
+
+    # The directories of the MIB packages (which are not collected) are replaced by the index. pysnmp 7.1 renamed the
+    # methods of the MIB builder and sources to snake case.
+    core_dirs = {
+        os.path.join(sys._MEIPASS, 'pysnmp', 'smi', 'mibs'),
+        os.path.join(sys._MEIPASS, 'pysnmp', 'smi', 'mibs', 'instances'),
+    }
+    snake_case = hasattr(builder.MibBuilder, 'get_mib_sources')
+    mib_builder_init = builder.MibBuilder.__init__
+
+    def _is_core_dir(source):
+        if not isinstance(source, builder.DirMibSource):
+            return False
+        path = source.full_path() if snake_case else source.fullPath()
+        return os.path.normpath(path) in core_dirs
+
+    def _pyi_mib_builder_init(self, *args, **kwargs):
+        mib_builder_init(self, *args, **kwargs)
+        precompiled = _PyiPrecompiledMibSource(os.path.dirname(index_file))
+        if snake_case:
+            self.set_mib_sources(precompiled, *(s for s in self.get_mib_sources() if not _is_core_dir(s)))
+        else:
+            self.setMibSources(precompiled, *(s for s in self.getMibSources() if not _is_core_dir(s)))
+
+    builder.MibBuilder.__init__ = _pyi_mib_builder_init
+
+
+_pyi_rthook()
+del _pyi_rthook
@@ -20,18 +20,19 @@ shouldn't hurt.
 
 
 from PyInstaller.compat import is_win, is_darwin
-from PyInstaller.utils.hooks import collect_data_files, exec_statement
+from PyInstaller.utils.hooks import collect_data_files
 import os
 import glob
 
+from _pyinstaller_hooks_contrib.utils.module_attributes import find_module_spec
+
 
 def opengl_arrays_modules():
     """
     Return list of array modules for OpenGL module.
     e.g. 'OpenGL.arrays.vbo'
     """
-    statement = 'import OpenGL; print(OpenGL.__path__[0])'
-    opengl_mod_path = exec_statement(statement)
+    opengl_mod_path = find_module_spec('OpenGL').submodule_search_locations[0]
     arrays_mod_path = os.path.join(opengl_mod_path, 'arrays')
     files = glob.glob(arrays_mod_path + '/*.py')
     modules = []
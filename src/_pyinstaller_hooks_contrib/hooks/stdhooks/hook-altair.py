@@ -9,7 +9,80 @@
 #
 # SPDX-License-Identifier: GPL-2.0-or-later
 # ------------------------------------------------------------------
+"""
+altair vendors the JSON schema of each Vega-Lite major version it supports (e.g., ``altair.vegalite.v4`` and
+``altair.vegalite.v3``), but ``import altair`` only uses the one re-exported by ``altair.vegalite``. By default, only
+that Vega-Lite schema is collected, along with the Vega schemas (``altair.vega``, in altair < 5). The hooks
+configuration allows collecting other Vega-Lite schemas, and shipping the schemas pre-parsed::
 
-from PyInstaller.utils.hooks import collect_data_files
+    hooksconfig={
+        "altair": {
+            # Additional Vega-Lite schema versions to collect, named after their altair subpackage (default: none).
+            "schema_versions": ["vegalite.v3"],
+            # Parse the collected schemas at build time; a runtime hook serves them to the load_schema() function of
+            # their altair subpackage (default: False).
+            "precompile_data": True,
+        },
+    }
+"""
 
-datas = collect_data_files("altair")
+import ast
+import os
+import re
+
+from PyInstaller.utils.hooks import collect_data_files, get_hook_config, logger
+
+from _pyinstaller_hooks_contrib.utils.module_attributes import find_module_spec
+from _pyinstaller_hooks_contrib.utils.precompile import precompile_data
+
+# Destination directories of the vendored schemas, e.g. altair/vegalite/v4/schema.
+_SCHEMA_DIR = re.compile(r'^altair[/\\](vega|vegalite)[/\\](v\d+)[/\\]schema$')
+
+
+def _active_vegalite_version():
+    """
+    Find the version subpackage which altair/vegalite/__init__.py star-imports, without importing altair.
+    """
+    spec = find_module_spec('altair.vegalite')
+    if spec is None or not spec.origin:
+        return None
+    with open(spec.origin, 'rb') as f:
+        tree = ast.parse(f.read(), spec.origin)
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.level == 1 and re.fullmatch(r'v\d+', node.module or ''):
+            return 'vegalite.' + node.module
+    return None
+
+
+def _precompile(output_dir, schemas):
+    import json
+    import marshal
+    import os
+
+    for src, name in schemas:
+        with open(src, 'rb') as f:
+            schema = json.loads(f.read().decode('utf-8'))
+        with open(os.path.join(output_dir, name + '.marshal'), 'wb') as f:
+            marshal.dump(schema, f)
+
+
+def hook(hook_api):
+    datas = collect_data_files("altair")
+
+    active = _active_vegalite_version()
+    if active is not None:
+        versions = {active, *(get_hook_config(hook_api, 'altair', 'schema_versions') or [])}
+        logger.info("hook-altair: collecting the Vega-Lite schemas of %s.", ", ".join(sorted(versions)))
+
+        def is_collected(dest):
+            match = _SCHEMA_DIR.match(dest)
+            return match is None or match.group(1) != 'vegalite' or '.'.join(match.groups()) in versions
+
+        datas = [(src, dest) for src, dest in datas if is_collected(dest)]
+
+    # The pre-parsed schemas are named after their path relative to the altair package, with "/" replaced by "-".
+    schemas = [
+        (src, '-'.join(dest.split(os.sep)[1:] + [os.path.basename(src)]))
+        for src, dest in datas if _SCHEMA_DIR.match(dest) and src.endswith('.json')
+    ]
+    hook_api.add_datas(datas + precompile_data(hook_api, 'altair', _precompile, schemas))
@@ -13,30 +13,49 @@
 from PyInstaller.utils.hooks import collect_data_files, collect_submodules, \
     copy_metadata, is_module_satisfies
 
-# Astropy includes a number of non-Python files that need to be present
-# at runtime, so we include these explicitly here.
-datas = collect_data_files('astropy')
-
-# In a number of places, astropy imports other sub-modules in a way that is not
-# always auto-discovered by pyinstaller, so we always include all submodules.
-hiddenimports = collect_submodules('astropy')
-
-# We now need to include the *_parsetab.py and *_lextab.py files for unit and
-# coordinate parsing, since these are loaded as files rather than imported as
-# sub-modules. We leverage collect_data_files to get all files in astropy then
-# filter these.
-ply_files = []
-for path, target in collect_data_files('astropy', include_py_files=True):
-    if path.endswith(('_parsetab.py', '_lextab.py')):
-        ply_files.append((path, target))
-
-datas += ply_files
-
-# Astropy version >= 5.0 queries metadata to get version information.
-if is_module_satisfies('astropy >= 5.0'):
-    datas += copy_metadata('astropy')
-    datas += copy_metadata('numpy')
-
-# In the Cython code, Astropy imports numpy.lib.recfunctions which isn't
-# automatically discovered by pyinstaller, so we add this as a hidden import.
-hiddenimports += ['numpy.lib.recfunctions']
+from _pyinstaller_hooks_contrib.utils.hook_cache import cached_hook_result
+from _pyinstaller_hooks_contrib.utils.prefetch import prefetched
+
+
+def _collect():
+    # Astropy includes a number of non-Python files that need to be present
+    # at runtime, so we include these explicitly here.
+    datas = prefetched(collect_data_files, 'astropy')
+
+    # In a number of places, astropy imports other sub-modules in a way that is not
+    # always auto-discovered by pyinstaller, so we always include all submodules.
+    hiddenimports = prefetched(collect_submodules, 'astropy')
+
+    # We now need to include the *_parsetab.py and *_lextab.py files for unit and
+    # coordinate parsing, since these are loaded as files rather than imported as
+    # sub-modules. We leverage collect_data_files to get all files in astropy then
+    # filter these.
+    ply_files = []
+    for path, target in prefetched(collect_data_files, 'astropy', include_py_files=True):
+        if path.endswith(('_parsetab.py', '_lextab.py')):
+            ply_files.append((path, target))
+
+    datas += ply_files
+
+    # Astropy version >= 5.0 queries metadata to get version information.
+    if is_module_satisfies('astropy >= 5.0'):
+        datas += copy_metadata('astropy')
+        datas += copy_metadata('numpy')
+
+    # In the Cython code, Astropy imports numpy.lib.recfunctions which isn't
+    # automatically discovered by pyinstaller, so we add this as a hidden import.
+    hiddenimports += ['numpy.lib.recfunctions']
+
+    return {'hiddenimports': hiddenimports, 'datas': datas}
+
+
+# The collected submodules and data files only depend on the installed astropy (and numpy) packages, so they can be
+# reused across builds, see _pyinstaller_hooks_contrib.utils.hook_cache.
+def hook(hook_api):
+    result = cached_hook_result(
+        hook_api, 'astropy', _collect,
+        distributions=['astropy', 'numpy'],
+        packages=['astropy'],
+    )
+    hook_api.add_imports(*result['hiddenimports'])
+    hook_api.add_datas(result['datas'])
@@ -14,6 +14,8 @@ import os
 from PyInstaller.compat import is_win
 from PyInstaller.utils.hooks import collect_submodules, is_module_satisfies, get_package_paths
 
+from _pyinstaller_hooks_contrib.utils.ffmpeg import ffmpeg_provider_selected
+
 hiddenimports = ['fractions'] + collect_submodules("av")
 
 
@@ -33,3 +35,8 @@ if is_module_satisfies("av >= 9.1.1") and is_win:
             (os.path.join(lib_dir, lib_file), 'av.libs')
             for lib_file in os.listdir(lib_dir)
         ]
+
+
+def hook(hook_api):
+    # av's FFmpeg libraries are linked against its extension modules; this only reports other copies of FFmpeg.
+    ffmpeg_provider_selected(hook_api, "av")
@@ -13,12 +13,20 @@
 
 from PyInstaller.utils.hooks import collect_data_files
 
+from _pyinstaller_hooks_contrib.utils.web_assets import slim_web_assets
+
+
 # core/_templates/*
 # server/static/**/*
 # subcommands/*.py
 # bokeh/_sri.json
-
-datas = collect_data_files('bokeh.core') + \
+#
+# Development web assets, such as the unminified BokehJS bundles (used with
+# ``Resources(minified=False)``), are not collected by default, see
+# _pyinstaller_hooks_contrib.utils.web_assets.
+def hook(hook_api):
+    datas = collect_data_files('bokeh.core') + \
         collect_data_files('bokeh.server') + \
         collect_data_files('bokeh.command.subcommands', include_py_files=True) + \
         collect_data_files('bokeh')
+    hook_api.add_datas(slim_web_assets(hook_api, 'bokeh', datas, unminified_dirs=['bokeh/server/static/js']))
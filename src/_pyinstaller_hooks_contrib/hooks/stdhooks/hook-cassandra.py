@@ -19,4 +19,6 @@
 
 from PyInstaller.utils.hooks import collect_submodules
 
-hiddenimports = collect_submodules('cassandra')
+from _pyinstaller_hooks_contrib.utils.prefetch import prefetched
+
+hiddenimports = prefetched(collect_submodules, 'cassandra')
@@ -10,6 +10,27 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 # ------------------------------------------------------------------
 
-from PyInstaller.utils.hooks import copy_metadata, collect_data_files
+from PyInstaller.utils.hooks import copy_metadata, collect_data_files, is_module_satisfies, logger
+
+from _pyinstaller_hooks_contrib.utils.precompile import precompile_data
 
 datas = copy_metadata("countryinfo") + collect_data_files("countryinfo")
+
+
+# countryinfo >= 1.0 parses the JSON files of all countries in countryinfo._cache.load_countries(). With
+# hooksconfig={"countryinfo": {"precompile_data": True}}, its result is pickled at build time and the runtime hook
+# loads it instead.
+def _precompile(output_dir):
+    import os
+    import pickle
+    from countryinfo._cache import load_countries
+
+    with open(os.path.join(output_dir, "countries.pickle"), "wb") as f:
+        pickle.dump(load_countries(), f, pickle.HIGHEST_PROTOCOL)
+
+
+def hook(hook_api):
+    if not is_module_satisfies("countryinfo >= 1.0"):
+        logger.debug("hook-countryinfo: data precompilation requires countryinfo >= 1.0.")
+        return
+    hook_api.add_datas(precompile_data(hook_api, "countryinfo", _precompile))
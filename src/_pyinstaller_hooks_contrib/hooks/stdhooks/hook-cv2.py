@@ -16,21 +16,34 @@ import os
 from PyInstaller.utils.hooks import collect_dynamic_libs, collect_data_files
 from PyInstaller import compat
 
+from _pyinstaller_hooks_contrib.utils.ffmpeg import ffmpeg_provider_selected
+
 hiddenimports = ['numpy']
 
 # On Windows, make sure that opencv_videoio_ffmpeg*.dll is bundled
 binaries = []
+ffmpeg_binaries = []
 if compat.is_win:
     # If conda is active, look for the DLL in its library path
     if compat.is_conda:
         libdir = os.path.join(compat.base_prefix, 'Library', 'bin')
         pattern = os.path.join(libdir, 'opencv_videoio_ffmpeg*.dll')
         for f in glob.glob(pattern):
-            binaries.append((f, '.'))
+            ffmpeg_binaries.append((f, '.'))
 
     # Include any DLLs from site-packages/cv2 (opencv_videoio_ffmpeg*.dll
     # can be found there in the PyPI version)
-    binaries += collect_dynamic_libs('cv2')
+    for src, dest in collect_dynamic_libs('cv2'):
+        if os.path.basename(src).startswith('opencv_videoio_ffmpeg'):
+            ffmpeg_binaries.append((src, dest))
+        else:
+            binaries.append((src, dest))
 
 # OpenCV loader from 4.5.4.60 requires extra config files and modules
 datas = collect_data_files('cv2', include_py_files=True, includes=['**/*.py'])
+
+
+def hook(hook_api):
+    # The FFmpeg videoio plugin is loaded on demand, so it may be dropped in favour of another FFmpeg provider.
+    if ffmpeg_provider_selected(hook_api, "cv2"):
+        hook_api.add_binaries(ffmpeg_binaries)
@@ -12,4 +12,10 @@
 
 from PyInstaller.utils.hooks import collect_data_files
 
-datas = collect_data_files('dash_renderer')
+from _pyinstaller_hooks_contrib.utils.web_assets import slim_web_assets
+
+
+# Development web assets are not collected by default, see _pyinstaller_hooks_contrib.utils.web_assets.
+def hook(hook_api):
+    datas = collect_data_files('dash_renderer')
+    hook_api.add_datas(slim_web_assets(hook_api, 'dash_renderer', datas, unminified_dirs=['dash_renderer']))
@@ -12,5 +12,12 @@
 
 from PyInstaller.utils.hooks import collect_submodules
 
-# The ``eth_hash.utils.load_backend`` function does a dynamic import.
-hiddenimports = collect_submodules('eth_hash.backends')
+from _pyinstaller_hooks_contrib.utils.plugins import select_plugins
+
+
+# The ``eth_hash.utils.load_backend`` function does a dynamic import. The backends to collect can be chosen via
+# hooksconfig={"eth_hash": {"plugins": [...]}}, see _pyinstaller_hooks_contrib.utils.plugins.
+def hook(hook_api):
+    hook_api.add_imports(
+        *select_plugins(hook_api, 'eth_hash', 'eth_hash.backends', collect_submodules('eth_hash.backends'))
+    )
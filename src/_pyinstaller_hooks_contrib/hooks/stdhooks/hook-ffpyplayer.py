@@ -12,8 +12,15 @@
 
 from PyInstaller.utils.hooks import eval_statement, collect_submodules
 
+from _pyinstaller_hooks_contrib.utils.ffmpeg import ffmpeg_provider_selected
+
 hiddenimports = collect_submodules("ffpyplayer")
 binaries = []
 # ffpyplayer has an internal variable tells us where the libraries it was using
 for bin in eval_statement("import ffpyplayer; print(ffpyplayer.dep_bins)"):
     binaries += [(bin, '.')]
+
+
+def hook(hook_api):
+    # The dep_bins are required to import ffpyplayer; this only reports other copies of FFmpeg.
+    ffmpeg_provider_selected(hook_api, "ffpyplayer")
@@ -12,5 +12,10 @@
 
 from PyInstaller.utils.hooks import collect_data_files
 
-# Collect data files (templates)
-datas = collect_data_files("folium")
+from _pyinstaller_hooks_contrib.utils.web_assets import slim_web_assets
+
+
+# Collect data files (templates). Development web assets are not collected by default, see
+# _pyinstaller_hooks_contrib.utils.web_assets.
+def hook(hook_api):
+    hook_api.add_datas(slim_web_assets(hook_api, "folium", collect_data_files("folium")))
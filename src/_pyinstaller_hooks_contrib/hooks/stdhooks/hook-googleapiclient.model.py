@@ -9,12 +9,73 @@
 #
 # SPDX-License-Identifier: GPL-2.0-or-later
 # ------------------------------------------------------------------
+"""
+googleapiclient ships the discovery documents of all Google APIs (over 100 MB of JSON), which
+``googleapiclient.discovery.build(..., static_discovery=True)`` reads from
+``googleapiclient/discovery_cache/documents``. All of them are collected by default. The hooks configuration allows
+collecting only those of the APIs used by the application, and minifying them::
 
-from PyInstaller.utils.hooks import copy_metadata
-from PyInstaller.utils.hooks import collect_data_files
+    hooksconfig={
+        "googleapiclient": {
+            # (api, version) pairs of the discovery documents to collect (default: all).
+            "discovery_documents": [("drive", "v3"), ("sheets", "v4")],
+            # Strip the whitespace from the collected discovery documents (default: False).
+            "minify_discovery_documents": True,
+        },
+    }
+"""
 
-# googleapiclient.model queries the library version via
-# pkg_resources.get_distribution("google-api-python-client").version,
-# so we need to collect that package's metadata
-datas = copy_metadata('google_api_python_client')
-datas += collect_data_files('googleapiclient.discovery', excludes=['*.txt', '**/__pycache__'])
+import json
+import os
+
+from PyInstaller.config import CONF
+from PyInstaller.utils.hooks import collect_data_files, copy_metadata, get_hook_config, logger
+
+_DOCUMENTS_DIR = os.path.join('googleapiclient', 'discovery_cache', 'documents')
+
+
+def _minify(datas):
+    """
+    Write minified copies of the discovery documents in *datas* to the work directory, and return *datas* with these
+    copies in place of the original files.
+    """
+    output_dir = os.path.join(CONF['workpath'], 'googleapiclient-discovery-documents')
+    os.makedirs(output_dir, exist_ok=True)
+    minified = []
+    for src, dest in datas:
+        if dest == _DOCUMENTS_DIR and src.endswith('.json'):
+            with open(src, 'r', encoding='utf-8') as f:
+                document = json.load(f)
+            src = os.path.join(output_dir, os.path.basename(src))
+            with open(src, 'w', encoding='utf-8') as f:
+                json.dump(document, f, ensure_ascii=False, separators=(',', ':'))
+        minified.append((src, dest))
+    return minified
+
+
+def hook(hook_api):
+    # googleapiclient.model queries the library version via
+    # pkg_resources.get_distribution("google-api-python-client").version,
+    # so we need to collect that package's metadata
+    datas = copy_metadata('google_api_python_client')
+    documents = collect_data_files('googleapiclient.discovery_cache', excludes=['*.txt', '**/__pycache__'])
+
+    selection = get_hook_config(hook_api, 'googleapiclient', 'discovery_documents')
+    if selection is not None:
+        # get_static_doc() looks up the document of an API as "<api>.<version>.json".
+        wanted = {f'{api}.{version}.json' for api, version in selection}
+        available = {os.path.basename(src) for src, dest in documents if dest == _DOCUMENTS_DIR}
+        for name in sorted(wanted - available):
+            logger.warning("hook-googleapiclient.model: no discovery document %s in googleapiclient.", name)
+        documents = [
+            (src, dest) for src, dest in documents if dest != _DOCUMENTS_DIR or os.path.basename(src) in wanted
+        ]
+        logger.info(
+            "hook-googleapiclient.model: collecting %d of %d discovery documents.", len(wanted & available),
+            len(available)
+        )
+
+    if get_hook_config(hook_api, 'googleapiclient', 'minify_discovery_documents'):
+        documents = _minify(documents)
+
+    hook_api.add_datas(datas + documents)
@@ -9,40 +9,89 @@
 #
 # SPDX-License-Identifier: GPL-2.0-or-later
 # ------------------------------------------------------------------
+"""
+GStreamer contains a lot of plugins. We need to collect them and bundle them with the exe file. Their binary
+dependencies are resolved by PyInstaller's analysis of the collected plugins.
 
+All plugins are collected by default. With PyInstaller >= 5.0, the hooks configuration allows collecting only the
+plugins which provide the element factories used by the application::
 
-# GStreamer contains a lot of plugins. We need to collect them and bundle
-# them wih the exe file.
-# We also need to resolve binary dependencies of these GStreamer plugins.
+    hooksconfig={
+        "gst": {
+            # Names of the element factories (as passed to gst.element_factory_make()) to collect the plugins of.
+            "elements": ["filesrc", "decodebin2", "audioconvert", "alsasink"],
+        },
+    }
 
+Elements which create other elements (e.g., decodebin2 or playbin2) find them in the registry at run-time, so the
+elements they plug in must be listed as well. The plugins are collected into the gst-plugins directory, which
+PyInstaller's runtime hook for gst restricts GStreamer to. A runtime hook of this package keeps their registry in a
+per-application cache file, so that the plugins are not scanned again on each start of a onedir application.
+"""
 
 import glob
 import os
-from PyInstaller.compat import is_win
-from PyInstaller.utils.hooks import exec_statement
 
+from PyInstaller.compat import is_win
+from PyInstaller.utils.hooks import exec_statement, get_hook_config, is_module_satisfies, logger
 
 hiddenimports = ['gmodule', 'gobject']
 
-statement = """
+
+def _find_plugins(elements):
+    """
+    Return the plugin directory, and the file names of the plugins providing the element factories *elements*.
+    """
+    import os
+    import gst
+
+    registry = gst.registry_get_default()
+    plugin_path = os.path.dirname(registry.find_plugin('coreelements').get_filename())
+    element_plugins = {}
+    if elements:
+        for plugin in registry.get_plugin_list():
+            for feature in registry.get_feature_list_by_plugin(plugin.get_name()):
+                if isinstance(feature, gst.ElementFactory) and feature.get_name() in elements:
+                    element_plugins[feature.get_name()] = plugin.get_filename()
+    return plugin_path, element_plugins
+
+
+# The plugin directory, without the isolated module of PyInstaller >= 5.0.
+_PLUGIN_PATH_STATEMENT = """
 import os
 import gst
-reg = gst.registry_get_default()
-plug = reg.find_plugin('coreelements')
-path = plug.get_filename()
-print(os.path.dirname(path))
+print(os.path.dirname(gst.registry_get_default().find_plugin('coreelements').get_filename()))
 """
 
-plugin_path = exec_statement(statement)
 
-if is_win:
-    # TODO Verify that on Windows gst plugins really end with .dll.
-    pattern = os.path.join(plugin_path, '*.dll')
-else:
-    # Even on OSX plugins end with '.so'.
-    pattern = os.path.join(plugin_path, '*.so')
+def hook(hook_api):
+    elements = get_hook_config(hook_api, 'gst', 'elements')
+    if is_module_satisfies('pyinstaller >= 5.0'):
+        from PyInstaller import isolated
+        plugin_path, element_plugins = isolated.call(_find_plugins, elements)
+    else:
+        if elements is not None:
+            logger.warning("hook-gst._gst: selecting elements requires PyInstaller >= 5.0; collecting all plugins.")
+            elements = None
+        plugin_path, element_plugins = exec_statement(_PLUGIN_PATH_STATEMENT), {}
+
+    if is_win:
+        # TODO Verify that on Windows gst plugins really end with .dll.
+        pattern = os.path.join(plugin_path, '*.dll')
+    else:
+        # Even on OSX plugins end with '.so'.
+        pattern = os.path.join(plugin_path, '*.so')
+    plugins = sorted(glob.glob(pattern))
+
+    if elements is not None:
+        missing = sorted(set(elements) - set(element_plugins))
+        if missing:
+            logger.warning("hook-gst._gst: no GStreamer plugin provides the elements: %s", ", ".join(missing))
+        selected = sorted(set(element_plugins.values()))
+        logger.info(
+            "hook-gst._gst: collecting %d of %d GStreamer plugins: %s", len(selected), len(plugins),
+            ", ".join(os.path.basename(plugin) for plugin in selected)
+        )
+        plugins = selected
 
-binaries = [
-    (os.path.join('gst_plugins', os.path.basename(f)), f)
-    # 'f' contains the absolute path
-    for f in glob.glob(pattern)]
+    hook_api.add_binaries([(plugin, 'gst-plugins') for plugin in plugins])
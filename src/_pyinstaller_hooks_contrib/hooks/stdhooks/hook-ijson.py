@@ -11,4 +11,11 @@
 # ------------------------------------------------------------------
 
 from PyInstaller.utils.hooks import collect_submodules
-hiddenimports = collect_submodules("ijson.backends")
+
+from _pyinstaller_hooks_contrib.utils.plugins import select_plugins
+
+
+# The backends are imported by name. The ones to collect can be chosen via
+# hooksconfig={"ijson": {"plugins": [...]}}, see _pyinstaller_hooks_contrib.utils.plugins.
+def hook(hook_api):
+    hook_api.add_imports(*select_plugins(hook_api, "ijson", "ijson.backends", collect_submodules("ijson.backends")))
@@ -14,8 +14,14 @@
 
 from PyInstaller.utils.hooks import collect_data_files, collect_submodules
 
+from _pyinstaller_hooks_contrib.utils.plugins import select_plugins
+
 datas = collect_data_files('imageio', subdir="resources")
 
+
 # imageio plugins are imported lazily since ImageIO version 2.11.0.
-# They are very light-weight, so we can safely include all of them.
-hiddenimports = collect_submodules('imageio.plugins')
+# They are very light-weight, so by default we include all of them. The ones
+# to collect can be chosen via hooksconfig={"imageio": {"plugins": [...]}},
+# see _pyinstaller_hooks_contrib.utils.plugins.
+def hook(hook_api):
+    hook_api.add_imports(*select_plugins(hook_api, 'imageio', 'imageio.plugins', collect_submodules('imageio.plugins')))
@@ -12,6 +12,21 @@
 
 # Hook for imageio: http://imageio.github.io/
 
-from PyInstaller.utils.hooks import collect_data_files
+import os
 
-datas = collect_data_files('imageio_ffmpeg', subdir="binaries")
+from PyInstaller.utils.hooks import collect_data_files, get_hook_config
+
+from _pyinstaller_hooks_contrib.utils.ffmpeg import ffmpeg_provider_selected
+
+
+def hook(hook_api):
+    if ffmpeg_provider_selected(hook_api, "imageio_ffmpeg"):
+        hook_api.add_datas(collect_data_files('imageio_ffmpeg', subdir="binaries"))
+
+    # An alternative ffmpeg executable is collected next to the bundled one; the runtime hook points
+    # IMAGEIO_FFMPEG_EXE at it.
+    executable = get_hook_config(hook_api, "ffmpeg", "executable")
+    if executable:
+        if os.path.splitext(os.path.basename(executable))[0] != "ffmpeg":
+            raise SystemExit("Error: hooksconfig['ffmpeg']['executable'] must be named ffmpeg, got %r." % executable)
+        hook_api.add_binaries([(executable, os.path.join('imageio_ffmpeg', 'binaries'))])
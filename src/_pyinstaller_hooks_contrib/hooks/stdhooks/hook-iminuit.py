@@ -15,11 +15,7 @@
 # iminuit imports subpackages through a cython module which aren't
 # found by default
 
-from PyInstaller.utils.hooks import collect_submodules
-
-hiddenimports = []
+from _pyinstaller_hooks_contrib.utils.submodules import collect_submodules
 
 # the iminuit package contains tests which aren't needed when distributing
-for mod in collect_submodules('iminuit'):
-    if not mod.startswith('iminuit.tests'):
-        hiddenimports.append(mod)
+hiddenimports = collect_submodules('iminuit', prune='iminuit.tests')
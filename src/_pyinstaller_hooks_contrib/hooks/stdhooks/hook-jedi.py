@@ -10,8 +10,108 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 # ------------------------------------------------------------------
 
-# Hook for Jedi, a static analysis tool https://pypi.org/project/jedi/
+"""
+Hook for Jedi, a static analysis tool https://pypi.org/project/jedi/
 
-from PyInstaller.utils.hooks import collect_data_files
+jedi vendors typeshed and django-stubs (jedi/third_party): thousands of small ``.pyi`` stub files, which onefile
+applications extract on each start. The hooks configuration allows collecting fewer of them, and packing them into a
+single archive read by a runtime hook::
 
-datas = collect_data_files('jedi')
+    hooksconfig={
+        "jedi": {
+            # Pack the stub files into an archive (default: False).
+            "typeshed_archive": True,
+            # Third-party packages to collect the stubs of, e.g. ["six", "requests", "django"] (default: all). The
+            # standard library stubs are always collected; an empty list collects only those.
+            "typeshed_third_party": [],
+        },
+    }
+"""
+
+import os
+import zipfile
+
+from PyInstaller.config import CONF
+from PyInstaller.utils.hooks import collect_data_files, get_hook_config, logger
+
+from _pyinstaller_hooks_contrib.utils.precompile import PRECOMPILED_DIR
+
+_STUBS_DIR = os.path.join('jedi', 'third_party')
+_THIRD_PARTY_DIR = os.path.join(_STUBS_DIR, 'typeshed', 'third_party')
+
+
+def _third_party_stubs(src, dest):
+    """
+    Return the name of the third-party package whose stubs include the file *src*, collected into *dest*, or None.
+    """
+    parts = os.path.relpath(dest, _STUBS_DIR).split(os.sep)
+    if parts[0] == 'django-stubs':
+        return 'django'
+    if parts[:2] == ['typeshed', 'third_party'] and len(parts) >= 3:
+        # typeshed/third_party/<python version>/<package>/... or typeshed/third_party/<python version>/<module>.pyi
+        return parts[3] if len(parts) > 3 else os.path.splitext(os.path.basename(src))[0]
+    return None
+
+
+def _version_directories(datas):
+    """
+    Return the directories typeshed/third_party/<python version> which the files of *datas* are collected into.
+    """
+    directories = set()
+    for _, dest in datas:
+        parts = os.path.relpath(dest, _THIRD_PARTY_DIR).split(os.sep)
+        if parts[0] not in (os.curdir, os.pardir):
+            directories.add(os.path.join(_THIRD_PARTY_DIR, parts[0]))
+    return directories
+
+
+def _keep_directories(datas, collected):
+    """
+    Return placeholder files for the directories typeshed/third_party/<python version> of *datas* which are left empty
+    in *collected*: jedi lists them, and fails if they are missing.
+    """
+    directories = _version_directories(datas) - _version_directories(collected)
+    if not directories:
+        return []
+    output_dir = os.path.join(CONF['workpath'], PRECOMPILED_DIR, 'jedi')
+    os.makedirs(output_dir, exist_ok=True)
+    placeholder = os.path.join(output_dir, '.keep')
+    open(placeholder, 'w').close()
+    return [(placeholder, directory) for directory in sorted(directories)]
+
+
+def _archive(datas):
+    """
+    Pack the files of *datas* into a zip archive, named by their path relative to jedi/third_party.
+    """
+    output_dir = os.path.join(CONF['workpath'], PRECOMPILED_DIR, 'jedi')
+    os.makedirs(output_dir, exist_ok=True)
+    archive = os.path.join(output_dir, 'typeshed.zip')
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for src, dest in sorted(datas, key=lambda entry: entry[1]):
+            arcname = os.path.join(os.path.relpath(dest, _STUBS_DIR), os.path.basename(src))
+            zf.write(src, arcname.replace(os.sep, '/'))
+    return [(archive, os.path.join(PRECOMPILED_DIR, 'jedi'))]
+
+
+def hook(hook_api):
+    datas = collect_data_files('jedi')
+
+    packages = get_hook_config(hook_api, 'jedi', 'typeshed_third_party')
+    if packages is not None:
+        excluded = {
+            name for name in (_third_party_stubs(src, dest) for src, dest in datas) if name and name not in packages
+        }
+        collected = [(src, dest) for src, dest in datas if _third_party_stubs(src, dest) not in excluded]
+        datas = collected + _keep_directories(datas, collected)
+        logger.info("hook-jedi: not collecting the stubs of %d third-party packages.", len(excluded))
+
+    if get_hook_config(hook_api, 'jedi', 'typeshed_archive'):
+        def is_stub(dest):
+            return os.path.normpath(dest).startswith(_STUBS_DIR + os.sep)
+
+        stubs = [(src, dest) for src, dest in datas if is_stub(dest)]
+        datas = [(src, dest) for src, dest in datas if not is_stub(dest)] + _archive(stubs)
+        logger.info("hook-jedi: packed %d stub files into an archive.", len(stubs))
+
+    hook_api.add_datas(datas)
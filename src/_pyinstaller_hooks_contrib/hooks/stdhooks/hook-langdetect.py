@@ -12,4 +12,32 @@
 
 from PyInstaller.utils.hooks import collect_data_files
 
+from _pyinstaller_hooks_contrib.utils.precompile import precompile_data
+
 datas = collect_data_files("langdetect")
+
+
+# Parsing the ~55 JSON language profiles is the bulk of the first call to detect(). With
+# hooksconfig={"langdetect": {"precompile_data": True}}, the n-gram probability table built from them is pickled at
+# build time and the runtime hook loads it instead. Most probabilities are zero so each row is stored sparsely, as the
+# bytes of its non-zero indices and of an array of the corresponding doubles.
+def _precompile(output_dir):
+    import array
+    import os
+    import pickle
+    from langdetect import detector_factory
+
+    factory = detector_factory.DetectorFactory()
+    factory.load_profile(detector_factory.PROFILES_DIRECTORY)
+    rows = {
+        word: (
+            array.array("H", [i for i, prob in enumerate(row) if prob]).tobytes(),
+            array.array("d", [prob for prob in row if prob]).tobytes(),
+        ) for word, row in factory.word_lang_prob_map.items()
+    }
+    with open(os.path.join(output_dir, "profiles.pickle"), "wb") as f:
+        pickle.dump((factory.langlist, rows), f, pickle.HIGHEST_PROTOCOL)
+
+
+def hook(hook_api):
+    hook_api.add_datas(precompile_data(hook_api, "langdetect", _precompile))
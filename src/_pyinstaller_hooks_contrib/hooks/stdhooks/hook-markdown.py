@@ -16,7 +16,9 @@ from PyInstaller.utils.hooks import (
     is_module_satisfies,
 )
 
-hiddenimports = collect_submodules('markdown.extensions')
+from _pyinstaller_hooks_contrib.utils.plugins import select_plugins
+
+hiddenimports = []
 
 # Markdown 3.3 introduced markdown.htmlparser submodule with hidden
 # dependency on html.parser
@@ -26,3 +28,11 @@ if is_module_satisfies("markdown >= 3.3"):
 # Extensions can be referenced by short names, e.g. "extra", through a mechanism
 # using entry-points. Thus we need to collect the package metadata as well.
 datas = copy_metadata("markdown")
+
+
+# The extensions to collect can be chosen via hooksconfig={"markdown": {"plugins": [...]}},
+# see _pyinstaller_hooks_contrib.utils.plugins.
+def hook(hook_api):
+    hook_api.add_imports(
+        *select_plugins(hook_api, 'markdown', 'markdown.extensions', collect_submodules('markdown.extensions'))
+    )
@@ -15,4 +15,31 @@
 
 from PyInstaller.utils.hooks import collect_data_files
 
+from _pyinstaller_hooks_contrib.utils.precompile import precompile_data
+
 datas = collect_data_files('names')
+
+
+# names.get_name() scans a name list line by line on every call. With hooksconfig={"names": {"precompile_data": True}},
+# the lists are parsed at build time and the runtime hook replaces get_name() by a bisection of the parsed lists.
+def _precompile(output_dir):
+    import os
+    import pickle
+    import names
+
+    tables = {}
+    for key, filename in names.FILES.items():
+        cumulatives, values = [], []
+        with open(filename) as name_file:
+            for line in name_file:
+                name, _, cumulative, _ = line.split()
+                cumulatives.append(float(cumulative))
+                values.append(name)
+        tables[key] = (cumulatives, values)
+
+    with open(os.path.join(output_dir, "names.pickle"), "wb") as f:
+        pickle.dump(tables, f, pickle.HIGHEST_PROTOCOL)
+
+
+def hook(hook_api):
+    hook_api.add_datas(precompile_data(hook_api, "names", _precompile))
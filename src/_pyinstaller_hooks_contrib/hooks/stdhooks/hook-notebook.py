@@ -11,11 +11,14 @@
 # ------------------------------------------------------------------
 
 import os
-from PyInstaller.utils.hooks import collect_data_files, collect_submodules
+from PyInstaller.utils.hooks import collect_data_files
 from jupyter_core.paths import jupyter_config_path, jupyter_path
 
+from _pyinstaller_hooks_contrib.utils.submodules import collect_submodules
+
 # collect modules for handlers
-hiddenimports = collect_submodules('notebook', filter=lambda name: name.endswith('.handles'))
+hiddenimports = collect_submodules('notebook', prune=lambda name: name.rpartition('.')[2] == 'tests',
+                                   filter=lambda name: name.endswith('.handlers'))
 hiddenimports.append('notebook.services.shutdown')
 
 datas = collect_data_files('notebook')
@@ -16,5 +16,64 @@
 # Tested with:
 # numba 0.26 (Anaconda 4.1.1, Windows), numba 0.28 (Linux)
 
+#
+# The runtime hook makes numba's on-disk cache (``cache=True``) persistent across runs of the frozen application. The
+# cache can also be pre-populated at build time by calling functions which trigger the compilation of the cached
+# functions, given as "module:function" entry points (requires PyInstaller >= 5.0)::
+#
+#   hooksconfig={
+#       "numba": {
+#           "precompile": ["mypackage.kernels:warmup"],
+#       },
+#   }
+#
+# Compiled code is specific to the CPU of the build machine; other CPUs will simply miss the pre-populated cache.
+
+import os
+import shutil
+import uuid
+
+from PyInstaller.config import CONF
+from PyInstaller.utils.hooks import get_hook_config, is_module_satisfies, logger
+
+from _pyinstaller_hooks_contrib.hooks import rthooks
+
 excludedimports = ["IPython", "scipy"]
 hiddenimports = ["llvmlite"]
+
+
+def _precompile(rthook, cache_dir, stamp, entry_points):
+    import importlib
+    import runpy
+    import sys
+
+    # Use the same cache locator as the runtime hook, with module paths relative to sys.path instead of sys._MEIPASS.
+    runpy.run_path(rthook)['_install_numba_cache_locator'](cache_dir, stamp, sys.path)
+    for entry_point in entry_points:
+        module, _, function = entry_point.partition(":")
+        getattr(importlib.import_module(module), function)()
+
+
+def hook(hook_api):
+    workdir = os.path.join(CONF['workpath'], 'numba')
+    os.makedirs(workdir, exist_ok=True)
+
+    # The stamp invalidates cache entries produced by other builds of the application.
+    stamp_file = os.path.join(workdir, 'stamp.txt')
+    stamp = uuid.uuid4().hex
+    with open(stamp_file, 'w') as f:
+        f.write(stamp)
+    hook_api.add_datas([(stamp_file, '_pyi_numba_cache')])
+
+    entry_points = get_hook_config(hook_api, "numba", "precompile")
+    if entry_points and not is_module_satisfies('pyinstaller >= 5.0'):
+        logger.warning("hook-numba: precompile requires PyInstaller >= 5.0; it is ignored.")
+    elif entry_points:
+        from PyInstaller import isolated
+
+        cache_dir = os.path.join(workdir, 'cache')
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        logger.info("hook-numba: pre-populating the numba cache by calling %s", ", ".join(entry_points))
+        isolated.call(_precompile, os.path.join(rthooks.DIR, 'pyi_rth_numba.py'), cache_dir, stamp, entry_points)
+        if os.path.isdir(cache_dir):
+            hook_api.add_datas([(cache_dir, os.path.join('_pyi_numba_cache', 'cache'))])
@@ -17,6 +17,8 @@ from PyInstaller.compat import is_win, is_darwin
 import os
 import sys
 
+from _pyinstaller_hooks_contrib.utils.geodata import select_gdal_data
+
 # The osgeo libraries require auxiliary data and may have hidden dependencies.
 # There are several possible configurations on how these libraries can be
 # deployed.
@@ -41,10 +43,10 @@ is_conda = False
 # Auxiliary data:
 #
 # - general case (data in 'osgeo/data/gdal'):
-datas = collect_data_files('osgeo', subdir=os.path.join('data', 'gdal'))
+_datas = collect_data_files('osgeo', subdir=os.path.join('data', 'gdal'))
 
 # check if the data has been effectively found in 'osgeo/data/gdal'
-if len(datas) == 0:
+if len(_datas) == 0:
 
     if hasattr(sys, 'real_prefix'):  # check if in a virtual environment
         root_path = sys.real_prefix
@@ -65,7 +67,7 @@ if len(datas) == 0:
 
     if os.path.exists(src_gdal_data):
         is_conda = True
-        datas.append((src_gdal_data, tgt_gdal_data))
+        _datas.append((src_gdal_data, tgt_gdal_data))
         # a real-time hook takes case to define the path for `GDAL_DATA`
 
 # Hidden dependencies
@@ -80,3 +82,8 @@ if is_conda:
 
     if os.path.exists(proj4_lib):
         binaries = [(proj4_lib, ".")]
+
+
+# The GDAL data files to collect can be selected, see _pyinstaller_hooks_contrib.utils.geodata.
+def hook(hook_api):
+    hook_api.add_datas(select_gdal_data(hook_api, 'osgeo', _datas))
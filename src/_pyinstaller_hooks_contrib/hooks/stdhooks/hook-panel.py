@@ -12,7 +12,15 @@
 
 from PyInstaller.utils.hooks import collect_data_files, collect_submodules
 
-datas = collect_data_files("panel")
+from _pyinstaller_hooks_contrib.utils.web_assets import slim_web_assets
+
+
+# Development web assets, such as the unminified panel.js bundle and the source maps, are not collected by default, see
+# _pyinstaller_hooks_contrib.utils.web_assets. The vendored libraries in dist/bundled are referenced by name, so their
+# unminified variants are kept.
+def hook(hook_api):
+    hook_api.add_datas(slim_web_assets(hook_api, "panel", collect_data_files("panel"), unminified_dirs=["panel/dist"]))
+
 
 # Some models are lazy-loaded on runtime, so we need to collect them
 hiddenimports = collect_submodules("panel.models")
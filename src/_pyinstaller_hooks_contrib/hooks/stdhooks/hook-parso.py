@@ -8,7 +8,45 @@
 # -----------------------------------------------------------------------------
 
 # Hook for Parso, a static analysis tool https://pypi.org/project/jedi/ (IPython dependency)
+#
+# parso generates the parser tables of its grammars (parso/python/grammar3*.txt) the first time each grammar is
+# loaded. With the hooks configuration option ``hooksconfig={"parso": {"precompile_data": True}}``, they are
+# generated at build time instead, and a runtime hook loads them. The grammar files are still collected: the runtime
+# hook looks up the generated tables by the hash of the grammar text.
+
+import os
+import re
 
 from PyInstaller.utils.hooks import collect_data_files
 
-datas = collect_data_files('parso')
+from _pyinstaller_hooks_contrib.utils.precompile import precompile_data
+
+
+def _precompile(output_dir, grammar_files):
+    import hashlib
+    import os
+    import pickle
+
+    from parso.pgen2 import generate_grammar
+    from parso.python.token import PythonTokenTypes
+
+    class _Pickler(pickle.Pickler):
+        # The parser compares token types by identity, so they are pickled by name.
+        def persistent_id(self, obj):
+            if isinstance(obj, PythonTokenTypes):
+                return obj.name
+            return None
+
+    for filename in grammar_files:
+        with open(filename) as f:
+            bnf_text = f.read()
+        grammar = generate_grammar(bnf_text, token_namespace=PythonTokenTypes)
+        name = hashlib.sha256(bnf_text.encode("utf-8")).hexdigest()
+        with open(os.path.join(output_dir, name + '.pickle'), 'wb') as f:
+            _Pickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(grammar)
+
+
+def hook(hook_api):
+    datas = collect_data_files('parso')
+    grammar_files = [src for src, _ in datas if re.match(r'grammar\d+\.txt$', os.path.basename(src))]
+    hook_api.add_datas(datas + precompile_data(hook_api, 'parso', _precompile, grammar_files))
@@ -13,5 +13,12 @@
 from PyInstaller.utils.hooks import collect_data_files
 from PyInstaller.utils.hooks import collect_submodules
 
-datas = collect_data_files('plotly', includes=['package_data/**/*.*'])
+from _pyinstaller_hooks_contrib.utils.web_assets import slim_web_assets
+
 hiddenimports = collect_submodules('plotly.validators') + ['pandas', 'cmath']
+
+
+# Development web assets are not collected by default, see _pyinstaller_hooks_contrib.utils.web_assets.
+def hook(hook_api):
+    datas = collect_data_files('plotly', includes=['package_data/**/*.*'])
+    hook_api.add_datas(slim_web_assets(hook_api, 'plotly', datas))
@@ -12,4 +12,24 @@
 
 from PyInstaller.utils.hooks import collect_data_files
 
+from _pyinstaller_hooks_contrib.utils.precompile import precompile_data
+
 datas = collect_data_files('publicsuffix2')
+
+
+# With hooksconfig={"publicsuffix2": {"precompile_data": True}}, the trie built from the vendored public suffix list
+# is pickled at build time (in both its IDNA and UTF-8 variants) and the runtime hook loads it instead of parsing the
+# list.
+def _precompile(output_dir):
+    import os
+    import pickle
+    from publicsuffix2 import PublicSuffixList
+
+    for idna in (True, False):
+        psl = PublicSuffixList(idna=idna)
+        with open(os.path.join(output_dir, "idna.pickle" if idna else "utf8.pickle"), "wb") as f:
+            pickle.dump((psl.tlds, psl.root), f, pickle.HIGHEST_PROTOCOL)
+
+
+def hook(hook_api):
+    hook_api.add_datas(precompile_data(hook_api, "publicsuffix2", _precompile))
@@ -11,8 +11,28 @@
 # ------------------------------------------------------------------
 
 # Hook for https://pypi.org/project/pyarrow/
+#
+# By default, all the data files and shared libraries of pyarrow are collected, including the C++ headers, the Cython
+# sources, the test data and every name of the versioned libraries. They can be reduced via the hooks configuration::
+#
+#   hooksconfig={
+#       "pyarrow": {
+#           # Collect each shared library once, under its SONAME, and no development files (default: False).
+#           "slim": True,
+#           # Optional components whose libraries and modules are not collected (default: none).
+#           "exclude_components": ["flight", "gandiva", "dataset", "orc", "substrait"],
+#       },
+#   }
+#
+# The modules of an excluded component which the application imports are still collected, along with the libraries
+# they are linked against.
+
+import fnmatch
+import os
+
+from PyInstaller.utils.hooks import collect_data_files, collect_dynamic_libs, get_hook_config, logger
 
-from PyInstaller.utils.hooks import collect_data_files, collect_dynamic_libs
+from _pyinstaller_hooks_contrib.utils.sonames import collect_by_soname
 
 hiddenimports = [
     "pyarrow._parquet",
@@ -20,5 +40,86 @@ hiddenimports = [
     "pyarrow.compat",
 ]
 
-datas = collect_data_files('pyarrow')
-binaries = collect_dynamic_libs('pyarrow')
+# The modules and the library name prefixes of the optional components.
+COMPONENTS = {
+    "flight": (["pyarrow.flight", "pyarrow._flight"], ["arrow_flight", "arrow_python_flight"]),
+    "gandiva": (["pyarrow.gandiva"], ["gandiva"]),
+    "dataset": ([
+        "pyarrow.dataset", "pyarrow._dataset", "pyarrow._dataset_orc", "pyarrow._dataset_parquet",
+        "pyarrow._dataset_parquet_encryption"
+    ], ["arrow_dataset"]),
+    "orc": (["pyarrow.orc", "pyarrow._orc", "pyarrow._dataset_orc"], []),
+    "substrait": (["pyarrow.substrait", "pyarrow._substrait"], ["arrow_substrait"]),
+}
+
+# Development files, relative to the pyarrow package.
+DEV_EXCLUDES = [
+    "include",
+    "src",
+    "tests",
+    "**/*.pxd",
+    "**/*.pyx",
+    "**/*.pxi",
+    "**/*.h",
+    "**/*.hpp",
+    "**/*.cc",
+    "**/*.cpp",
+    "**/*.lib",
+    "**/*.a",
+    "**/cmake",
+    "**/pkgconfig",
+]
+
+# The versioned libraries, which collect_data_files() would otherwise collect as data files.
+LIBRARY_PATTERNS = ["*.dll", "*.dylib", "lib*.so", "lib*.so.*"]
+
+
+def _library_stem(path):
+    name = os.path.basename(path).split(".")[0]
+    return name[3:] if name.startswith("lib") else name
+
+
+def _is_excluded(path, prefixes):
+    if not any(fnmatch.fnmatch(os.path.basename(path), pattern) for pattern in LIBRARY_PATTERNS):
+        return False
+    stem = _library_stem(path)
+    return any(stem == prefix or stem.startswith(prefix + "_") for prefix in prefixes)
+
+
+def _is_in_graph(hook_api, name):
+    node = hook_api.module_graph.find_node(name)
+    return node is not None and node.filename is not None
+
+
+def hook(hook_api):
+    slim = get_hook_config(hook_api, "pyarrow", "slim")
+    components = get_hook_config(hook_api, "pyarrow", "exclude_components") or []
+
+    excluded_modules, excluded_libraries = [], []
+    for component in components:
+        if component not in COMPONENTS:
+            logger.warning("hook-pyarrow: unknown component %r in exclude_components!", component)
+            continue
+        modules, libraries = COMPONENTS[component]
+        used = [name for name in modules if _is_in_graph(hook_api, name)]
+        if used:
+            logger.warning("hook-pyarrow: the component %r is excluded but the application imports %s.", component,
+                           ", ".join(used))
+        excluded_modules += modules
+        excluded_libraries += libraries
+    if excluded_modules:
+        hook_api.del_imports(*excluded_modules)
+
+    if slim:
+        datas = collect_data_files("pyarrow", excludes=DEV_EXCLUDES + ["**/" + pattern for pattern in LIBRARY_PATTERNS])
+        binaries = collect_dynamic_libs("pyarrow", search_patterns=LIBRARY_PATTERNS)
+    else:
+        datas = collect_data_files("pyarrow")
+        binaries = collect_dynamic_libs("pyarrow")
+    datas = [(src, dest) for src, dest in datas if not _is_excluded(src, excluded_libraries)]
+    binaries = [(src, dest) for src, dest in binaries if not _is_excluded(src, excluded_libraries)]
+    if slim:
+        binaries = collect_by_soname(binaries)
+
+    hook_api.add_datas(datas)
+    hook_api.add_binaries(binaries)
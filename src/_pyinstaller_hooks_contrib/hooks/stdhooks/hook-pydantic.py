@@ -10,16 +10,30 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 # ------------------------------------------------------------------
 
-from PyInstaller.utils.hooks import get_module_attribute, collect_submodules
+from importlib.machinery import EXTENSION_SUFFIXES
+
+from PyInstaller.utils.hooks import collect_submodules
 from PyInstaller.utils.hooks import is_module_satisfies
 
+from _pyinstaller_hooks_contrib.utils.module_attributes import find_module_spec, get_module_attribute
+
 # By default, pydantic from PyPi comes with all modules compiled as
 # cpython extensions, which seems to prevent pyinstaller from automatically
 # picking up the submodules.
-# NOTE: in PyInstaller 4.x and earlier, get_module_attribute() returns the
-# string representation of the value ('True'), while in PyInstaller 5.x
-# and later, the actual value is returned (True).
-is_compiled = get_module_attribute('pydantic', 'compiled') in {'True', True}
+# pydantic.compiled is True exactly when pydantic.version is a compiled
+# extension, which can be checked without importing pydantic.
+version_spec = find_module_spec('pydantic.version')
+if version_spec is not None and version_spec.origin:
+    is_compiled = version_spec.origin.endswith(tuple(EXTENSION_SUFFIXES))
+else:
+    # NOTE: in PyInstaller 4.x and earlier, get_module_attribute() returns the
+    # string representation of the value ('True'), while in PyInstaller 5.x
+    # and later, the actual value is returned (True).
+    try:
+        is_compiled = get_module_attribute('pydantic', 'compiled') in {'True', True}
+    except AttributeError:
+        # pydantic 2.x no longer provides the attribute (nor compiled modules).
+        is_compiled = False
 if is_compiled:
     # Compiled version; we need to manually collect the submodules from
     # pydantic...
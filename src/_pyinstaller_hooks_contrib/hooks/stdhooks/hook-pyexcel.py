@@ -14,7 +14,13 @@
 # This hook was tested with pyexcel 0.5.13:
 # https://github.com/pyexcel/pyexcel
 
-hiddenimports = [
+# pyexcel loads its plugins lazily by name. The ones to collect can be chosen via
+# hooksconfig={"pyexcel": {"plugins": [...]}}, e.g. ["sources.file_input"]; see
+# _pyinstaller_hooks_contrib.utils.plugins.
+
+from _pyinstaller_hooks_contrib.utils.plugins import select_plugins
+
+_plugins = [
     'pyexcel.plugins.renderers.sqlalchemy', 'pyexcel.plugins.renderers.django',
     'pyexcel.plugins.renderers.excel', 'pyexcel.plugins.renderers._texttable',
     'pyexcel.plugins.parsers.excel', 'pyexcel.plugins.parsers.sqlalchemy',
@@ -28,3 +34,7 @@ hiddenimports = [
     'pyexcel.plugins.sources.pydata.records', 'pyexcel.plugins.sources.django',
     'pyexcel.plugins.sources.sqlalchemy', 'pyexcel.plugins.sources.querysets'
 ]
+
+
+def hook(hook_api):
+    hook_api.add_imports(*select_plugins(hook_api, 'pyexcel', 'pyexcel.plugins', _plugins))
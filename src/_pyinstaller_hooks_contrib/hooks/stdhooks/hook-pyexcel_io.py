@@ -14,14 +14,23 @@
 # This hook was tested with pyexcel-io 0.5.18:
 # https://github.com/pyexcel/pyexcel-io
 
-hiddenimports = [
+# pyexcel-io loads its readers and writers lazily by name. The ones to collect
+# can be chosen via hooksconfig={"pyexcel_io": {"plugins": [...]}}, e.g.
+# ["readers.csvr", "writers.csvw"]; see _pyinstaller_hooks_contrib.utils.plugins.
+
+from _pyinstaller_hooks_contrib.utils.plugins import select_plugins
+
+_plugins = [
     'pyexcel_io.readers.csvr', 'pyexcel_io.readers.csvz',
     'pyexcel_io.readers.tsv', 'pyexcel_io.readers.tsvz',
     'pyexcel_io.writers.csvw', 'pyexcel_io.writers.csvz',
     'pyexcel_io.writers.tsv', 'pyexcel_io.writers.tsvz',
-    'pyexcel_io.readers.csvz', 'pyexcel_io.readers.tsv',
-    'pyexcel_io.readers.tsvz', 'pyexcel_io.database.importers.django',
+    'pyexcel_io.database.importers.django',
     'pyexcel_io.database.importers.sqlalchemy',
     'pyexcel_io.database.exporters.django',
     'pyexcel_io.database.exporters.sqlalchemy'
 ]
+
+
+def hook(hook_api):
+    hook_api.add_imports(*select_plugins(hook_api, 'pyexcel_io', 'pyexcel_io', _plugins))
@@ -51,8 +51,9 @@
 # pylint/__init__.py file must be included, since submodules must be children of
 # a module.
 
-from PyInstaller.utils.hooks import collect_data_files, collect_submodules, is_module_or_submodule,\
-    get_module_file_attribute
+from PyInstaller.utils.hooks import collect_data_files, get_module_file_attribute
+
+from _pyinstaller_hooks_contrib.utils.submodules import collect_submodules
 
 datas = (
          [(get_module_file_attribute('pylint.__init__'), 'pylint')] +
@@ -64,11 +65,4 @@ datas = (
 # Add imports from dynamically loaded modules, excluding pylint.test
 # subpackage (pylint <= 2.3) and pylint.testutils submodule (pylint < 2.7)
 # or subpackage (pylint >= 2.7)
-def _filter_func(name):
-    return (
-        not is_module_or_submodule(name, 'pylint.test') and
-        not is_module_or_submodule(name, 'pylint.testutils')
-    )
-
-
-hiddenimports = collect_submodules('pylint', _filter_func)
+hiddenimports = collect_submodules('pylint', prune=['pylint.test', 'pylint.testutils'])
@@ -12,4 +12,24 @@
 
 from PyInstaller.utils.hooks import collect_data_files
 
+from _pyinstaller_hooks_contrib.utils.precompile import precompile_data
+
 datas = collect_data_files('pyphen')
+
+
+# With hooksconfig={"pyphen": {"precompile_data": True}}, the patterns of each hyphenation dictionary are parsed and
+# pickled at build time and the runtime hook loads them instead of parsing the dictionary. The dictionaries themselves
+# are still collected as pyphen lists them to find the available languages.
+def _precompile(output_dir):
+    import os
+    import pickle
+    import pyphen
+
+    for path in set(pyphen.LANGUAGES.values()):
+        hyph_dict = pyphen.HyphDict(path)
+        with open(os.path.join(output_dir, os.path.basename(str(path)) + ".pickle"), "wb") as f:
+            pickle.dump(hyph_dict.patterns, f, pickle.HIGHEST_PROTOCOL)
+
+
+def hook(hook_api):
+    hook_api.add_datas(precompile_data(hook_api, "pyphen", _precompile))
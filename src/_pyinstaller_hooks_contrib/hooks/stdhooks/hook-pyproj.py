@@ -15,6 +15,8 @@ import sys
 from PyInstaller.utils.hooks import collect_data_files, is_module_satisfies
 from PyInstaller.compat import is_win
 
+from _pyinstaller_hooks_contrib.utils.geodata import select_proj_grids
+
 
 hiddenimports = [
     "pyproj.datadir"
@@ -32,7 +34,7 @@ if is_module_satisfies("pyproj >= 3.0.0"):
         hiddenimports += ["distutils.util"]
 
 # Data collection
-datas = collect_data_files('pyproj')
+_datas = collect_data_files('pyproj')
 
 if hasattr(sys, 'real_prefix'):  # check if in a virtual environment
     root_path = sys.real_prefix
@@ -51,8 +53,13 @@ else:  # both linux and darwin
 from PyInstaller.compat import is_conda
 if is_conda:
     if os.path.exists(src_proj_data):
-        datas.append((src_proj_data, tgt_proj_data))
+        _datas.append((src_proj_data, tgt_proj_data))
     else:
         from PyInstaller.utils.hooks import logger
         logger.warning("Datas for pyproj not found at:\n{}".format(src_proj_data))
     # A runtime hook defines the path for `PROJ_LIB`
+
+
+# The PROJ grids to collect can be selected, see _pyinstaller_hooks_contrib.utils.geodata.
+def hook(hook_api):
+    hook_api.add_datas(select_proj_grids(hook_api, 'pyproj', _datas))
@@ -10,7 +10,9 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 # ------------------------------------------------------------------
 
-from PyInstaller.utils.hooks import collect_data_files, collect_submodules
+from PyInstaller.utils.hooks import collect_data_files
+
+from _pyinstaller_hooks_contrib.utils.submodules import collect_submodules
 
 # include all .ui and image files
 datas = collect_data_files("pyqtgraph",
@@ -29,7 +31,8 @@ datas = collect_data_files("pyqtgraph",
 # - pyqtgraph.graphicsItems.PlotItem.plotConfigTemplate_pyside6
 #
 # To be future-proof, we include all of them via a filter in
-# collect-submodules.
+# collect-submodules. The templates of the bundled examples are only
+# needed by the examples themselves.
 # Tested with pyqtgraph master branch (commit c1900aa).
 hiddenimports = collect_submodules(
-    "pyqtgraph", filter=lambda name: "Template" in name)
+    "pyqtgraph", prune="pyqtgraph.examples", filter=lambda name: "Template" in name)
@@ -9,8 +9,190 @@
 #
 # SPDX-License-Identifier: GPL-2.0-or-later
 # ------------------------------------------------------------------
+"""
+pysnmp's MibBuilder finds MIB modules by listing the directories of the pysnmp.smi.mibs.instances and pysnmp.smi.mibs
+packages, and executes their source files, so these are collected as data files. The hooks configuration allows
+restricting the collected MIBs, and compiling them at build time::
 
-from PyInstaller.utils.hooks import collect_submodules, collect_data_files
+    hooksconfig={
+        "pysnmp": {
+            # MIB modules to collect (default: all MIBs shipped with pysnmp). The MIBs imported by these and the ones
+            # used by pysnmp itself are always collected. The pysnmp_mibs package, if installed, is searched as well.
+            "mibs": ["IF-MIB", "IP-MIB"],
+            # Compile the MIB modules at build time into an index which a runtime hook installs as the first MIB
+            # source of every MibBuilder, instead of collecting their sources (default: False). Ignored with the pysnmp
+            # releases which execute the MIB source files by path.
+            "precompile_data": True,
+        },
+    }
+"""
 
-hiddenimports = collect_submodules('pysnmp.smi.mibs')
-datas = collect_data_files('pysnmp.smi.mibs', include_py_files=True)
+import ast
+import os
+
+from PyInstaller.compat import is_py38
+from PyInstaller.utils.hooks import collect_data_files, collect_submodules, get_hook_config, logger
+
+from _pyinstaller_hooks_contrib.utils.module_attributes import find_module_spec
+from _pyinstaller_hooks_contrib.utils.precompile import precompile_data
+
+# The MIB packages, in the order MibBuilder searches them.
+_CORE_MIB_PACKAGES = ('pysnmp.smi.mibs.instances', 'pysnmp.smi.mibs')
+_MISC_MIB_PACKAGE = 'pysnmp_mibs'
+
+
+def _list_mibs(packages):
+    """
+    Map the name of each MIB module found in *packages* to the name of its package and its source file.
+    """
+    mibs = {}
+    for package in packages:
+        spec = find_module_spec(package)
+        if spec is None or not spec.submodule_search_locations:
+            continue
+        directory = spec.submodule_search_locations[0]
+        for filename in sorted(os.listdir(directory)):
+            name, ext = os.path.splitext(filename)
+            if ext == '.py' and name != '__init__':
+                mibs.setdefault(name, (package, os.path.join(directory, filename)))
+    return mibs
+
+
+def _string_literals(nodes):
+    for node in nodes:
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            yield node.value
+        elif not is_py38 and isinstance(node, ast.Str):
+            yield node.s
+
+
+def _imported_mibs(filename):
+    """
+    Find the MIB names passed as string literals to ``importSymbols()`` or ``loadModules()`` (``import_symbols()`` or
+    ``load_modules()`` since pysnmp 7.1) in a Python file.
+    """
+    with open(filename, 'rb') as f:
+        tree = ast.parse(f.read(), filename)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.args:
+            if node.func.attr in ('importSymbols', 'import_symbols'):
+                args = node.args[:1]
+            elif node.func.attr in ('loadModules', 'load_modules'):
+                args = node.args
+            else:
+                continue
+            names.update(_string_literals(args))
+    return names
+
+
+def _pysnmp_mibs():
+    """
+    Find the MIBs loaded by pysnmp itself (e.g., by the SNMP engine).
+    """
+    spec = find_module_spec('pysnmp')
+    if spec is None or not spec.submodule_search_locations:
+        return set()
+    pysnmp_dir = spec.submodule_search_locations[0]
+    mibs_dir = os.path.join(pysnmp_dir, 'smi', 'mibs')
+    names = set()
+    for root, dirs, files in os.walk(pysnmp_dir):
+        if root == mibs_dir:
+            dirs[:] = []
+            continue
+        for filename in files:
+            if filename.endswith('.py'):
+                names |= _imported_mibs(os.path.join(root, filename))
+    return names
+
+
+def _select_mibs(requested, used):
+    """
+    Return the subset of the available MIBs which consists of the *requested* ones, the ones *used* by pysnmp, all the
+    MIBs these import and their instance MIBs.
+    """
+    available = _list_mibs(_CORE_MIB_PACKAGES + (_MISC_MIB_PACKAGE,))
+    selected = {}
+    todo = list(requested) + sorted(used)
+    while todo:
+        name = todo.pop()
+        if name in selected:
+            continue
+        if name not in available:
+            if name in requested:
+                logger.warning("hook-pysnmp: MIB module %r not found; it is not collected.", name)
+            continue
+        selected[name] = available[name]
+        todo += sorted(_imported_mibs(available[name][1]))
+        # Instances of the MIB's managed objects (pysnmp.smi.mibs.instances).
+        todo.append('__' + name)
+    return selected
+
+
+def _executes_mib_files():
+    """
+    Check whether MibBuilder executes the MIB source files by path (with ``runpy.run_path()``, as do recent pysnmp 7.1
+    releases unless Python runs optimized), rather than the code objects read from its MIB sources.
+    """
+    spec = find_module_spec('pysnmp.smi.builder')
+    with open(spec.origin, 'rb') as f:
+        tree = ast.parse(f.read(), spec.origin)
+    return any(
+        isinstance(node, ast.Attribute) and node.attr == 'run_path' and isinstance(node.value, ast.Name)
+        and node.value.id == 'runpy' for node in ast.walk(tree)
+    )
+
+
+def _precompile(output_dir, mibs):
+    import marshal
+    import os
+
+    # Code objects are compiled with the file name used in tracebacks. MibBuilder executes them in a fresh namespace,
+    # so there is nothing else to resolve at build time.
+    index = {}
+    for name, (filename, display_name) in mibs.items():
+        with open(filename) as f:
+            index[name] = compile(f.read(), display_name, 'exec')
+    with open(os.path.join(output_dir, 'mibs.marshal'), 'wb') as f:
+        marshal.dump(index, f)
+
+
+def hook(hook_api):
+    requested = get_hook_config(hook_api, 'pysnmp', 'mibs')
+    if requested is not None:
+        used = _pysnmp_mibs()
+        if not used:
+            # The MIB builder API is not recognized: the closure of the MIBs would be incomplete.
+            logger.warning("hook-pysnmp: no MIB module loaded by pysnmp found; collecting all MIB modules.")
+            requested = None
+    if requested is None:
+        mibs = _list_mibs(_CORE_MIB_PACKAGES)
+    else:
+        mibs = _select_mibs(requested, used)
+        logger.info("hook-pysnmp: collecting %d MIB modules.", len(mibs))
+
+    if _executes_mib_files():
+        # The precompiled index has no files to execute.
+        if get_hook_config(hook_api, 'pysnmp', 'precompile_data'):
+            logger.warning("hook-pysnmp: this pysnmp executes the MIB source files; ignoring precompile_data.")
+        precompiled = []
+    else:
+        precompiled = precompile_data(
+            hook_api, 'pysnmp', _precompile, {
+                name: (filename, os.path.join(package.replace('.', os.sep), os.path.basename(filename)))
+                for name, (package, filename) in mibs.items()
+            }
+        )
+    # The MIB modules are also collected as hidden imports, so that their own (Python) imports are analyzed.
+    if precompiled:
+        hook_api.add_datas(precompiled)
+    elif requested is None:
+        hook_api.add_datas(collect_data_files('pysnmp.smi.mibs', include_py_files=True))
+    else:
+        hook_api.add_datas([(filename, package.replace('.', os.sep)) for package, filename in mibs.values()])
+
+    if requested is None:
+        hook_api.add_imports(*collect_submodules('pysnmp.smi.mibs'))
+    else:
+        packages = set(_CORE_MIB_PACKAGES) | {package for package, _ in mibs.values()}
+        hook_api.add_imports(*packages, *(f'{package}.{name}' for name, (package, _) in mibs.items()))
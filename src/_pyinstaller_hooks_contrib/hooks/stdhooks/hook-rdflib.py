@@ -10,7 +10,13 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 # ------------------------------------------------------------------
 
+# rdflib looks up its parsers, serializers, stores and query processors by name at run-time. The plugins to collect can
+# be restricted via hooksconfig={"rdflib": {"plugins": [...]}}, see _pyinstaller_hooks_contrib.utils.plugins.
 
 from PyInstaller.utils.hooks import collect_submodules
 
-hiddenimports = collect_submodules('rdflib.plugins')
+from _pyinstaller_hooks_contrib.utils.plugins import select_plugins
+
+
+def hook(hook_api):
+    hook_api.add_imports(*select_plugins(hook_api, 'rdflib', 'rdflib.plugins', collect_submodules('rdflib.plugins')))
@@ -9,8 +9,8 @@
 #
 # SPDX-License-Identifier: GPL-2.0-or-later
 # ------------------------------------------------------------------
-import json
-from PyInstaller.utils.hooks import exec_statement
+from _pyinstaller_hooks_contrib.utils.module_attributes import get_module_attribute
+from _pyinstaller_hooks_contrib.utils.prefetch import prefetched
 
 hiddenimports = ["sentry_sdk.integrations.stdlib",
                  "sentry_sdk.integrations.excepthook",
@@ -21,20 +21,11 @@ hiddenimports = ["sentry_sdk.integrations.stdlib",
                  "sentry_sdk.integrations.logging",
                  "sentry_sdk.integrations.threading"]
 
-statement = """
-import json
-import sentry_sdk.integrations as si
+# _AUTO_ENABLING_INTEGRATIONS is a list of strings with default enabled integrations
+# https://github.com/getsentry/sentry-python/blob/c6b6f2086b58ffc674df5c25a600b8a615079fb5/sentry_sdk/integrations/__init__.py#L54-L66
+try:
+    integrations = prefetched(get_module_attribute, 'sentry_sdk.integrations', '_AUTO_ENABLING_INTEGRATIONS')
+except AttributeError:
+    integrations = []
 
-integrations = []
-if hasattr(si, '_AUTO_ENABLING_INTEGRATIONS'):
-    # _AUTO_ENABLING_INTEGRATIONS is a list of strings with default enabled integrations
-    # https://github.com/getsentry/sentry-python/blob/c6b6f2086b58ffc674df5c25a600b8a615079fb5/sentry_sdk/integrations/__init__.py#L54-L66
-
-    def make_integration_name(integration_name: str):
-        return integration_name.rsplit(".", maxsplit=1)[0]
-
-    integrations.extend(map(make_integration_name, si._AUTO_ENABLING_INTEGRATIONS))
-print(json.dumps(integrations))
-"""
-
-hiddenimports.extend(json.loads(exec_statement(statement)))
+hiddenimports.extend(integration.rsplit(".", maxsplit=1)[0] for integration in integrations)
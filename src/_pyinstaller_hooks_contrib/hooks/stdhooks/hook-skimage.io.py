@@ -14,7 +14,24 @@
 # This hook was tested with scikit-image (skimage) 0.14.1:
 # https://scikit-image.org
 
+import os
+
 from PyInstaller.utils.hooks import collect_data_files, collect_submodules
 
-datas = collect_data_files("skimage.io._plugins")
-hiddenimports = collect_submodules('skimage.io._plugins')
+from _pyinstaller_hooks_contrib.utils.plugins import select_plugins
+
+
+# The plugins to collect can be chosen via hooksconfig={"skimage": {"plugins": [...]}}, e.g. ["pil_plugin"]; see
+# _pyinstaller_hooks_contrib.utils.plugins. Each plugin is described by a .ini file next to its module, which is
+# collected only for the selected plugins, so that skimage.io does not offer the excluded ones.
+def hook(hook_api):
+    plugins = select_plugins(
+        hook_api, "skimage", "skimage.io._plugins", collect_submodules('skimage.io._plugins')
+    )
+    hook_api.add_imports(*plugins)
+
+    plugin_names = {name.rpartition(".")[2] for name in plugins}
+    hook_api.add_datas([
+        (src, dest) for src, dest in collect_data_files("skimage.io._plugins")
+        if not src.endswith(".ini") or os.path.splitext(os.path.basename(src))[0] in plugin_names
+    ])
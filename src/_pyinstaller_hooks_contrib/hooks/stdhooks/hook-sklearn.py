@@ -13,4 +13,16 @@
 # Tested on Windows 10 64bit with python 3.7.1
 
 from PyInstaller.utils.hooks import collect_data_files
-datas = collect_data_files('sklearn')
+
+from _pyinstaller_hooks_contrib.utils.hook_cache import cached_hook_result
+
+
+def _collect():
+    return {'datas': collect_data_files('sklearn')}
+
+
+# The collected data files only depend on the installed scikit-learn package, so they can be reused across builds, see
+# _pyinstaller_hooks_contrib.utils.hook_cache.
+def hook(hook_api):
+    result = cached_hook_result(hook_api, 'sklearn', _collect, distributions=['scikit-learn'], packages=['sklearn'])
+    hook_api.add_datas(result['datas'])
@@ -11,9 +11,80 @@
 
 """
 Spacy contains hidden imports and data files which are needed to import it
+
+Languages are loaded lazily (``importlib.import_module(".lang.xx", "spacy")``) so every ``spacy.lang.*`` package is a
+hidden import. The set of bundled languages, the ``spacy.cli`` and ``spacy.training`` submodules and any installed
+pipeline (model) packages can be selected via the hooks configuration::
+
+    hooksconfig={
+        "spacy": {
+            # Language codes to keep (default: all of them).
+            "languages": ["en", "de"],
+            # Collect spacy.cli.* and spacy.training.* as hidden imports (default: True). Any of these modules which
+            # are imported directly by the rest of spacy are still collected by the import analysis.
+            "include_training": False,
+            # Installed pipeline packages to collect (default: none).
+            "models": ["en_core_web_sm"],
+        },
+    }
 """
 
-from PyInstaller.utils.hooks import collect_data_files, collect_submodules
+import os
+
+from PyInstaller.utils.hooks import collect_data_files, collect_submodules, copy_metadata, get_hook_config, \
+    get_package_paths, logger
+
+from _pyinstaller_hooks_contrib.utils.prefetch import prefetched
+
+
+def _spacy_languages():
+    """
+    List the language codes (sub-packages of spacy.lang) available in the installed spacy.
+    """
+    lang_dir = os.path.join(get_package_paths("spacy")[1], "lang")
+    return sorted(
+        name for name in os.listdir(lang_dir) if os.path.isfile(os.path.join(lang_dir, name, "__init__.py"))
+    )
+
+
+def hook(hook_api):
+    languages = get_hook_config(hook_api, "spacy", "languages")
+    include_training = get_hook_config(hook_api, "spacy", "include_training")
+    models = get_hook_config(hook_api, "spacy", "models") or []
+
+    excluded_languages = set()
+    if languages is not None:
+        available = _spacy_languages()
+        for lang in set(languages) - set(available):
+            logger.warning("hook-spacy: language %r is not provided by the installed spacy!", lang)
+        excluded_languages = set(available) - set(languages)
+        logger.info("hook-spacy: collecting %d of %d languages.", len(available) - len(excluded_languages),
+                    len(available))
+
+    excluded_packages = ["spacy.lang." + lang for lang in excluded_languages]
+    if include_training is False:
+        excluded_packages += ["spacy.cli", "spacy.training"]
+
+    def _filter(name):
+        # Since PyInstaller 5.0, collect_submodules() applies the filter to sub-packages before descending into them,
+        # so excluded packages are never imported at build time.
+        return not any(name == pkg or name.startswith(pkg + ".") for pkg in excluded_packages)
+
+    # Only the unfiltered collection can be prefetched.
+    if excluded_packages:
+        hook_api.add_imports(*collect_submodules("spacy", filter=_filter))
+    else:
+        hook_api.add_imports(*prefetched(collect_submodules, "spacy"))
+
+    excluded_dirs = [os.path.join("spacy", "lang", lang) for lang in excluded_languages]
+    hook_api.add_datas([
+        (src, dest) for (src, dest) in prefetched(collect_data_files, "spacy")
+        if not any(dest == path or dest.startswith(path + os.sep) for path in excluded_dirs)
+    ])
 
-datas = collect_data_files("spacy")
-hiddenimports = collect_submodules("spacy")
+    # Pipeline packages are plain distributions located via their entry points/metadata and loaded with
+    # importlib.import_module(), hence they are only collected if explicitly requested.
+    for model in models:
+        hook_api.add_imports(model)
+        hook_api.add_datas(collect_data_files(model))
+        hook_api.add_datas(copy_metadata(model))
@@ -10,9 +10,11 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 # ------------------------------------------------------------------
 
-from PyInstaller.utils.hooks import collect_data_files, collect_submodules, copy_metadata
+from PyInstaller.utils.hooks import collect_data_files, copy_metadata
 
-hiddenimports = collect_submodules("sunpy", filter=lambda x: "tests" not in x.split("."))
+from _pyinstaller_hooks_contrib.utils.submodules import collect_submodules
+
+hiddenimports = collect_submodules("sunpy", prune=lambda x: x.rpartition(".")[2] == "tests")
 datas = collect_data_files("sunpy", excludes=['**/tests/', '**/test/'])
 datas += collect_data_files("drms")
 datas += copy_metadata("sunpy")
@@ -13,10 +13,7 @@
 from PyInstaller.utils.hooks import is_module_satisfies, \
     collect_submodules, collect_data_files
 
-tf_pre_1_15_0 = is_module_satisfies("tensorflow < 1.15.0")
-tf_post_1_15_0 = is_module_satisfies("tensorflow >= 1.15.0")
-tf_pre_2_0_0 = is_module_satisfies("tensorflow < 2.0.0")
-tf_pre_2_2_0 = is_module_satisfies("tensorflow < 2.2.0")
+from _pyinstaller_hooks_contrib.utils.hook_cache import cached_hook_result
 
 
 # Exclude from data collection:
@@ -45,31 +42,52 @@ def _submodules_filter(x):
     return x not in excluded_submodules
 
 
-if tf_pre_1_15_0:
-    # 1.14.x and earlier: collect everything from tensorflow
-    hiddenimports = collect_submodules('tensorflow',
-                                       filter=_submodules_filter)
-    datas = collect_data_files('tensorflow', excludes=data_excludes)
-elif tf_post_1_15_0 and tf_pre_2_2_0:
-    # 1.15.x - 2.1.x: collect everything from tensorflow_core
-    hiddenimports = collect_submodules('tensorflow_core',
-                                       filter=_submodules_filter)
-    datas = collect_data_files('tensorflow_core', excludes=data_excludes)
-
-    # Under 1.15.x, we seem to fail collecting a specific submodule,
-    # and need to add it manually...
-    if tf_post_1_15_0 and tf_pre_2_0_0:
-        hiddenimports += \
-            ['tensorflow_core._api.v1.compat.v2.summary.experimental']
-else:
-    # 2.2.0 and newer: collect everything from tensorflow again
-    hiddenimports = collect_submodules('tensorflow',
-                                       filter=_submodules_filter)
-    datas = collect_data_files('tensorflow', excludes=data_excludes)
-
-    # From 2.6.0 on, we also need to explicitly collect keras (due to
-    # lazy mapping of tensorflow.keras.xyz -> keras.xyz)
-    if is_module_satisfies("tensorflow >= 2.6.0"):
-        hiddenimports += collect_submodules('keras')
+def _collect():
+    tf_pre_1_15_0 = is_module_satisfies("tensorflow < 1.15.0")
+    tf_post_1_15_0 = is_module_satisfies("tensorflow >= 1.15.0")
+    tf_pre_2_0_0 = is_module_satisfies("tensorflow < 2.0.0")
+    tf_pre_2_2_0 = is_module_satisfies("tensorflow < 2.2.0")
+
+    if tf_pre_1_15_0:
+        # 1.14.x and earlier: collect everything from tensorflow
+        hiddenimports = collect_submodules('tensorflow',
+                                           filter=_submodules_filter)
+        datas = collect_data_files('tensorflow', excludes=data_excludes)
+    elif tf_post_1_15_0 and tf_pre_2_2_0:
+        # 1.15.x - 2.1.x: collect everything from tensorflow_core
+        hiddenimports = collect_submodules('tensorflow_core',
+                                           filter=_submodules_filter)
+        datas = collect_data_files('tensorflow_core', excludes=data_excludes)
+
+        # Under 1.15.x, we seem to fail collecting a specific submodule,
+        # and need to add it manually...
+        if tf_post_1_15_0 and tf_pre_2_0_0:
+            hiddenimports += \
+                ['tensorflow_core._api.v1.compat.v2.summary.experimental']
+    else:
+        # 2.2.0 and newer: collect everything from tensorflow again
+        hiddenimports = collect_submodules('tensorflow',
+                                           filter=_submodules_filter)
+        datas = collect_data_files('tensorflow', excludes=data_excludes)
+
+        # From 2.6.0 on, we also need to explicitly collect keras (due to
+        # lazy mapping of tensorflow.keras.xyz -> keras.xyz)
+        if is_module_satisfies("tensorflow >= 2.6.0"):
+            hiddenimports += collect_submodules('keras')
+
+    return {'hiddenimports': hiddenimports, 'datas': datas}
+
 
 excludedimports = excluded_submodules
+
+
+# The collected submodules and data files only depend on the installed tensorflow and keras packages, so they can be
+# reused across builds, see _pyinstaller_hooks_contrib.utils.hook_cache.
+def hook(hook_api):
+    result = cached_hook_result(
+        hook_api, 'tensorflow', _collect,
+        distributions=['tensorflow'],
+        packages=['tensorflow', 'tensorflow_core', 'keras'],
+    )
+    hook_api.add_imports(*result['hiddenimports'])
+    hook_api.add_datas(result['datas'])
@@ -14,5 +14,7 @@ Thinc contains data files and hidden imports. This hook was created to make spac
 """
 from PyInstaller.utils.hooks import collect_data_files, collect_submodules
 
-datas = collect_data_files("thinc")
-hiddenimports = collect_submodules("thinc")
+from _pyinstaller_hooks_contrib.utils.prefetch import prefetched
+
+datas = prefetched(collect_data_files, "thinc")
+hiddenimports = prefetched(collect_submodules, "thinc")
@@ -0,0 +1,284 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+"""
+Batched building of the frozen programs of the tests.
+
+Most tests in test_libraries.py freeze a few lines of code with ``pyi_builder.test_source()``, and spend most of their
+time building the program. With ``pytest --batch-frozen``, the snippets of these tests are recorded before the tests
+run, and compatible snippets are frozen together into one program, which runs one of them per invocation. Each test
+then runs its snippet from the shared program, in a process of its own, and passes or fails on its own.
+
+Snippets are compatible if they are built in the same mode, with the same PyInstaller arguments, and if none of them
+imports a module excluded by the hooks of the packages another one imports: the other snippet would collect the module,
+and hide a hook which excludes a module its package needs. Tests which use other fixtures or other methods of
+``pyi_builder``, and tests which are skipped or expected to fail, are built on their own, as are the tests of a batch
+which fails to build.
+"""
+
+import ast
+import functools
+import glob
+import os
+import sys
+import textwrap
+import traceback
+
+import pytest
+from PyInstaller.utils.conftest import SUPPORTED_OSES, AppBuilder
+
+import PyInstaller
+from _pyinstaller_hooks_contrib.hooks import stdhooks
+
+# The fixtures a test may use, besides the parameters of a parametrized test, to have its snippet batched.
+_BATCHABLE_FIXTURES = {
+    'pyi_builder', 'pyi_modgraph', 'tmpdir', 'tmpdir_factory', 'tmp_path', 'tmp_path_factory', 'monkeypatch', 'request'
+}
+
+_HOOK_DIRS = [os.path.join(os.path.dirname(PyInstaller.__file__), 'hooks'), *stdhooks.get_hook_dirs()]
+
+BATCH_KEY = pytest.StashKey()
+
+# The script of the batched programs, which runs the snippet named by its first argument as its main module.
+_DISPATCHER = """\
+import runpy
+import sys
+
+runpy.run_module(sys.argv.pop(1), run_name='__main__', alter_sys=True)
+"""
+
+
+def _imported_modules(source):
+    """
+    Return the names of the top-level modules imported by *source*.
+    """
+    modules = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.add(node.module.split('.')[0])
+    return modules
+
+
+@functools.lru_cache(maxsize=None)
+def _excluded_by_hooks(package):
+    """
+    Return the names of the top-level modules in the ``excludedimports`` of the hooks for *package* and its submodules.
+
+    Only the literal lists assigned at the top level of the hooks are considered.
+    """
+    excluded = set()
+    for hooks_dir in _HOOK_DIRS:
+        hook_files = glob.glob(os.path.join(hooks_dir, f'hook-{package}.py'))
+        hook_files += glob.glob(os.path.join(hooks_dir, f'hook-{package}.*.py'))
+        for hook_file in hook_files:
+            with open(hook_file, 'rb') as f:
+                tree = ast.parse(f.read())
+            for node in tree.body:
+                if not isinstance(node, ast.Assign):
+                    continue
+                if not any(isinstance(target, ast.Name) and target.id == 'excludedimports' for target in node.targets):
+                    continue
+                try:
+                    excluded.update(name.split('.')[0] for name in ast.literal_eval(node.value))
+                except ValueError:
+                    pass
+    excluded.discard(package)
+    return frozenset(excluded)
+
+
+class Snippet:
+    """
+    The source code frozen by a test, with the PyInstaller arguments it is built with and its expected exit code.
+    """
+    def __init__(self, source, pyi_args=(), retcode=0):
+        self.source = textwrap.dedent(source)
+        self.pyi_args = tuple(pyi_args)
+        self.retcode = retcode
+        self.imports = _imported_modules(self.source)
+        self.excluded = set().union(*map(_excluded_by_hooks, self.imports))
+        self.module = None
+
+
+class Batch:
+    """
+    Snippets which are frozen together into one program.
+    """
+    def __init__(self, name, mode, pyi_args):
+        self.name = name
+        self.mode = mode
+        self.pyi_args = pyi_args
+        self.snippets = []
+        self.imports = set()
+        self.excluded = set()
+        # The path of the built program, or False if building it failed.
+        self.executable = None
+
+    def accepts(self, mode, snippet, max_size):
+        return (
+            (mode, snippet.pyi_args) == (self.mode, self.pyi_args) and len(self.snippets) < max_size
+            and not snippet.imports & self.excluded and not snippet.excluded & self.imports
+        )
+
+    def add(self, snippet):
+        snippet.module = f'{self.name}_{len(self.snippets)}'
+        self.snippets.append(snippet)
+        self.imports |= snippet.imports
+        self.excluded |= snippet.excluded
+
+    def build(self, request, tmpdir_factory):
+        """
+        Build the program on first use. Return its path, or False if building it failed.
+        """
+        if self.executable is not None:
+            return self.executable
+        self.executable = False
+        batch_dir = tmpdir_factory.mktemp(self.name)
+        snippets_dir = batch_dir.mkdir('snippets')
+        pyi_args = list(self.pyi_args) + ['--name', self.name, '--path', str(snippets_dir)]
+        for snippet in self.snippets:
+            snippets_dir.join(snippet.module + '.py').write_text(snippet.source, encoding='utf-8')
+            pyi_args += ['--hidden-import', snippet.module]
+        dispatcher = batch_dir.join(self.name + '.py')
+        dispatcher.write_text(_DISPATCHER, encoding='utf-8')
+
+        builder = AppBuilder(batch_dir, request, self.mode)
+        builder.script = str(dispatcher)
+        print('------- Building the batch', self.name, 'of', len(self.snippets), 'snippets. -------')
+        try:
+            builder._test_building(args=pyi_args)
+        except (Exception, SystemExit):
+            traceback.print_exc()
+            print('------- Building the batch failed; building its snippets on their own. -------')
+            return False
+        executables = builder._find_executables(self.name)
+        if executables:
+            self.executable = executables[0]
+        return self.executable
+
+
+def batch_snippets(snippets, max_size):
+    """
+    Group *snippets*, a list of (mode, Snippet) tuples, into batches of at most *max_size* snippets.
+    """
+    batches = []
+    for mode, snippet in snippets:
+        for batch in batches:
+            if batch.accepts(mode, snippet, max_size):
+                break
+        else:
+            batch = Batch(f'pyi_batch_{len(batches)}', mode, snippet.pyi_args)
+            batches.append(batch)
+        batch.add(snippet)
+    return batches
+
+
+class _Recorded(Exception):
+    pass
+
+
+class _SnippetRecorder:
+    """
+    Stands in for ``pyi_builder`` to record the snippet of a test, without building it.
+    """
+    def __init__(self, mode):
+        self._mode = mode
+        self.snippet = None
+
+    def test_source(
+        self, source, pyi_args=None, app_name=None, app_args=None, runtime=None, run_from_path=False, test_id=None,
+        retcode=0
+    ):
+        if not (app_name or app_args or runtime or run_from_path):
+            self.snippet = Snippet(source, pyi_args or (), retcode)
+        raise _Recorded
+
+
+def _record_snippet(item):
+    """
+    Return the (mode, Snippet) frozen by test *item*, or None if the test cannot be batched.
+    """
+    if not isinstance(item, pytest.Function) or 'pyi_builder' not in item.fixturenames:
+        return None
+    params = dict(item.callspec.params) if hasattr(item, 'callspec') else {}
+    mode = params.pop('pyi_builder', None)
+    if mode is None or set(item.fixturenames) - _BATCHABLE_FIXTURES - set(params):
+        return None
+    markers = {marker.name for marker in item.iter_markers()}
+    platforms = markers & SUPPORTED_OSES
+    if 'skip' in markers or 'xfail' in markers or (platforms and sys.platform not in platforms):
+        return None
+    if any(marker.args and marker.args[0] for marker in item.iter_markers('skipif')):
+        return None
+
+    recorder = _SnippetRecorder(mode)
+    try:
+        item.obj(pyi_builder=recorder, **params)
+    except _Recorded:
+        return None if recorder.snippet is None else (mode, recorder.snippet)
+    except (Exception, pytest.skip.Exception, pytest.fail.Exception):
+        pass
+    return None
+
+
+class BatchedAppBuilder(AppBuilder):
+    """
+    Runs the snippet of a test from the program of its batch, or builds it on its own if building the batch failed.
+    """
+    def __init__(self, tmpdir, request, bundle_mode, batch, snippet, tmpdir_factory):
+        super().__init__(tmpdir, request, bundle_mode)
+        self._batch = batch
+        self._snippet = snippet
+        self._tmpdir_factory = tmpdir_factory
+
+    def test_source(self, source, *args, **kwargs):
+        __tracebackhide__ = True
+        batched = textwrap.dedent(source) == self._snippet.source
+        if not batched or not self._batch.build(self._request, self._tmpdir_factory):
+            return super().test_source(source, *args, **kwargs)
+        retcode = self._run_executable(self._batch.executable, [self._snippet.module], False, None)
+        if retcode != self._snippet.retcode:
+            pytest.fail(
+                'Running snippet %s of %s failed with return-code %s.' %
+                (self._snippet.module, self._batch.executable, retcode)
+            )
+
+
+def add_options(parser):
+    parser.addoption(
+        '--batch-frozen',
+        action='store_true',
+        help='Freeze the snippets of compatible tests together, into one program per batch.',
+    )
+    parser.addoption(
+        '--batch-frozen-size',
+        type=int,
+        default=20,
+        help='The maximal number of snippets frozen into one program (default: %(default)s).',
+    )
+
+
+def batch_items(config, items):
+    # The hooks used by the tests of a batch cannot be told apart, and the run-time hooks of the other snippets skew the
+    # memory footprint of each snippet, so that tests are not batched while recording their hooks or benchmarking them.
+    if not config.getoption('batch_frozen') or config.getoption('record_hooks') or config.getoption('memory_benchmark'):
+        return
+    recorded = []
+    for item in items:
+        snippet = _record_snippet(item)
+        if snippet is not None:
+            recorded.append((item, snippet))
+    batches = batch_snippets([snippet for _, snippet in recorded], config.getoption('batch_frozen_size'))
+    batch_of = {id(snippet): batch for batch in batches for snippet in batch.snippets}
+    for item, (_, snippet) in recorded:
+        batch = batch_of[id(snippet)]
+        item.stash[BATCH_KEY] = (batch, snippet)
@@ -11,3 +11,96 @@
 # ------------------------------------------------------------------
 # Import all fixtures from PyInstaller into the tests.
 from PyInstaller.utils.conftest import *
+import os
+from types import SimpleNamespace
+
+import pytest
+from PyInstaller.building.build_main import Analysis
+from PyInstaller.utils.conftest import _PYI_BUILDER_CLEANUP
+
+from _pyinstaller_hooks_contrib.tests import batched_builder, hook_selection, memory_benchmark, shared_analysis
+from _pyinstaller_hooks_contrib.tests.batched_builder import BATCH_KEY, BatchedAppBuilder
+from _pyinstaller_hooks_contrib.tests.memory_benchmark import BENCHMARK_KEY, MemoryBenchmarkAppBuilder
+from _pyinstaller_hooks_contrib.tests.shared_analysis import SharedAnalysisAppBuilder, shared_build
+
+
+def pytest_addoption(parser):
+    batched_builder.add_options(parser)
+    hook_selection.add_options(parser)
+    memory_benchmark.add_options(parser)
+    shared_analysis.add_options(parser)
+
+
+def pytest_configure(config):
+    hook_selection.start_recording(config)
+    memory_benchmark.start_benchmark(config)
+
+
+# Run after the deselection by -k and -m, and select the tests to run before batching them.
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    hook_selection.deselect_unaffected(config, items)
+    batched_builder.batch_items(config, items)
+
+
+# Replaces PyInstaller's fixture of the same name. The builds of a test in both modes share their Analysis, the tests
+# of snippets batched with --batch-frozen run them from the program of their batch, and those of snippets benchmarked
+# with --memory-benchmark measure their memory footprint.
+@pytest.fixture(params=['onedir', 'onefile'])
+def pyi_builder(tmpdir, monkeypatch, request, pyi_modgraph, tmpdir_factory):
+    # Save/restore environment variable PATH.
+    monkeypatch.setenv('PATH', os.environ['PATH'])
+    # PyInstaller or a test case might manipulate 'sys.path'. Reset it for every test.
+    monkeypatch.syspath_prepend(None)
+    # Set current working directory to
+    monkeypatch.chdir(tmpdir)
+    # Clean up configuration and force PyInstaller to do a clean configuration for another app/test. The value is same
+    # as the original value.
+    monkeypatch.setattr('PyInstaller.config.CONF', {'pathex': []})
+
+    batched = request.node.stash.get(BATCH_KEY, None)
+    benchmark = request.config.stash.get(BENCHMARK_KEY, None)
+    if batched is None:
+        shared = shared_build(request, tmpdir_factory)
+        if benchmark is None:
+            yield SharedAnalysisAppBuilder(tmpdir, request, request.param, shared)
+        else:
+            yield MemoryBenchmarkAppBuilder(tmpdir, request, request.param, shared, benchmark)
+    else:
+        yield BatchedAppBuilder(tmpdir, request, request.param, *batched, tmpdir_factory)
+
+    # Clean up the temporary directory of a successful test, and the shared directory once it passed in both modes.
+    if _PYI_BUILDER_CLEANUP and request.node.rep_setup.passed and request.node.rep_call.passed:
+        if tmpdir.exists():
+            tmpdir.remove(rec=1, ignore_errors=True)
+        if batched is None and shared.finish(request.param) and shared.directory.exists():
+            shared.directory.remove(rec=1, ignore_errors=True)
+
+
+# Sets the hooks configuration of the builds of a test, as the ``hooksconfig`` argument of the Analysis of a .spec file
+# would. Tests which use it are built on their own with --batch-frozen.
+@pytest.fixture
+def pyi_hooksconfig(monkeypatch):
+    def set_hooksconfig(hooksconfig):
+        init = Analysis.__init__
+
+        def __init__(self, *args, **kwargs):
+            kwargs['hooksconfig'] = {**hooksconfig, **(kwargs.get('hooksconfig') or {})}
+            init(self, *args, **kwargs)
+
+        monkeypatch.setattr(Analysis, '__init__', __init__)
+
+    return set_hooksconfig
+
+
+# Creates the minimal hook API used by the helpers of the hooks, out of the tests' builds: the hooks configuration of
+# the Analysis, and a module graph in which no module is found.
+@pytest.fixture
+def fake_hook_api():
+    def make_hook_api(hooksconfig=None):
+        return SimpleNamespace(
+            analysis=SimpleNamespace(hooksconfig=hooksconfig or {}),
+            module_graph=SimpleNamespace(find_node=lambda name: None),
+        )
+
+    return make_hook_api
@@ -0,0 +1,230 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+"""
+Selection of the frozen tests by the hooks they exercise.
+
+``pytest --record-hooks=hooks-map.json`` records which hooks of this package (module hooks, pre-find-module-path and
+pre-safe-import-module hooks, and run-time hooks) each test's build used, from PyInstaller's log, and stores them in a
+map. ``pytest --select-by-hooks=hooks-map.json`` then runs only the tests which use a hook modified since
+``--hooks-base`` (a git revision, ``HEAD`` by default, i.e. the uncommitted changes), the tests which are new or were
+modified since the recording, and the tests which do not build a frozen program.
+
+The map is stale, and all tests run, if it was recorded with another version of PyInstaller or of Python, or if a file
+of this package other than its known hooks and its test modules was modified: e.g., a new hook, ``rthooks.dat``, a
+utility module used by the hooks, or the fixtures of the test suite.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import subprocess
+import sys
+
+import pytest
+from PyInstaller import __version__ as pyinstaller_version
+
+from _pyinstaller_hooks_contrib.tests.shared_analysis import node_id_without_mode
+
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_HOOKS_DIR = os.path.join(_PACKAGE_DIR, 'hooks')
+
+
+def _hook_files():
+    """
+    Return the paths, relative to this package, of all its hooks.
+    """
+    hook_files = []
+    for root, dirs, files in os.walk(_HOOKS_DIR):
+        dirs[:] = [name for name in dirs if name != '__pycache__']
+        for name in files:
+            if name.endswith('.py') and name != '__init__.py':
+                hook_files.append(os.path.relpath(os.path.join(root, name), _PACKAGE_DIR).replace(os.sep, '/'))
+    return sorted(hook_files)
+
+
+def _environment():
+    return {'pyinstaller': pyinstaller_version, 'python': '%d.%d' % sys.version_info[:2]}
+
+
+def _source_hash(function):
+    """
+    Hash the source of a test function, and of the test functions wrapped by its decorators.
+    """
+    digest = hashlib.sha256(inspect.getsource(function).encode('utf-8'))
+    for cell in function.__closure__ or ():
+        if inspect.isfunction(cell.cell_contents):
+            digest.update(inspect.getsource(cell.cell_contents).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class _HookLogHandler(logging.Handler):
+    """
+    Collects the hooks of this package which PyInstaller's log reports as used.
+    """
+    def __init__(self):
+        super().__init__(logging.INFO)
+        self.hooks = set()
+
+    def emit(self, record):
+        message = record.msg
+        if message.startswith('Loading module hook'):
+            # The name and directory of the hook.
+            hook_file = os.path.join(record.args[1], record.args[0])
+        elif message.startswith(('Processing pre-safe import module hook', 'Processing pre-find module path hook')):
+            hook_file = record.args[1]
+        elif message.startswith('Including run-time hook'):
+            hook_file = record.args[0]
+        else:
+            return
+        hook_file = os.path.abspath(hook_file)
+        if hook_file.startswith(_HOOKS_DIR + os.sep):
+            self.hooks.add(os.path.relpath(hook_file, _PACKAGE_DIR).replace(os.sep, '/'))
+
+
+class _Recorder:
+    def __init__(self, filename):
+        self.filename = filename
+        self.tests = {}
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        if 'pyi_builder' not in getattr(item, 'fixturenames', ()):
+            yield
+            return
+        handler = _HookLogHandler()
+        logger = logging.getLogger('PyInstaller')
+        logger.addHandler(handler)
+        try:
+            yield
+        finally:
+            logger.removeHandler(handler)
+        # The builds of a test in both modes share their Analysis, so that only the first one loads the hooks.
+        key = node_id_without_mode(item)
+        entry = self.tests.setdefault(key, {'source': _source_hash(item.function), 'hooks': set()})
+        entry['hooks'] |= handler.hooks
+
+    def pytest_sessionfinish(self, session):
+        hooks_map = _load(self.filename)
+        if hooks_map is None or {key: hooks_map.get(key) for key in _environment()} != _environment():
+            hooks_map = {**_environment(), 'tests': {}}
+        hooks_map['hook_files'] = _hook_files()
+        for key, entry in self.tests.items():
+            hooks_map['tests'][key] = {'source': entry['source'], 'hooks': sorted(entry['hooks'])}
+        with open(self.filename, 'w', encoding='utf-8') as f:
+            json.dump(hooks_map, f, indent=1, sort_keys=True)
+
+
+def _load(filename):
+    try:
+        with open(filename, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _git_lines(*args):
+    process = subprocess.run(['git', *args], cwd=_PACKAGE_DIR, check=True, capture_output=True, text=True)
+    return process.stdout.splitlines()
+
+
+def changed_files(base):
+    """
+    Return the paths, relative to this package, of its files which were modified since the git revision *base*,
+    including untracked files.
+    """
+    changed = _git_lines('diff', '--name-only', '--relative', base, '--', '.')
+    changed += _git_lines('ls-files', '--others', '--exclude-standard', '--', '.')
+    return sorted(set(changed))
+
+
+def changed_hooks(hooks_map, changed):
+    """
+    Return the hooks among the *changed* files, or None if the map is stale, i.e. if any of them is not a hook known to
+    the map (other than the tests themselves).
+    """
+    if {key: hooks_map.get(key) for key in _environment()} != _environment():
+        return None
+    hook_files = set(hooks_map.get('hook_files', ()))
+    hooks = set()
+    for path in changed:
+        if path in hook_files:
+            hooks.add(path)
+        elif not (path.startswith('tests/test_') and path.endswith('.py')):
+            return None
+    return hooks
+
+
+def select_items(hooks_map, hooks, items):
+    """
+    Split *items* into those to run and those to deselect, given the *hooks* which were modified.
+    """
+    selected, deselected = [], []
+    for item in items:
+        entry = None
+        if 'pyi_builder' in getattr(item, 'fixturenames', ()):
+            entry = hooks_map['tests'].get(node_id_without_mode(item))
+        if entry is None or entry['source'] != _source_hash(item.function) or hooks.intersection(entry['hooks']):
+            selected.append(item)
+        else:
+            deselected.append(item)
+    return selected, deselected
+
+
+def add_options(parser):
+    parser.addoption(
+        '--record-hooks',
+        metavar='MAP',
+        help='Record the hooks used by each test into the JSON file MAP.',
+    )
+    parser.addoption(
+        '--select-by-hooks',
+        metavar='MAP',
+        help='Only run the tests which use the hooks modified since --hooks-base, according to the JSON file MAP.',
+    )
+    parser.addoption(
+        '--hooks-base',
+        default='HEAD',
+        help='The git revision to find the modified hooks since (default: %(default)s).',
+    )
+
+
+def start_recording(config):
+    filename = config.getoption('record_hooks')
+    if filename:
+        config.pluginmanager.register(_Recorder(os.path.abspath(filename)), 'hook_recorder')
+
+
+def deselect_unaffected(config, items):
+    filename = config.getoption('select_by_hooks')
+    if not filename:
+        return
+    reporter = config.pluginmanager.get_plugin('terminalreporter')
+    hooks_map = _load(filename)
+    hooks = None
+    if hooks_map is not None:
+        try:
+            hooks = changed_hooks(hooks_map, changed_files(config.getoption('hooks_base')))
+        except (OSError, subprocess.CalledProcessError) as e:
+            reporter.write_line(f'Could not find the modified files with git: {e}')
+    if hooks is None:
+        reporter.write_line(f'The hooks map {filename} is missing or stale: running all tests.')
+        return
+    selected, deselected = select_items(hooks_map, hooks, items)
+    reporter.write_line(
+        f'Modified hooks: {", ".join(sorted(hooks)) or "none"}; '
+        f'deselecting {len(deselected)} tests which do not use them.'
+    )
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
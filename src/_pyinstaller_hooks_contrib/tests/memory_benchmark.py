@@ -0,0 +1,268 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+"""
+Memory footprint benchmarks of the frozen tests.
+
+Hooks affect the memory used by frozen applications, e.g. through hidden imports which a package imports eagerly, or
+through run-time hooks which preload data. With ``pytest --memory-benchmark=memory.json``, each test of a
+``pyi_builder.test_source()`` snippet runs its snippet both frozen and unfrozen (with the Python interpreter of the
+build environment), and measures the memory used by the process (and its children), as follows:
+
+* ``peak_rss``: the peak resident set size recorded by the OS (on Linux and Windows; sampled elsewhere);
+* ``peak_uss``: the largest unique set size sampled while the snippet runs;
+* ``rss`` and ``uss``: the resident and unique set sizes once the snippet completed and the process settled.
+
+The results of each test, in bytes, are stored in the JSON file. With ``--memory-baseline=baseline.json``, the results
+of an earlier run, the frozen measurements which grew by more than ``--memory-tolerance`` (10% by default) are reported
+at the end of the session.
+
+The snippets are not batched while benchmarking, as the run-time hooks of the other snippets of a batch would skew the
+measurements.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+import psutil
+import pytest
+from PyInstaller import __version__ as pyinstaller_version
+from PyInstaller.utils.conftest import _EXE_TIMEOUT
+
+from _pyinstaller_hooks_contrib.tests.shared_analysis import SharedAnalysisAppBuilder
+
+BENCHMARK_KEY = pytest.StashKey()
+
+_MARKER = '--- pyi-memory-benchmark: snippet completed ---'
+# Appended to the snippets: signal their completion, then wait for the measurements to be taken.
+_FOOTER = f"""
+
+import sys as _pyi_sys
+print({_MARKER!r}, flush=True)
+_pyi_sys.stdin.read()
+"""
+
+_SAMPLE_INTERVAL = 0.05
+_SETTLE_TIME = 0.5
+_MEASUREMENTS = ('peak_rss', 'peak_uss', 'rss', 'uss')
+
+
+def _peak_rss(proc, info):
+    """
+    Return the peak RSS of *proc* recorded by the OS, if available, or its current RSS.
+    """
+    if hasattr(info, 'peak_wset'):
+        return info.peak_wset
+    try:
+        with open(f'/proc/{proc.pid}/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return info.rss
+
+
+def _memory(process):
+    """
+    Return the total RSS, USS and peak RSS of *process* and of its children.
+    """
+    rss = uss = peak_rss = 0
+    for proc in [process] + process.children(recursive=True):
+        try:
+            info = proc.memory_full_info()
+            peak_rss += _peak_rss(proc, info)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+        rss += info.rss
+        uss += info.uss
+    return rss, uss, peak_rss
+
+
+def measure(args, executable=None, env=None, cwd=None, timeout=_EXE_TIMEOUT):
+    """
+    Run a program which prints _MARKER once its work is done, and then waits for its standard input to close.
+
+    Return its exit code, its standard output and error, and the measurements of its memory (None for ``rss`` and
+    ``uss`` if it exited without printing the marker).
+    """
+    process = psutil.Popen(
+        args, executable=executable, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env,
+        cwd=cwd
+    )
+    stdout, stderr = [], []
+    completed = threading.Event()
+
+    def read_stdout():
+        for line in process.stdout:
+            if line.rstrip(b'\r\n') == _MARKER.encode():
+                completed.set()
+            else:
+                stdout.append(line)
+
+    def read_stderr():
+        stderr.append(process.stderr.read())
+
+    readers = [threading.Thread(target=read_stdout), threading.Thread(target=read_stderr)]
+    for reader in readers:
+        reader.start()
+
+    result = dict.fromkeys(_MEASUREMENTS)
+    peak_rss = peak_uss = 0
+    deadline = time.monotonic() + timeout
+    try:
+        while not completed.is_set() and process.poll() is None and time.monotonic() < deadline:
+            _, uss, rss = _memory(process)
+            peak_rss, peak_uss = max(peak_rss, rss), max(peak_uss, uss)
+            completed.wait(_SAMPLE_INTERVAL)
+        if completed.is_set():
+            time.sleep(_SETTLE_TIME)
+            result['rss'], result['uss'], rss = _memory(process)
+            peak_rss, peak_uss = max(peak_rss, rss), max(peak_uss, result['uss'])
+        result['peak_rss'], result['peak_uss'] = peak_rss, peak_uss
+    except psutil.NoSuchProcess:
+        pass
+    finally:
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            retcode = process.wait(max(deadline - time.monotonic(), 1))
+        except psutil.TimeoutExpired:
+            for proc in process.children(recursive=True) + [process]:
+                try:
+                    proc.kill()
+                except psutil.NoSuchProcess:
+                    pass
+            retcode = 1
+        for reader in readers:
+            reader.join()
+    return retcode, b''.join(stdout), b''.join(stderr), result
+
+
+class MemoryBenchmark:
+    """
+    Collects the measurements of the tests, and compares them with the baseline at the end of the session.
+    """
+    def __init__(self, filename, baseline, tolerance):
+        self.filename = filename
+        self.baseline = baseline
+        self.tolerance = tolerance
+        self.results = {}
+
+    def add(self, nodeid, kind, measurements):
+        self.results.setdefault(nodeid, {})[kind] = measurements
+
+    def regressions(self):
+        """
+        Return (nodeid, measurement, baseline value, new value) for the frozen measurements beyond the tolerance.
+        """
+        regressions = []
+        for nodeid, result in sorted(self.results.items()):
+            old = self.baseline.get('tests', {}).get(nodeid, {}).get('frozen')
+            new = result.get('frozen')
+            if not old or not new:
+                continue
+            for name in _MEASUREMENTS:
+                if old.get(name) and new.get(name) and new[name] > old[name] * (1 + self.tolerance):
+                    regressions.append((nodeid, name, old[name], new[name]))
+        return regressions
+
+    def pytest_sessionfinish(self, session):
+        if not self.results:
+            return
+        results = {
+            'pyinstaller': pyinstaller_version,
+            'python': '%d.%d' % sys.version_info[:2],
+            'platform': sys.platform,
+            'tests': self.results,
+        }
+        with open(self.filename, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.results:
+            return
+        terminalreporter.section('frozen memory footprint')
+        terminalreporter.write_line(f'The measurements of {len(self.results)} tests are in {self.filename}.')
+        for nodeid, name, old, new in self.regressions():
+            terminalreporter.write_line(
+                f'{nodeid}: {name} grew from {old / 2**20:.1f} MiB to {new / 2**20:.1f} MiB '
+                f'({(new / old - 1) * 100:+.0f}%).'
+            )
+
+
+class MemoryBenchmarkAppBuilder(SharedAnalysisAppBuilder):
+    """
+    Measures the memory used by the snippets of the tests, frozen and unfrozen.
+    """
+    def __init__(self, tmpdir, request, bundle_mode, shared, benchmark):
+        super().__init__(tmpdir, request, bundle_mode, shared)
+        self._benchmark = benchmark
+        self._measured = False
+
+    def test_source(self, source, *args, **kwargs):
+        __tracebackhide__ = True
+        source = textwrap.dedent(source) + _FOOTER
+        if not self._measured:
+            scriptfile = self._tmpdir / 'unfrozen.py'
+            scriptfile.write_text(source, encoding='utf-8')
+            _, _, _, result = measure([sys.executable, str(scriptfile)], cwd=str(self._tmpdir))
+            self._benchmark.add(self._request.node.nodeid, 'unfrozen', result)
+        return super().test_source(source, *args, **kwargs)
+
+    def _run_executable_(self, args, exe_path, prog_env, prog_cwd, runtime):
+        if runtime or self._measured:
+            return super()._run_executable_(args, exe_path, prog_env, prog_cwd, runtime)
+        retcode, stdout, stderr, result = measure(args, exe_path, prog_env, prog_cwd)
+        self._measured = True
+        self._benchmark.add(self._request.node.nodeid, 'frozen', result)
+        sys.stdout.buffer.write(stdout)
+        sys.stderr.buffer.write(stderr)
+        return retcode
+
+
+def add_options(parser):
+    parser.addoption(
+        '--memory-benchmark',
+        metavar='FILE',
+        help='Measure the memory used by the snippets of the tests, frozen and unfrozen, into the JSON file FILE.',
+    )
+    parser.addoption(
+        '--memory-baseline',
+        metavar='FILE',
+        help='Report the measurements which grew since those of the JSON file FILE.',
+    )
+    parser.addoption(
+        '--memory-tolerance',
+        type=float,
+        default=0.1,
+        help='The relative growth of the memory measurements reported (default: %(default)s).',
+    )
+
+
+def start_benchmark(config):
+    filename = config.getoption('memory_benchmark')
+    if not filename:
+        return
+    baseline = {}
+    if config.getoption('memory_baseline'):
+        with open(config.getoption('memory_baseline'), encoding='utf-8') as f:
+            baseline = json.load(f)
+    benchmark = MemoryBenchmark(os.path.abspath(filename), baseline, config.getoption('memory_tolerance'))
+    config.stash[BENCHMARK_KEY] = benchmark
+    config.pluginmanager.register(benchmark, 'memory_benchmark')
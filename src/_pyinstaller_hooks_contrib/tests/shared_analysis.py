@@ -0,0 +1,162 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+"""
+Sharing of the Analysis between the onedir and onefile builds of a test.
+
+``pyi_builder`` runs each test once per bundle mode, although the Analysis (the hooks, the module graph and the binary
+dependencies) does not depend on the mode: only the packaging does. The builds of both modes of a test therefore share
+their script, spec and work directories, so that PyInstaller finds the Analysis of the first build up to date, and
+reuses it for the second one. Only their dist directories differ.
+
+As the Analysis of the second build is not run again, an Analysis which would differ between the modes goes unnoticed.
+With ``pytest --check-shared-analysis``, the builds of each mode run their Analysis in a work directory of their own,
+and the TOCs of their Analysis are compared, so that the tests whose Analysis differs between the modes fail.
+"""
+
+import glob
+import os
+import textwrap
+
+import pytest
+from PyInstaller.building.build_main import Analysis
+from PyInstaller.building.datastruct import Target
+from PyInstaller.utils.conftest import AppBuilder
+from PyInstaller.utils.misc import load_py_data_struct
+
+_SHARED_BUILDS_KEY = pytest.StashKey()
+
+# The TOCs of the Analysis compared between the modes.
+_COMPARED_TOCS = ('scripts', 'pure', 'binaries', 'datas', 'zipfiles')
+_MODES = ('onedir', 'onefile')
+
+
+def _reset_target_numbers(cls=Target):
+    """
+    Number the targets of the next build from 0, as in a new process, so that they find the TOCs of the previous build.
+    """
+    for subclass in cls.__subclasses__():
+        subclass.invcnum = 0
+        _reset_target_numbers(subclass)
+
+
+def _analysis_tocs(workpath):
+    """
+    Return the TOCs of the most recent Analysis in the work directories under *workpath*.
+    """
+    tocfiles = glob.glob(os.path.join(workpath, '*', 'Analysis-00.toc'))
+    if not tocfiles:
+        return None
+    data = dict(zip((name for name, _ in Analysis._GUTS), load_py_data_struct(max(tocfiles, key=os.path.getmtime))))
+
+    # The files generated into the work directory (e.g., base_library.zip) are compared by their relative paths.
+    def relative(item):
+        if isinstance(item, str) and item.startswith(workpath + os.sep):
+            return os.path.join('<workpath>', os.path.relpath(item, workpath))
+        return item
+
+    return {name: sorted(tuple(map(relative, entry)) for entry in data[name]) for name in _COMPARED_TOCS}
+
+
+class SharedBuild:
+    """
+    The directories, and the Analysis TOCs per mode, shared by the builds of a test in both modes.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.tocs = {}
+        self.passed = set()
+
+    def check(self, mode, tocs):
+        self.tocs[mode] = tocs
+        for other_mode, other_tocs in self.tocs.items():
+            if other_mode == mode:
+                continue
+            differences = []
+            for name in _COMPARED_TOCS:
+                only_this = sorted(set(tocs[name]) - set(other_tocs[name]))
+                only_other = sorted(set(other_tocs[name]) - set(tocs[name]))
+                if only_this or only_other:
+                    differences.append(f'{name}: only in {mode}: {only_this}; only in {other_mode}: {only_other}')
+            if differences:
+                pytest.fail(
+                    'The Analysis differs between the modes %s and %s.\n%s' % (mode, other_mode, '\n'.join(differences))
+                )
+
+    def finish(self, mode):
+        """
+        Record that the test passed in *mode*. Return True if it passed in all modes.
+        """
+        self.passed.add(mode)
+        return self.passed.issuperset(_MODES)
+
+
+def node_id_without_mode(item):
+    """
+    Return the node ID of test *item* without its bundle mode, which is common to its items in both modes.
+    """
+    callspec = getattr(item, 'callspec', None)
+    params = sorted(callspec.params.items()) if callspec else []
+    params = ','.join(f'{name}={value!r}' for name, value in params if name != 'pyi_builder')
+    return item.nodeid.split('[')[0] + (f'[{params}]' if params else '')
+
+
+def shared_build(request, tmpdir_factory):
+    """
+    Return the SharedBuild of the test of *request*, common to its items in both modes.
+    """
+    shared_builds = request.config.stash.setdefault(_SHARED_BUILDS_KEY, {})
+    key = node_id_without_mode(request.node)
+    if key not in shared_builds:
+        shared_builds[key] = SharedBuild(tmpdir_factory.mktemp(request.node.originalname))
+    return shared_builds[key]
+
+
+class SharedAnalysisAppBuilder(AppBuilder):
+    """
+    Builds in the script, spec and work directories of a SharedBuild, or with --check-shared-analysis, in a work
+    directory per mode, and checks the TOCs of the Analysis.
+    """
+    def __init__(self, tmpdir, request, bundle_mode, shared):
+        super().__init__(tmpdir, request, bundle_mode)
+        self._shared = shared
+        self._check = request.config.getoption('check_shared_analysis')
+        self._specdir = str(shared.directory)
+        self._builddir = str(shared.directory / ('build-' + bundle_mode if self._check else 'build'))
+        self._distdir = str(shared.directory / ('dist-' + bundle_mode))
+
+    def test_source(self, source, *args, **kwargs):
+        __tracebackhide__ = True
+        test_id = kwargs.pop('test_id', None)
+        scriptfile = self._shared.directory / ('test_source' + ('__' + test_id if test_id else '') + '.py')
+        # Only (re)write the script if it changed, as PyInstaller rebuilds the Analysis of a modified script.
+        content = '# -*- coding: utf-8 -*-\n' + textwrap.dedent(source) + '\n'
+        if not scriptfile.exists() or scriptfile.read_text(encoding='utf-8') != content:
+            scriptfile.write_text(content, encoding='utf-8')
+        return self.test_script(str(scriptfile), *args, **kwargs)
+
+    def _test_building(self, args):
+        _reset_target_numbers()
+        if not super()._test_building(args):
+            return False
+        if self._check:
+            tocs = _analysis_tocs(self._builddir)
+            if tocs is not None:
+                self._shared.check(self._mode, tocs)
+        return True
+
+
+def add_options(parser):
+    parser.addoption(
+        '--check-shared-analysis',
+        action='store_true',
+        help='Run the Analysis of each bundle mode of a test on its own, and fail the test if they differ.',
+    )
@@ -0,0 +1,39 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+from _pyinstaller_hooks_contrib.tests.batched_builder import Snippet, batch_snippets
+
+
+def _modules(batches):
+    return [[snippet.source.strip() for snippet in batch.snippets] for batch in batches]
+
+
+def test_batch_snippets():
+    snippets = [
+        # hook-numba.py excludes IPython and scipy.
+        ('onedir', Snippet("import numba")),
+        ('onedir', Snippet("from scipy import linalg")),
+        ('onedir', Snippet("import trimesh")),
+        ('onefile', Snippet("import trimesh")),
+        ('onedir', Snippet("import fiona", pyi_args=['--exclude-module', 'tkinter'])),
+        ('onedir', Snippet("import phonenumbers")),
+    ]
+    batches = batch_snippets(snippets, max_size=2)
+    assert [(batch.mode, batch.pyi_args) for batch in batches] == [
+        ('onedir', ()), ('onedir', ()), ('onefile', ()), ('onedir', ('--exclude-module', 'tkinter'))
+    ]
+    assert _modules(batches) == [
+        ["import numba", "import trimesh"],
+        ["from scipy import linalg", "import phonenumbers"],
+        ["import trimesh"],
+        ["import fiona"],
+    ]
+    assert len({snippet.module for batch in batches for snippet in batch.snippets}) == len(snippets)
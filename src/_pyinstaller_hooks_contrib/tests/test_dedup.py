@@ -0,0 +1,54 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+import os
+
+import pytest
+from PyInstaller.compat import is_win
+
+from _pyinstaller_hooks_contrib.utils.dedup import find_duplicates, link_duplicates
+
+
+def _make_tree(root):
+    files = {
+        "libfoo.so.1": b"foo" * 100,
+        os.path.join("foo.libs", "libfoo-abc123.so.1"): b"foo" * 100,
+        "libbar.so": b"bar" * 100,
+        # Same size as libbar.so, different content.
+        "libbaz.so": b"baz" * 100,
+    }
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+    return files
+
+
+def test_find_duplicates(tmp_path):
+    files = _make_tree(tmp_path)
+    toc = [(name, str(tmp_path / name), 'BINARY') for name in files]
+    assert find_duplicates(toc) == [[
+        (os.path.join("foo.libs", "libfoo-abc123.so.1"), str(tmp_path / "foo.libs" / "libfoo-abc123.so.1")),
+        ("libfoo.so.1", str(tmp_path / "libfoo.so.1")),
+    ]]
+
+
+@pytest.mark.skipif(is_win, reason="Duplicates are found but not replaced by symbolic links on Windows.")
+def test_link_duplicates(tmp_path):
+    _make_tree(tmp_path)
+    assert link_duplicates(str(tmp_path)) == 300
+
+    link = tmp_path / "libfoo.so.1"
+    assert link.is_symlink()
+    assert os.readlink(link) == os.path.join("foo.libs", "libfoo-abc123.so.1")
+    assert link.read_bytes() == b"foo" * 100
+    assert not (tmp_path / "libbar.so").is_symlink()
+    assert not (tmp_path / "libbaz.so").is_symlink()
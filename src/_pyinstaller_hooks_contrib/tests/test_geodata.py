@@ -0,0 +1,82 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+import logging
+import os
+import sqlite3
+
+import pytest
+
+from _pyinstaller_hooks_contrib.utils.geodata import select_gdal_data, select_proj_grids
+
+
+def _collected(datas):
+    return sorted(os.path.basename(src) for src, _ in datas)
+
+
+@pytest.fixture
+def proj_dir(tmp_path):
+    # A minimal PROJ database: EPSG:2056 is projected from EPSG:4150, which is transformed with grid CHENyx06a.
+    proj_dir = tmp_path / "share" / "proj"
+    proj_dir.mkdir(parents=True)
+    db = sqlite3.connect(proj_dir / "proj.db")
+    db.executescript(
+        """
+        CREATE TABLE crs_view(auth_name TEXT, code INTEGER_OR_TEXT);
+        CREATE TABLE projected_crs(auth_name TEXT, code INTEGER_OR_TEXT, geodetic_crs_auth_name TEXT,
+                                   geodetic_crs_code INTEGER_OR_TEXT);
+        CREATE TABLE compound_crs(auth_name TEXT, code INTEGER_OR_TEXT, horiz_crs_auth_name TEXT,
+                                  horiz_crs_code INTEGER_OR_TEXT, vertical_crs_auth_name TEXT,
+                                  vertical_crs_code INTEGER_OR_TEXT);
+        CREATE TABLE grid_alternatives(original_grid_name TEXT, proj_grid_name TEXT, old_proj_grid_name TEXT);
+        CREATE TABLE grid_transformation(source_crs_auth_name TEXT, source_crs_code INTEGER_OR_TEXT,
+                                         target_crs_auth_name TEXT, target_crs_code INTEGER_OR_TEXT, grid_name TEXT,
+                                         grid2_name TEXT, deprecated BOOLEAN);
+        INSERT INTO crs_view VALUES ('EPSG', 2056), ('EPSG', 4150), ('EPSG', 4149), ('EPSG', 4267), ('EPSG', 4269);
+        INSERT INTO projected_crs VALUES ('EPSG', 2056, 'EPSG', 4150);
+        INSERT INTO grid_alternatives VALUES ('CHENyx06a.gsb', 'ch_swisstopo_CHENyx06a.tif', 'CHENyx06a.gsb'),
+                                             ('CHENyx06_ETRS.gsb', 'ch_swisstopo_CHENyx06_ETRS.tif', NULL),
+                                             ('conus', 'us_noaa_conus.tif', 'conus');
+        INSERT INTO grid_transformation VALUES ('EPSG', 4149, 'EPSG', 4150, 'CHENyx06a.gsb', NULL, 0),
+                                               ('EPSG', 4150, 'EPSG', 4258, 'CHENyx06_ETRS.gsb', NULL, 0),
+                                               ('EPSG', 4267, 'EPSG', 4269, 'conus', NULL, 0);
+        """
+    )
+    db.commit()
+    db.close()
+    for name in ("proj.ini", "ch_swisstopo_CHENyx06a.tif", "us_noaa_conus.tif", "custom_grid.gsb"):
+        (proj_dir / name).write_bytes(b"x" * 10)
+    return proj_dir
+
+
+def test_select_proj_grids(proj_dir, fake_hook_api, caplog):
+    hook_api = fake_hook_api({"pyproj": {"grids": ["custom_*"], "grids_for_crs": ["EPSG:2056"]}})
+    with caplog.at_level(logging.WARNING):
+        datas = select_proj_grids(hook_api, "pyproj", [(str(proj_dir), os.path.join("share", "proj"))])
+    assert _collected(datas) == ["ch_swisstopo_CHENyx06a.tif", "custom_grid.gsb", "proj.db", "proj.ini"]
+    assert {dest for _, dest in datas} == {os.path.join("share", "proj")}
+    # The grid used to transform to ETRS89 is not in the data directory.
+    assert "ch_swisstopo_CHENyx06_ETRS.tif" in caplog.text
+
+
+def test_select_proj_grids_default(proj_dir, fake_hook_api):
+    datas = [(str(proj_dir), os.path.join("share", "proj"))]
+    assert select_proj_grids(fake_hook_api({}), "pyproj", datas) == datas
+
+
+def test_select_gdal_data(tmp_path, fake_hook_api):
+    datas = []
+    for name in ("s57objectclasses.csv", "s57attributes.csv", "header.dxf", "nitf_spec.xml"):
+        (tmp_path / name).write_bytes(b"x" * 10)
+        datas.append((str(tmp_path / name), os.path.join("share", "gdal")))
+    hook_api = fake_hook_api({"osgeo": {"gdal_data": ["s57*.csv"]}})
+    assert _collected(select_gdal_data(hook_api, "osgeo", datas)) == ["s57attributes.csv", "s57objectclasses.csv"]
+    assert select_gdal_data(fake_hook_api({}), "osgeo", datas) == datas
@@ -0,0 +1,101 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+import importlib.util
+import logging
+import py_compile
+
+import pytest
+
+from _pyinstaller_hooks_contrib.utils import hook_cache
+from _pyinstaller_hooks_contrib.utils.hook_cache import cached_hook_result
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setitem(hook_cache.CONF, 'cachedir', str(tmp_path))
+    monkeypatch.delenv('PYINSTALLER_HOOKS_CACHE', raising=False)
+    return tmp_path
+
+
+@pytest.fixture
+def hook_api(fake_hook_api):
+    def make_hook_api(**options):
+        return fake_hook_api({'hooks_cache': options})
+
+    return make_hook_api
+
+
+class _Hook:
+    """
+    A hook whose result depends on the declared input CACHE_TEST_VAR, and on the undeclared attribute *datas*.
+    """
+    def __init__(self, tmp_path):
+        self.calls = 0
+        self.datas = [(str(tmp_path / 'data.txt'), 'pkg')]
+
+    def compute(self):
+        self.calls += 1
+        return {'hiddenimports': ['pkg.sub'], 'datas': list(self.datas)}
+
+    def run(self, hook_api):
+        return cached_hook_result(hook_api, 'pkg', self.compute, environment=['CACHE_TEST_VAR'])
+
+
+def test_cache_reuse(cache_dir, hook_api, monkeypatch):
+    hook = _Hook(cache_dir)
+    assert hook.run(hook_api()) == hook.compute()
+    hook.calls = 0
+
+    # The cache is disabled by default.
+    hook.run(hook_api())
+    assert hook.calls == 1
+
+    first = hook.run(hook_api(enabled=True))
+    assert hook.run(hook_api(enabled=True)) == first
+    assert hook.calls == 2
+    assert first['datas'] == hook.datas
+
+    # Changing a declared input invalidates the cached result.
+    monkeypatch.setenv('CACHE_TEST_VAR', '1')
+    hook.run(hook_api(enabled=True))
+    assert hook.calls == 3
+    assert len(list((cache_dir / 'hooks-contrib').iterdir())) == 1
+
+
+def test_cache_verify(cache_dir, hook_api, monkeypatch, caplog):
+    hook = _Hook(cache_dir)
+    hook.run(hook_api(enabled=True))
+
+    hook.datas.append((str(cache_dir / 'other.txt'), 'pkg'))
+    monkeypatch.setenv('PYINSTALLER_HOOKS_CACHE', 'verify')
+    with caplog.at_level(logging.WARNING):
+        result = hook.run(hook_api())
+    assert hook.calls == 2
+    assert result['datas'] == hook.datas
+    assert 'undeclared inputs' in caplog.text
+    assert 'other.txt' in caplog.text
+
+
+def test_directory_input_ignores_bytecode(tmp_path):
+    package = tmp_path / 'pkg'
+    package.mkdir()
+    source = package / '__init__.py'
+    source.write_text('VALUE = 1\n')
+    before = hook_cache._directory_input(str(package))
+
+    # Importing the package writes its bytecode.
+    py_compile.compile(str(source), cfile=importlib.util.cache_from_source(str(source)))
+    (package / 'legacy.pyc').write_bytes(b'')
+    assert hook_cache._directory_input(str(package)) == before
+
+    (package / 'module.py').write_text('')
+    assert hook_cache._directory_input(str(package)) != before
@@ -0,0 +1,34 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+import sys
+
+from PyInstaller import __version__ as pyinstaller_version
+
+from _pyinstaller_hooks_contrib.tests.hook_selection import changed_hooks
+
+
+def test_changed_hooks():
+    hooks_map = {
+        'pyinstaller': pyinstaller_version,
+        'python': '%d.%d' % sys.version_info[:2],
+        'hook_files': ['hooks/stdhooks/hook-pydantic.py', 'hooks/rthooks/pyi_rth_pyproj.py'],
+        'tests': {},
+    }
+    changed = ['hooks/stdhooks/hook-pydantic.py', 'tests/test_libraries.py']
+    assert changed_hooks(hooks_map, changed) == {'hooks/stdhooks/hook-pydantic.py'}
+    assert changed_hooks(hooks_map, []) == set()
+
+    # New hooks, and other modified files, make the map stale.
+    assert changed_hooks(hooks_map, ['hooks/stdhooks/hook-foo.py']) is None
+    assert changed_hooks(hooks_map, ['hooks/rthooks.dat']) is None
+    assert changed_hooks(hooks_map, ['utils/geodata.py']) is None
+    assert changed_hooks({**hooks_map, 'pyinstaller': '4.0'}, []) is None
@@ -541,6 +541,10 @@ def test_torchvision_nms(pyi_builder):
 def test_googleapiclient(pyi_builder):
     pyi_builder.test_source("""
         from googleapiclient.discovery import build
+
+        # Uses the discovery document collected from googleapiclient/discovery_cache/documents.
+        service = build('drive', 'v3', developerKey='key', static_discovery=True)
+        assert hasattr(service, 'files')
         """)
 
 
@@ -1083,6 +1087,11 @@ def test_orjson(pyi_builder):
 def test_altair(pyi_builder):
     pyi_builder.test_source("""
         import altair
+
+        # Validation requires the collected schema of the active Vega-Lite version.
+        data = altair.Data(values=[{"a": 1, "b": 2}])
+        spec = altair.Chart(data).mark_point().encode(x="a:Q", y="b:Q").to_dict(validate=True)
+        assert spec["mark"]["type"] == "point"
         """)
 
 
@@ -1171,3 +1180,95 @@ def test_yt_dlp(pyi_builder):
     pyi_builder.test_source("""
         import yt_dlp
     """)
+
+
+@importorskip('imageio_ffmpeg')
+def test_imageio_ffmpeg(pyi_builder):
+    pyi_builder.test_source("""
+        import imageio_ffmpeg
+        print(imageio_ffmpeg.get_ffmpeg_version())
+    """)
+
+
+@importorskip('numba')
+def test_numba_cache(pyi_builder):
+    pyi_builder.test_source("""
+        import numba
+
+        @numba.njit(cache=True)
+        def add_one(x):
+            return x + 1
+
+        assert add_one(1) == 2
+    """)
+
+
+@importorskip('pysnmp')
+def test_pysnmp(pyi_builder):
+    pyi_builder.test_source("""
+        from pysnmp.smi import builder, view
+
+        mib_builder = builder.MibBuilder()
+        mib_builder.loadModules('SNMPv2-MIB')
+        mib_view = view.MibViewController(mib_builder)
+        oid, label, suffix = mib_view.getNodeName(('sysDescr',), 'SNMPv2-MIB')
+        assert tuple(oid) == (1, 3, 6, 1, 2, 1, 1, 1)
+    """)
+
+
+@importorskip('jedi')
+def test_jedi(pyi_builder):
+    pyi_builder.test_source("""
+        import jedi
+
+        # Completing a standard library module uses the collected typeshed stubs and parso grammars.
+        completions = jedi.Script("import os\\nos.path.jo").complete()
+        assert [completion.name for completion in completions] == ['join']
+    """)
+
+
+@importorskip('jedi')
+@pytest.mark.parametrize('typeshed_archive', [False, True], ids=['files', 'archive'])
+def test_jedi_stdlib_stubs_only(pyi_builder, pyi_hooksconfig, typeshed_archive):
+    pyi_hooksconfig({"jedi": {"typeshed_archive": typeshed_archive, "typeshed_third_party": []}})
+    pyi_builder.test_source("""
+        import jedi
+
+        # jedi lists the directories of the third-party stubs, which are collected empty.
+        completions = jedi.Script("import os\\nos.path.jo").complete()
+        assert [completion.name for completion in completions] == ['join']
+    """)
+
+
+@importorskip('pyarrow')
+def test_pyarrow_slim(pyi_builder, pyi_hooksconfig):
+    pyi_hooksconfig({"pyarrow": {"slim": True, "exclude_components": ["flight", "gandiva", "substrait"]}})
+    pyi_builder.test_source("""
+        import io
+        import os
+        import sys
+
+        import pyarrow as pa
+        import pyarrow.ipc
+        import pyarrow.parquet as pq
+
+        table = pa.table({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+
+        # Writing and reading Parquet and IPC data loads the libraries collected under their SONAMEs. The Parquet file
+        # is read without the thread pools of pyarrow, which intermittently abort the process on exit after reading one
+        # (with pyarrow 26, frozen or not).
+        buffer = io.BytesIO()
+        pq.write_table(table, buffer)
+        buffer.seek(0)
+        assert pq.ParquetFile(buffer, pre_buffer=False).read(use_threads=False).equals(table)
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        assert pa.ipc.open_file(sink.getvalue()).read_all().equals(table)
+
+        # Each library is collected once, and the excluded components are not collected.
+        names = os.listdir(os.path.join(sys._MEIPASS, "pyarrow"))
+        assert not [name for name in names if name.startswith(("libarrow_flight", "libarrow_python_flight"))], names
+        assert len([name for name in names if name.startswith("libarrow_python.so")]) == 1, names
+    """)
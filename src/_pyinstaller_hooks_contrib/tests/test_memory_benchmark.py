@@ -0,0 +1,38 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+import sys
+
+from _pyinstaller_hooks_contrib.tests.memory_benchmark import _FOOTER, MemoryBenchmark, measure
+
+
+def test_measure(tmp_path):
+    script = tmp_path / 'snippet.py'
+    script.write_text("data = bytearray(64 * 2**20)\nprint('done')\ndel data\n" + _FOOTER, encoding='utf-8')
+    retcode, stdout, _, result = measure([sys.executable, str(script)])
+    assert retcode == 0
+    assert stdout.strip() == b'done'
+    assert result['peak_rss'] > 64 * 2**20
+    assert result['uss'] < result['peak_rss'] - 32 * 2**20
+
+    # Without the footer, only the peak sizes are measured.
+    script.write_text("raise SystemExit(3)\n", encoding='utf-8')
+    retcode, _, _, result = measure([sys.executable, str(script)])
+    assert retcode == 3
+    assert result['rss'] is None and result['peak_rss']
+
+
+def test_regressions(tmp_path):
+    old = {'peak_rss': 100, 'peak_uss': 80, 'rss': 50, 'uss': 40}
+    benchmark = MemoryBenchmark(str(tmp_path / 'memory.json'), {'tests': {'test_foo': {'frozen': old}}}, 0.1)
+    benchmark.add('test_foo', 'frozen', {**old, 'uss': 45, 'rss': 54})
+    benchmark.add('test_bar', 'frozen', old)
+    assert benchmark.regressions() == [('test_foo', 'uss', 40, 45)]
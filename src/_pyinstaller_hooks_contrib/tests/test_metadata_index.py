@@ -0,0 +1,95 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from PyInstaller.compat import is_py38
+
+from _pyinstaller_hooks_contrib.utils.metadata_index import INDEX_NAME, RUNTIME_HOOK, build_index
+
+pytestmark = pytest.mark.skipif(not is_py38, reason="Requires importlib.metadata.")
+
+
+def _make_distributions(root):
+    files = {
+        os.path.join("Foo_Bar-1.2.dist-info", "METADATA"):
+            "Metadata-Version: 2.1\nName: Foo.Bar\nVersion: 1.2\nRequires-Dist: baz (>=1)\n",
+        os.path.join("Foo_Bar-1.2.dist-info", "entry_points.txt"): "[foo.plugins]\nqux = foo.qux:Plugin\n",
+        os.path.join("Foo_Bar-1.2.dist-info", "INSTALLER"): "pip\n",
+        os.path.join("baz-3.0.egg-info", "PKG-INFO"): "Metadata-Version: 1.1\nName: baz\nVersion: 3.0\n",
+        # Not a top-level metadata directory.
+        os.path.join("foo", "vendored-0.1.dist-info", "METADATA"): "Name: vendored\nVersion: 0.1\n",
+    }
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+    return [(name, str(root / name), "DATA") for name in files]
+
+
+def test_build_index(tmp_path):
+    index = build_index(_make_distributions(tmp_path))
+    assert sorted(index) == ["baz", "foo_bar"]
+    assert index["foo_bar"] == {
+        "name": "Foo.Bar",
+        "version": "1.2",
+        "path": "Foo_Bar-1.2.dist-info",
+        "requires": ["baz (>=1)"],
+        "entry_points": "[foo.plugins]\nqux = foo.qux:Plugin\n",
+    }
+    assert index["baz"]["version"] == "3.0"
+    assert index["baz"]["requires"] is None
+    assert index["baz"]["entry_points"] is None
+
+
+_PROGRAM = """
+import os
+import sys
+from importlib import metadata
+
+sys._MEIPASS = sys.argv[1]
+sys.path.insert(0, sys._MEIPASS)
+with open(sys.argv[2], encoding='utf-8') as f:
+    exec(compile(f.read(), sys.argv[2], 'exec'))
+
+listed = []
+_listdir = os.listdir
+os.listdir = lambda path='.': listed.append(path) or _listdir(path)
+
+eps = metadata.entry_points()
+eps = eps.select(group='foo.plugins') if hasattr(eps, 'select') else eps.get('foo.plugins', [])
+print([ep.value for ep in eps])
+print(metadata.version('foo-bar'), metadata.requires('Foo.Bar'), metadata.version('baz'))
+print(metadata.distribution('foo_bar').read_text('INSTALLER').strip())
+print(sys._MEIPASS in listed)
+"""
+
+
+def test_runtime_hook(tmp_path):
+    datas = _make_distributions(tmp_path)
+    index_file = tmp_path / INDEX_NAME
+    index_file.parent.mkdir()
+    index_file.write_text(json.dumps(build_index(datas)), encoding="utf-8")
+    # The index is used rather than the files.
+    (tmp_path / "Foo_Bar-1.2.dist-info" / "METADATA").unlink()
+
+    output = subprocess.run([sys.executable, "-c", _PROGRAM, str(tmp_path), RUNTIME_HOOK],
+                            check=True, capture_output=True, text=True).stdout
+    assert output.splitlines() == [
+        "['foo.qux:Plugin']",
+        "1.2 ['baz (>=1)'] 3.0",
+        "pip",
+        "False",
+    ]
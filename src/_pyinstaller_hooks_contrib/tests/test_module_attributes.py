@@ -0,0 +1,87 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+import sys
+import textwrap
+
+import pytest
+
+from _pyinstaller_hooks_contrib.utils import module_attributes
+from _pyinstaller_hooks_contrib.utils.module_attributes import find_module_spec, get_module_attribute
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    root = tmp_path / "static_pkg"
+    (root / "sub").mkdir(parents=True)
+    files = {
+        "__init__.py": """
+            # Importing this package must not be necessary.
+            raise ImportError("static_pkg must not be imported")
+            from ._version import __version__
+            NAMES = ["a", "b"]
+            COUNT: int = 2
+            try:
+                import missing
+                FLAG = True
+            except ImportError:
+                FLAG = False
+            MUTATED = []
+            MUTATED.append(1)
+        """,
+        "_version.py": """
+            __version__ = "1.2.3"
+        """,
+        "sub/__init__.py": """
+            LEVELS = {"up": 1}
+        """,
+    }
+    for name, source in files.items():
+        (root / name).write_text(textwrap.dedent(source))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return root
+
+
+@pytest.fixture
+def no_fallback(monkeypatch):
+    def fallback(module_name, attr_name):
+        raise AttributeError(f"{module_name}.{attr_name} was not evaluated statically")
+
+    monkeypatch.setattr(module_attributes.hookutils, "get_module_attribute", fallback)
+
+
+def test_find_module_spec(package):
+    assert find_module_spec("static_pkg.sub").origin == str(package / "sub" / "__init__.py")
+    assert find_module_spec("static_pkg.nonexistent") is None
+    assert "static_pkg" not in sys.modules
+
+
+def test_static_attributes(package, no_fallback):
+    assert get_module_attribute("static_pkg", "NAMES") == ["a", "b"]
+    assert get_module_attribute("static_pkg", "COUNT") == 2
+    assert get_module_attribute("static_pkg", "__version__") == "1.2.3"
+    assert get_module_attribute("static_pkg.sub", "LEVELS") == {"up": 1}
+    assert get_module_attribute("static_pkg", "__path__") == [str(package)]
+    assert "static_pkg" not in sys.modules
+
+
+@pytest.mark.parametrize("attr_name", ["FLAG", "MUTATED", "UNDEFINED"])
+def test_falls_back(package, no_fallback, attr_name):
+    with pytest.raises(AttributeError, match="was not evaluated statically"):
+        get_module_attribute("static_pkg", attr_name)
+
+
+def test_falls_back_pyinstaller4(monkeypatch):
+    # PyInstaller 4.x only returns the str() of attributes: the fallback returns the literal itself.
+    monkeypatch.setattr(module_attributes, "is_module_satisfies", lambda requirement: False)
+    assert get_module_attribute("sys", "builtin_module_names") == sys.builtin_module_names
+    with pytest.raises(AttributeError):
+        get_module_attribute("sys", "UNDEFINED")
@@ -0,0 +1,84 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+import logging
+import sys
+import textwrap
+
+import pytest
+
+from _pyinstaller_hooks_contrib.utils.plugins import _is_stdlib, select_plugins
+
+PLUGINS = [
+    "plugin_pkg.plugins",
+    "plugin_pkg.plugins.readers",
+    "plugin_pkg.plugins.readers.csv",
+    "plugin_pkg.plugins.readers.sql",
+    "plugin_pkg.plugins.writers",
+    "plugin_pkg.plugins.writers.csv",
+]
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    files = {
+        "plugin_pkg/__init__.py": "",
+        "plugin_pkg/plugins/__init__.py": "",
+        "plugin_pkg/plugins/readers/__init__.py": "",
+        "plugin_pkg/plugins/readers/csv.py": "import csv\nfrom .. import _common\n",
+        "plugin_pkg/plugins/readers/sql.py": "from .._common import helper\nfrom heavy_dep import engine\n",
+        "plugin_pkg/plugins/_common.py": "",
+        "plugin_pkg/plugins/writers/__init__.py": "",
+        "plugin_pkg/plugins/writers/csv.py": "",
+        "heavy_dep/__init__.py": "",
+    }
+    for name, source in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(textwrap.dedent(source))
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+
+def test_default_selects_all(package, fake_hook_api):
+    assert select_plugins(fake_hook_api({}), "plugin_pkg", "plugin_pkg.plugins", PLUGINS) == PLUGINS
+
+
+def test_selection(package, fake_hook_api, caplog):
+    hook_api = fake_hook_api({"plugin_pkg": {"plugins": ["readers.csv", "writers"]}})
+    with caplog.at_level(logging.INFO):
+        assert select_plugins(hook_api, "plugin_pkg", "plugin_pkg.plugins", PLUGINS) == [
+            "plugin_pkg.plugins",
+            "plugin_pkg.plugins.readers",
+            "plugin_pkg.plugins.readers.csv",
+            "plugin_pkg.plugins.writers",
+            "plugin_pkg.plugins.writers.csv",
+        ]
+    # plugin_pkg.plugins._common is also imported by the selected csv reader.
+    assert "do not pull in 1 modules of plugin_pkg and the packages: heavy_dep" in caplog.text
+
+
+def test_unknown_plugin(package, fake_hook_api, caplog):
+    hook_api = fake_hook_api({"plugin_pkg": {"plugins": ["readers.xml"]}})
+    assert select_plugins(hook_api, "plugin_pkg", "plugin_pkg.plugins", PLUGINS) == []
+    assert "unknown plugin 'readers.xml'" in caplog.text
+
+
+def test_stdlib_without_stdlib_module_names(package, monkeypatch):
+    # python < 3.10: the standard library is located from the modules' specs.
+    monkeypatch.delattr(sys, "stdlib_module_names", raising=False)
+    _is_stdlib.cache_clear()
+    try:
+        assert _is_stdlib("csv")
+        assert _is_stdlib("sys")
+        assert not _is_stdlib("heavy_dep")
+        assert not _is_stdlib("pytest")
+    finally:
+        _is_stdlib.cache_clear()
@@ -0,0 +1,100 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+import concurrent.futures
+import logging
+import threading
+
+import pytest
+from PyInstaller import isolated
+
+from _pyinstaller_hooks_contrib.utils import prefetch
+
+_logger = logging.getLogger('PyInstaller.test_prefetch')
+_started = threading.Event()
+_released = threading.Event()
+_calls = []
+
+
+def _query(name):
+    _calls.append((name, threading.current_thread().name.startswith('pyi-hooks-prefetch')))
+    _logger.info('computing %s', name)
+    if name == 'blocking':
+        _started.set()
+        _released.wait(10)
+    return [name]
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    monkeypatch.setattr(prefetch, 'QUERIES', {
+        'pytest': [(_query, (name,), {}) for name in ('first', 'blocking', 'pending', 'cancelled')],
+        'not_an_installed_package': [(_query, ('not installed',), {})],
+    })
+    _calls.clear()
+    _started.clear()
+    _released.clear()
+    yield
+    _released.set()
+    prefetch.finish()
+
+
+def test_prefetch_disabled(queries, monkeypatch):
+    monkeypatch.delenv('PYINSTALLER_HOOKS_PREFETCH', raising=False)
+    assert prefetch.prefetched(_query, 'first') == ['first']
+    assert _calls == [('first', False)]
+
+
+def test_prefetch(queries, monkeypatch, caplog):
+    caplog.set_level(logging.INFO)
+    monkeypatch.setenv('PYINSTALLER_HOOKS_PREFETCH', '1')
+
+    # Computed by the pool, its log message held back until it is used.
+    assert prefetch.prefetched(_query, 'first') == ['first']
+    assert caplog.messages[-1] == 'computing first'
+    # Not started yet (the only thread of the pool is blocked): computed by the caller.
+    assert _started.wait(10)
+    assert prefetch.prefetched(_query, 'pending') == ['pending']
+    assert _calls == [('first', True), ('blocking', True), ('pending', False)]
+
+    # The pending query is cancelled once all the hooks ran, and the queries are reported later on.
+    logging.getLogger('PyInstaller').info('Looking for dynamic libraries')
+    assert caplog.messages[-1] == 'Looking for dynamic libraries'
+    _released.set()
+    prefetch.finish()
+    assert caplog.messages[-1] in (
+        'Prefetched hook queries: 0 hits, 1 waited for, 1 misses, 1 unused, 1 cancelled.',
+        'Prefetched hook queries: 1 hits, 0 waited for, 1 misses, 1 unused, 1 cancelled.',
+    )
+    # The unused query completed, without logging.
+    assert 'computing blocking' not in caplog.messages
+    assert 'computing cancelled' not in caplog.messages
+
+
+def _child_pid():
+    import os
+    return os.getpid()
+
+
+def _isolated_query(name):
+    return [name, isolated.call(_child_pid)]
+
+
+def test_prefetch_isolated(monkeypatch):
+    monkeypatch.setattr(prefetch, 'QUERIES', {'pytest': [(_isolated_query, ('isolated',), {})]})
+    monkeypatch.setenv('PYINSTALLER_HOOKS_PREFETCH', '1')
+    # While a subprocess of the main thread is being started, the pool cannot start one.
+    with prefetch._spawn_lock:
+        assert prefetch.prefetched(_query, 'first') == ['first']
+        query = next(iter(prefetch._prefetcher.prefetches.values())).future
+        assert not concurrent.futures.wait([query], timeout=1).done
+    assert prefetch.prefetched(_isolated_query, 'isolated')[0] == 'isolated'
+    prefetch.finish()
@@ -0,0 +1,30 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+import pytest
+
+from _pyinstaller_hooks_contrib.tests.shared_analysis import SharedBuild
+
+
+def _tocs(**tocs):
+    return {name: tocs.get(name, []) for name in ('scripts', 'pure', 'binaries', 'datas', 'zipfiles')}
+
+
+def test_shared_build_check(tmp_path):
+    shared = SharedBuild(tmp_path)
+    datas = [('pkg/data.txt', '/src/pkg/data.txt', 'DATA')]
+    shared.check('onedir', _tocs(datas=datas))
+    shared.check('onefile', _tocs(datas=datas))
+    assert not shared.finish('onedir')
+    assert shared.finish('onefile')
+
+    with pytest.raises(pytest.fail.Exception, match=r"datas: only in onefile: \[\]; only in onedir: \[\('pkg/data"):
+        shared.check('onefile', _tocs())
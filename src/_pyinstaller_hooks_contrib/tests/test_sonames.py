@@ -0,0 +1,60 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+import glob
+import os
+import shutil
+
+import pytest
+from PyInstaller.compat import is_linux
+
+from _pyinstaller_hooks_contrib.utils.sonames import collect_by_soname, elf_soname
+
+
+def _find_libz():
+    for directory in ("/lib", "/usr/lib", "/lib64", "/usr/lib64", "/lib/*-linux-gnu", "/usr/lib/*-linux-gnu"):
+        for path in sorted(glob.glob(os.path.join(directory, "libz.so.1.*"))):
+            if not os.path.islink(path):
+                return path
+    return None
+
+
+@pytest.mark.skipif(not is_linux or _find_libz() is None, reason="Requires zlib as an ELF shared library.")
+def test_collect_by_soname_elf(tmp_path):
+    libz = _find_libz()
+    real = tmp_path / os.path.basename(libz)
+    shutil.copy(libz, real)
+    # A development symbolic link, and a copy under the SONAME, as in a wheel.
+    (tmp_path / "libz.so").symlink_to(real.name)
+    shutil.copy(libz, tmp_path / "libz.so.1")
+    (tmp_path / "libother.so").write_bytes(b"other")
+
+    assert elf_soname(str(real)) == "libz.so.1"
+    assert elf_soname(str(tmp_path / "libother.so")) is None
+    binaries = [(str(path), "pyarrow") for path in sorted(tmp_path.iterdir())]
+    assert collect_by_soname(binaries) == [
+        (str(tmp_path / "libother.so"), "pyarrow"),
+        (str(tmp_path / "libz.so.1"), "pyarrow"),
+    ]
+
+
+def test_collect_by_soname_without_soname(tmp_path):
+    for name in ("libarrow.dylib", "libarrow.1500.dylib", "libarrow.1500.0.0.dylib"):
+        (tmp_path / name).write_bytes(b"arrow")
+    (tmp_path / "libparquet.1500.dylib").write_bytes(b"parquet")
+    binaries = [(str(path), ".") for path in sorted(tmp_path.iterdir())]
+    # Copies in different destination directories are kept.
+    binaries.append((str(tmp_path / "libarrow.dylib"), "other"))
+    assert collect_by_soname(binaries) == [
+        (str(tmp_path / "libarrow.1500.dylib"), "."),
+        (str(tmp_path / "libarrow.dylib"), "other"),
+        (str(tmp_path / "libparquet.1500.dylib"), "."),
+    ]
@@ -0,0 +1,70 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+import sys
+
+import pytest
+
+from _pyinstaller_hooks_contrib.utils.submodules import collect_submodules
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    root = tmp_path / "pruned_pkg"
+    for name in ["__init__.py", "core.py", "testutils.py", "tests/__init__.py", "tests/test_core.py",
+                 "widgets/__init__.py", "widgets/dialogTemplate.py", "widgets/tests/__init__.py",
+                 "widgets/tests/test_dialog.py"]:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Collecting submodules must not import anything.
+        path.write_text(f"raise ImportError('{name} must not be imported')\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return root
+
+
+def test_collect_all(package):
+    assert collect_submodules("pruned_pkg") == [
+        "pruned_pkg",
+        "pruned_pkg.core",
+        "pruned_pkg.tests",
+        "pruned_pkg.tests.test_core",
+        "pruned_pkg.testutils",
+        "pruned_pkg.widgets",
+        "pruned_pkg.widgets.dialogTemplate",
+        "pruned_pkg.widgets.tests",
+        "pruned_pkg.widgets.tests.test_dialog",
+    ]
+    assert not any(name.startswith("pruned_pkg") for name in sys.modules)
+
+
+def test_prune(package):
+    assert collect_submodules("pruned_pkg", prune=["pruned_pkg.tests", "pruned_pkg.testutils"]) == [
+        "pruned_pkg",
+        "pruned_pkg.core",
+        "pruned_pkg.widgets",
+        "pruned_pkg.widgets.dialogTemplate",
+        "pruned_pkg.widgets.tests",
+        "pruned_pkg.widgets.tests.test_dialog",
+    ]
+    assert collect_submodules("pruned_pkg", prune=lambda name: name.rpartition(".")[2] == "tests") == [
+        "pruned_pkg",
+        "pruned_pkg.core",
+        "pruned_pkg.testutils",
+        "pruned_pkg.widgets",
+        "pruned_pkg.widgets.dialogTemplate",
+    ]
+
+
+def test_filter_does_not_prune(package):
+    # Unlike PyInstaller's collect_submodules(), a filter rejecting "pruned_pkg.widgets" must not stop the scan of it.
+    assert collect_submodules("pruned_pkg", filter=lambda name: "Template" in name) == [
+        "pruned_pkg.widgets.dialogTemplate",
+    ]
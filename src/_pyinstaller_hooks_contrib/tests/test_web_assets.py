@@ -0,0 +1,60 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+import os
+
+import pytest
+
+from _pyinstaller_hooks_contrib.utils.web_assets import slim_web_assets
+
+
+@pytest.fixture
+def datas(tmp_path):
+    files = [
+        "web_pkg/static/bundle.js",
+        "web_pkg/static/bundle.min.js",
+        "web_pkg/static/bundle.min.js.map",
+        "web_pkg/static/renderer.dev.js",
+        "web_pkg/static/style.css",
+        "web_pkg/static/style.min.css",
+        "web_pkg/vendor/lib.js",
+        "web_pkg/vendor/lib.min.js",
+        "web_pkg/tests/fixture.json",
+        "web_pkg/templates/page.html",
+    ]
+    datas = []
+    for name in files:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x" * 10)
+        datas.append((str(path), os.path.dirname(name).replace("/", os.sep)))
+    return datas
+
+
+def _collected(datas):
+    return sorted(os.path.basename(src) for src, _ in datas)
+
+
+def test_slim_web_assets(datas, fake_hook_api):
+    hook_api = fake_hook_api()
+    assert _collected(slim_web_assets(hook_api, "web_pkg", datas, unminified_dirs=["web_pkg/static"])) == [
+        "bundle.min.js",
+        "lib.js",
+        "lib.min.js",
+        "page.html",
+        "style.min.css",
+    ]
+
+
+@pytest.mark.parametrize("keep", [True, ["web_pkg"]])
+def test_keep_dev_assets(datas, fake_hook_api, keep):
+    hook_api = fake_hook_api({"web_assets": {"keep_dev_assets": keep}})
+    assert slim_web_assets(hook_api, "web_pkg", datas, unminified_dirs=["web_pkg/static"]) == datas
@@ -0,0 +1,128 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+"""
+Content-hash based detection of duplicated shared libraries.
+
+Several hooks have to collect shared libraries into a package-specific directory (e.g., ``shapely/.dylibs`` or
+``Shapely.libs``) which the binary dependency analysis then collects a second time into the top-level directory. Hooks
+cannot see the final TOC so this is done as a post-collection pass from the .spec file::
+
+    from _pyinstaller_hooks_contrib.utils.dedup import link_duplicates, report_duplicates
+
+    a = Analysis(['program.py'])
+    # onefile builds: only report the duplicates.
+    report_duplicates(a.binaries)
+    ...
+    coll = COLLECT(exe, a.binaries, a.zipfiles, a.datas, name='program')
+    # onedir builds: replace the duplicates by relative symlinks.
+    link_duplicates(coll.name, a.binaries)
+"""
+
+import hashlib
+import os
+from collections import defaultdict
+
+from PyInstaller import log as logging
+from PyInstaller.compat import is_win
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 1 << 20
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _group_by_content(files):
+    """
+    Group (name, path) pairs by the content of the file at *path*. Only groups with more than one member are returned.
+    Each group is sorted by name.
+    """
+    # Hashing is only necessary for files which share their size with another file.
+    by_size = defaultdict(list)
+    for name, path in files:
+        if os.path.isfile(path) and not os.path.islink(path):
+            by_size[os.path.getsize(path)].append((name, path))
+
+    groups = []
+    for candidates in by_size.values():
+        if len(candidates) < 2:
+            continue
+        by_hash = defaultdict(list)
+        for name, path in candidates:
+            by_hash[_file_hash(path)].append((name, path))
+        groups += [sorted(group) for group in by_hash.values() if len(group) > 1]
+    return sorted(groups)
+
+
+def find_duplicates(toc):
+    """
+    Find the entries of a TOC (e.g., ``Analysis.binaries``) which collect files with identical content.
+
+    Returns a list of groups, each being a sorted list of ``(dest_name, src_name)`` pairs sharing the same content.
+    """
+    return _group_by_content((entry[0], entry[1]) for entry in toc)
+
+
+def _log_groups(groups, action):
+    wasted = 0
+    for group in groups:
+        size = os.path.getsize(group[0][1])
+        wasted += size * (len(group) - 1)
+        logger.info("%s %d copies of %s (%d bytes each): %s", action, len(group), group[0][0], size,
+                    ", ".join(name for name, _ in group[1:]))
+    logger.info("Duplicated shared libraries: %d groups, %d duplicate bytes.", len(groups), wasted)
+    return wasted
+
+
+def report_duplicates(toc):
+    """
+    Log every group of content-identical entries in *toc* and the total number of duplicated bytes.
+
+    Returns the number of duplicated bytes.
+    """
+    return _log_groups(find_duplicates(toc), "Found")
+
+
+def link_duplicates(dist_dir, toc=None):
+    """
+    Replace content-identical files in the onedir build *dist_dir* by relative symbolic links to the first of them.
+
+    If *toc* is given, only its entries (typically ``Analysis.binaries``) are considered. Otherwise, every file in
+    *dist_dir* is. Windows does not allow unprivileged symlinks, so duplicates are only reported there.
+
+    Returns the number of bytes saved.
+    """
+    if toc is not None:
+        names = sorted(entry[0] for entry in toc)
+    else:
+        names = sorted(
+            os.path.relpath(os.path.join(root, filename), dist_dir)
+            for root, _, filenames in os.walk(dist_dir) for filename in filenames
+        )
+    groups = _group_by_content((name, os.path.join(dist_dir, name)) for name in names)
+
+    if is_win:
+        _log_groups(groups, "Found")
+        return 0
+
+    for group in groups:
+        _, target = group[0]
+        for _, path in group[1:]:
+            os.remove(path)
+            os.symlink(os.path.relpath(target, os.path.dirname(path)), path)
+    return _log_groups(groups, "Linked")
@@ -0,0 +1,68 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+"""
+Coordination between the hooks of packages which bring their own copy of FFmpeg.
+
+``av``, ``cv2``, ``ffpyplayer`` and ``imageio_ffmpeg`` each ship a private FFmpeg build. Their hooks report when more
+than one of them is part of the build. Which of them may collect their FFmpeg can be chosen via the hooks
+configuration::
+
+    hooksconfig={
+        "ffmpeg": {
+            # Providers whose FFmpeg is collected (default: all of them).
+            "providers": ["av"],
+            # An ffmpeg executable for imageio_ffmpeg to use instead of its own (which is ~70 MB).
+            "executable": "/usr/bin/ffmpeg",
+        },
+    }
+
+Only the copies which are loaded on demand can be dropped: OpenCV's ``opencv_videoio_ffmpeg`` plugin (Windows) and
+``imageio_ffmpeg``'s executable. If the latter is dropped and no ``executable`` is given, ``imageio_ffmpeg`` falls back
+to an ``ffmpeg`` found on ``PATH`` at run-time. The libraries of ``av`` and ``ffpyplayer`` are linked against their
+extension modules so they are always collected.
+"""
+
+from PyInstaller.utils.hooks import get_hook_config, logger
+
+PROVIDERS = ("av", "cv2", "ffpyplayer", "imageio_ffmpeg")
+
+# Providers whose FFmpeg is not needed to import the package.
+OPTIONAL_PROVIDERS = ("cv2", "imageio_ffmpeg")
+
+
+def _is_in_graph(hook_api, name):
+    node = hook_api.module_graph.find_node(name)
+    # Missing modules are also graph nodes but without a file.
+    return node is not None and node.filename is not None
+
+
+def ffmpeg_provider_selected(hook_api, provider):
+    """
+    Report the other FFmpeg providers found in the module graph and return whether the hook of *provider* should
+    collect its copy of FFmpeg.
+    """
+    others = [name for name in PROVIDERS if name != provider and _is_in_graph(hook_api, name)]
+    if others:
+        logger.info(
+            "hook-%s: FFmpeg is also bundled by %s. Use hooksconfig={'ffmpeg': {'providers': [...]}} to select which "
+            "copies to collect.", provider, ", ".join(others)
+        )
+
+    providers = get_hook_config(hook_api, "ffmpeg", "providers")
+    if providers is None or provider in providers:
+        return True
+    if provider not in OPTIONAL_PROVIDERS:
+        logger.warning("hook-%s: the FFmpeg libraries of %s are required to import it and cannot be excluded!",
+                       provider, provider)
+        return True
+    logger.info("hook-%s: not collecting FFmpeg of %s.", provider, provider)
+    return False
@@ -0,0 +1,195 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+"""
+Subsetting of the PROJ and GDAL data directories collected by the pyproj and osgeo hooks.
+
+PROJ data directories (e.g., conda's ``share/proj``) may contain transformation grids worth hundreds of MB, and the GDAL
+data directory holds the support files of all GDAL drivers. Both are collected as a whole by default. The PROJ grids to
+collect can be selected by file name pattern, or by the CRSes used by the application; the GDAL data files by file name
+pattern::
+
+    hooksconfig={
+        "pyproj": {
+            # File name patterns of the PROJ grids to collect.
+            "grids": ["ch_swisstopo_*.tif"],
+            # Collect the grids used by the transformations from and to these CRSes (or their base geographic and
+            # vertical CRSes). The build log lists those grids which are not available to be collected.
+            "grids_for_crs": ["EPSG:2056", "EPSG:5728"],
+        },
+        "osgeo": {
+            # File name patterns of the GDAL data files to collect.
+            "gdal_data": ["s57*.csv", "header.dxf", "trailer.dxf"],
+        },
+    }
+
+The other PROJ data files, such as ``proj.db``, are always collected.
+"""
+
+import fnmatch
+import os
+import sqlite3
+
+from PyInstaller.utils.hooks import get_hook_config, logger
+
+# Extensions of PROJ grid files which may be missing from proj.db's grid_alternatives (e.g., user-provided grids).
+_GRID_EXTENSIONS = ('.tif', '.tiff', '.gsb', '.gtx')
+
+
+def expand_directories(datas):
+    """
+    Replace the directory entries of *datas* by entries for each of the files in these directories.
+    """
+    expanded = []
+    for src, dest in datas:
+        if not os.path.isdir(src):
+            expanded.append((src, dest))
+            continue
+        for root, dirs, files in os.walk(src):
+            dirs.sort()
+            subdir = os.path.normpath(os.path.join(dest, os.path.relpath(root, src)))
+            expanded += [(os.path.join(root, name), subdir) for name in sorted(files)]
+    return expanded
+
+
+def _matches(name, patterns):
+    return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+def _size_mb(datas):
+    return sum(os.path.getsize(src) for src, _ in datas) / 1024 / 1024
+
+
+def _crs_components(db, crs):
+    """
+    Return the set of (auth_name, code) of *crs* and of the CRSes it is based on: the geodetic CRS of a projected CRS,
+    and the horizontal and vertical CRSes of a compound CRS.
+    """
+    components = set()
+    todo = [crs]
+    while todo:
+        auth_name, code = todo.pop()
+        if (auth_name, code) in components:
+            continue
+        components.add((auth_name, code))
+        for query in (
+            "SELECT geodetic_crs_auth_name, geodetic_crs_code FROM projected_crs WHERE auth_name = ? AND code = ?",
+            "SELECT horiz_crs_auth_name, horiz_crs_code FROM compound_crs WHERE auth_name = ? AND code = ?",
+            "SELECT vertical_crs_auth_name, vertical_crs_code FROM compound_crs WHERE auth_name = ? AND code = ?",
+        ):
+            todo += [(row_auth_name, str(row_code)) for row_auth_name, row_code in db.execute(query, (auth_name, code))]
+    return components
+
+
+def _read_proj_db(path, crs_list):
+    """
+    Read the grid file names known to the PROJ database *path*, and the grids used by the transformations of each CRS
+    in *crs_list* (strings like "EPSG:2056"). A grid is a tuple of its alternative file names.
+    """
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        alternatives = {}
+        for original_name, name, old_name in db.execute(
+            "SELECT original_grid_name, proj_grid_name, old_proj_grid_name FROM grid_alternatives"
+        ):
+            alternatives[original_name] = (name, old_name) if old_name else (name,)
+        grid_names = {name for names in alternatives.values() for name in names}
+
+        transformations = db.execute(
+            "SELECT source_crs_auth_name, source_crs_code, target_crs_auth_name, target_crs_code, "
+            "grid_name, grid2_name FROM grid_transformation WHERE deprecated = 0"
+        ).fetchall()
+        crs_grids = {}
+        for crs in crs_list:
+            auth_name, _, code = crs.partition(":")
+            auth_name = auth_name.upper()
+            query = "SELECT 1 FROM crs_view WHERE auth_name = ? AND code = ?"
+            if db.execute(query, (auth_name, code)).fetchone() is None:
+                logger.warning("PROJ database %s: unknown CRS %r.", path, crs)
+            components = _crs_components(db, (auth_name, code))
+            grids = set()
+            for source_auth_name, source_code, target_auth_name, target_code, *grid_columns in transformations:
+                if (source_auth_name, str(source_code)) in components or \
+                        (target_auth_name, str(target_code)) in components:
+                    # Grids without a PROJ alternative cannot be used by PROJ anyway.
+                    grids.update(alternatives[grid] for grid in grid_columns if grid in alternatives)
+            crs_grids[crs] = grids
+    finally:
+        db.close()
+    return grid_names, crs_grids
+
+
+def select_proj_grids(hook_api, package, datas):
+    """
+    Remove the PROJ grids not selected by the ``grids`` and ``grids_for_crs`` options in the hooks configuration of
+    *package* from the ``datas`` entries of a PROJ data directory, unless neither option is set.
+    """
+    patterns = get_hook_config(hook_api, package, "grids")
+    crs_list = get_hook_config(hook_api, package, "grids_for_crs")
+    if patterns is None and crs_list is None:
+        return datas
+    patterns = patterns or []
+    crs_list = crs_list or []
+
+    datas = expand_directories(datas)
+    databases = [src for src, _ in datas if os.path.basename(src) == "proj.db"]
+    if not databases:
+        logger.warning("hook-%s: proj.db not found among the collected data files; not selecting PROJ grids.", package)
+        return datas
+    grid_names, crs_grids = _read_proj_db(databases[0], crs_list)
+
+    def is_grid(src):
+        name = os.path.basename(src)
+        return name in grid_names or name.lower().endswith(_GRID_EXTENSIONS)
+
+    available = {os.path.basename(src) for src, _ in datas if is_grid(src)}
+    wanted = {name for grids in crs_grids.values() for names in grids for name in names}
+    for crs, grids in crs_grids.items():
+        missing = sorted(names[0] for names in grids if not available.intersection(names))
+        if missing:
+            logger.warning(
+                "hook-%s: %d grids used by the transformations of %s are not available for collection: %s. PROJ may "
+                "download them at run-time if its network access is enabled.", package, len(missing), crs,
+                ", ".join(missing)
+            )
+
+    kept = []
+    removed = []
+    for src, dest in datas:
+        name = os.path.basename(src)
+        if not is_grid(src) or name in wanted or _matches(name, patterns):
+            kept.append((src, dest))
+        else:
+            removed.append((src, dest))
+    logger.info(
+        "hook-%s: collecting %d of %d PROJ grids (%.1f MB not collected).", package,
+        len(available) - len({os.path.basename(src) for src, _ in removed}), len(available), _size_mb(removed)
+    )
+    return kept
+
+
+def select_gdal_data(hook_api, package, datas):
+    """
+    Remove the files not selected by the ``gdal_data`` option in the hooks configuration of *package* from the ``datas``
+    entries of a GDAL data directory, unless the option is not set.
+    """
+    patterns = get_hook_config(hook_api, package, "gdal_data")
+    if patterns is None:
+        return datas
+
+    datas = expand_directories(datas)
+    kept = [(src, dest) for src, dest in datas if _matches(os.path.basename(src), patterns)]
+    removed = [(src, dest) for src, dest in datas if not _matches(os.path.basename(src), patterns)]
+    logger.info(
+        "hook-%s: collecting %d of %d GDAL data files (%.1f MB not collected).", package, len(kept), len(datas),
+        _size_mb(removed)
+    )
+    return kept
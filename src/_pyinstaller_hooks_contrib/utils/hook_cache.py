@@ -0,0 +1,202 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+"""
+Reuse of the results of expensive hooks across builds.
+
+Hooks like hook-tensorflow.py spend most of a rebuild importing packages and walking their trees, although their results
+only change when one of their inputs does. Such hooks declare their inputs, and compute their results through
+:func:`cached_hook_result`, which stores the results in PyInstaller's cache directory under a fingerprint of these
+inputs, and reuses them for as long as the fingerprint matches.
+
+The cache is opt-in, through the hooks configuration::
+
+    hooksconfig={
+        "hooks_cache": {
+            # Reuse the results of the hooks which declare their inputs (default: False).
+            "enabled": True,
+            # Compute the results anyway, and report those which differ from the cached ones, i.e., the hooks with
+            # undeclared inputs (default: False).
+            "verify": True,
+        },
+    }
+
+Builds without a spec file can set the environment variable ``PYINSTALLER_HOOKS_CACHE`` to ``1`` or ``verify``
+instead. ``pyinstaller --clean`` clears the cache along with the rest of PyInstaller's cache directory.
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+from PyInstaller import __version__ as pyinstaller_version
+from PyInstaller.compat import is_conda, is_py38
+from PyInstaller.config import CONF
+from PyInstaller.utils.hooks import get_hook_config, logger
+
+from _pyinstaller_hooks_contrib import __version__ as contrib_version
+from _pyinstaller_hooks_contrib.utils.module_attributes import find_module_spec
+
+# The results which can be cached, and which of them are lists of (src, dest) tuples.
+_RESULT_KEYS = ('hiddenimports', 'datas', 'binaries')
+_TOC_KEYS = ('datas', 'binaries')
+
+
+def _cache_mode(hook_api):
+    mode = os.environ.get('PYINSTALLER_HOOKS_CACHE', '').lower()
+    if get_hook_config(hook_api, 'hooks_cache', 'verify') or mode == 'verify':
+        return 'verify'
+    if get_hook_config(hook_api, 'hooks_cache', 'enabled') or mode in ('1', 'true', 'yes'):
+        return 'enabled'
+    return None
+
+
+def _distribution_input(name):
+    if is_py38:
+        from importlib import metadata
+    else:
+        # PyInstaller requires the backport on python < 3.8.
+        import importlib_metadata as metadata
+    try:
+        dist = metadata.distribution(name)
+    except metadata.PackageNotFoundError:
+        return None
+    return [dist.version, str(dist.locate_file(''))]
+
+
+def _directory_input(path):
+    """
+    Summarize the tree under *path* by the names, sizes and modification times of its files.
+
+    Bytecode files are left out, as they are written whenever the package is imported, e.g., by the hook itself.
+    """
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(name for name in dirs if name != '__pycache__')
+        for name in sorted(files):
+            if name.endswith(('.pyc', '.pyo')):
+                continue
+            filename = os.path.join(root, name)
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                continue
+            digest.update(f'{os.path.relpath(filename, path)}\0{stat.st_size}\0{stat.st_mtime_ns}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _package_directories(packages):
+    directories = []
+    for package in packages:
+        spec = find_module_spec(package)
+        if spec is not None:
+            directories += spec.submodule_search_locations or [os.path.dirname(spec.origin)]
+    return directories
+
+
+def _fingerprint(hook_file, distributions, packages, directories, environment, conda_prefix):
+    with open(hook_file, 'rb') as f:
+        hook_source = hashlib.sha256(f.read()).hexdigest()
+    inputs = {
+        'hook': [hook_file, hook_source],
+        'python': [sys.executable, sys.version],
+        'versions': [pyinstaller_version, contrib_version],
+        'distributions': {name: _distribution_input(name) for name in distributions},
+        'directories': {
+            path: _directory_input(path) if os.path.isdir(path) else None
+            for path in list(directories) + _package_directories(packages)
+        },
+        'environment': {name: os.environ.get(name) for name in environment},
+    }
+    if conda_prefix and is_conda:
+        history = os.path.join(sys.prefix, 'conda-meta', 'history')
+        inputs['conda'] = [sys.prefix, os.path.getmtime(history) if os.path.isfile(history) else None]
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _load(filename):
+    try:
+        with open(filename, encoding='utf-8') as f:
+            result = json.load(f)
+    except (OSError, ValueError):
+        return None
+    for key in _TOC_KEYS:
+        if key in result:
+            result[key] = [tuple(entry) for entry in result[key]]
+    return result
+
+
+def _store(filename, result):
+    cache_dir, basename = os.path.split(filename)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(filename + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(result, f)
+    os.replace(filename + '.tmp', filename)
+    # Remove the results cached for the previous inputs of the hook.
+    prefix = basename.rpartition('-')[0] + '-'
+    for entry in os.listdir(cache_dir):
+        if entry.startswith(prefix) and entry.endswith('.json') and entry != basename:
+            os.remove(os.path.join(cache_dir, entry))
+
+
+def _report_differences(name, cached, result):
+    differences = []
+    for key in _RESULT_KEYS:
+        added = sorted(set(result.get(key, [])) - set(cached.get(key, [])))
+        removed = sorted(set(cached.get(key, [])) - set(result.get(key, [])))
+        if added or removed:
+            differences.append(f'{key}: +{added} -{removed}')
+    if differences:
+        logger.warning(
+            "hook-%s: the cached result differs from the computed one, so the hook has undeclared inputs. %s", name,
+            "; ".join(differences)
+        )
+    else:
+        logger.info("hook-%s: the cached result matches the computed one.", name)
+
+
+def cached_hook_result(
+    hook_api, name, compute, distributions=(), packages=(), directories=(), environment=(), conda_prefix=False
+):
+    """
+    Return ``compute()``, a dict with the ``hiddenimports``, ``datas`` and/or ``binaries`` found by hook *name*,
+    reusing the result of an earlier build if the cache is enabled and the hook's inputs did not change.
+
+    The inputs of a hook are its source file (the file defining *compute*), the python interpreter, the versions of
+    PyInstaller and of this package, and those declared by the hook:
+
+    *distributions* are the names of the distributions whose versions and locations are queried; *packages* are the
+    names of the packages whose directories are scanned; *directories* are other directories scanned; *environment*
+    are the names of the environment variables read; and *conda_prefix* tells whether the hook looks into the conda
+    environment (if any).
+    """
+    mode = _cache_mode(hook_api)
+    if mode is None:
+        return compute()
+
+    fingerprint = _fingerprint(
+        compute.__code__.co_filename, distributions, packages, directories, environment, conda_prefix
+    )
+    filename = os.path.join(CONF['cachedir'], 'hooks-contrib', f'{name}-{fingerprint}.json')
+    cached = _load(filename)
+    if cached is not None and mode == 'enabled':
+        logger.info("hook-%s: reusing the cached result.", name)
+        return cached
+
+    result = compute()
+    if cached is not None:
+        _report_differences(name, cached, result)
+    try:
+        _store(filename, {key: list(value) for key, value in result.items()})
+    except OSError as e:
+        logger.warning("hook-%s: could not cache the result: %s", name, e)
+    return result
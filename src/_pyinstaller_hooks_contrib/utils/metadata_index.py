@@ -0,0 +1,126 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+"""
+Build-time index of the distribution metadata collected by ``copy_metadata()``.
+
+At run-time, ``importlib.metadata.version()``, ``requires()``, ``entry_points()`` and the like look the metadata up by
+listing the directories of ``sys.path``, including the application's top-level directory, and by reading and parsing
+the ``.dist-info`` and ``.egg-info`` files. Libraries which look their plugins up with ``entry_points()`` on import pay
+for this in every process.
+
+Hooks cannot see the final TOC, so the index is built as a post-collection pass from the .spec file. It maps the
+normalized name of each collected distribution to its name, version, requirements and entry points, and is collected
+as ``_pyi_precompiled/importlib_metadata.json``. Its runtime hook, which has to be passed to the Analysis, replaces
+``PathFinder`` in ``sys.meta_path`` by a subclass whose ``find_distributions()`` serves the distributions of the
+application's top-level directory from the index, without listing it::
+
+    from _pyinstaller_hooks_contrib.utils.metadata_index import RUNTIME_HOOK, add_metadata_index
+
+    a = Analysis(['program.py'], runtime_hooks=[RUNTIME_HOOK])
+    add_metadata_index(a)
+
+Only the distributions looked up through the standard library's ``importlib.metadata`` are served from the index; the
+other files of their metadata directories are still read from disk on demand.
+"""
+
+import json
+import os
+import pathlib
+import re
+
+from PyInstaller import log as logging
+from PyInstaller.compat import is_py38
+from PyInstaller.config import CONF
+
+from _pyinstaller_hooks_contrib.hooks import rthooks
+from _pyinstaller_hooks_contrib.utils.precompile import PRECOMPILED_DIR
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = os.path.join(PRECOMPILED_DIR, 'importlib_metadata.json')
+RUNTIME_HOOK = os.path.join(rthooks.DIR, 'pyi_rth_metadata_index.py')
+
+_METADATA_SUFFIXES = ('.dist-info', '.egg-info')
+
+
+def normalize(name):
+    """
+    Normalize a distribution name as ``importlib.metadata`` does to match it.
+    """
+    return re.sub(r'[-_.]+', '_', name).lower()
+
+
+def _metadata_directories(datas):
+    """
+    Group the files of *datas* which belong to top-level metadata directories. Return a dictionary mapping the name of
+    each directory to a dictionary mapping the names of its files to their source paths.
+    """
+    directories = {}
+    for dest_name, src_name, *_ in datas:
+        parts = os.path.normpath(dest_name).split(os.sep)
+        if len(parts) == 2 and parts[0].endswith(_METADATA_SUFFIXES):
+            directories.setdefault(parts[0], {})[parts[1]] = src_name
+    return directories
+
+
+def _read(files, name):
+    if name not in files:
+        return None
+    with open(files[name], encoding='utf-8') as f:
+        return f.read()
+
+
+def build_index(datas):
+    """
+    Return the index of the metadata directories collected in *datas* (e.g., ``Analysis.datas``).
+    """
+    from importlib.metadata import PathDistribution
+
+    index = {}
+    for directory, files in sorted(_metadata_directories(datas).items()):
+        # Only the files which are collected are indexed.
+        metadata_file = 'METADATA' if directory.endswith('.dist-info') else 'PKG-INFO'
+        if metadata_file not in files:
+            continue
+        distribution = PathDistribution(pathlib.Path(files[metadata_file]).parent)
+        name = distribution.metadata['Name']
+        if not name:
+            continue
+        requires = None
+        if directory.endswith('.dist-info') or 'requires.txt' in files:
+            requires = distribution.requires
+        index.setdefault(normalize(name), {
+            'name': name,
+            'version': distribution.version,
+            'path': directory,
+            'requires': requires,
+            'entry_points': _read(files, 'entry_points.txt'),
+        })
+    return index
+
+
+def add_metadata_index(analysis):
+    """
+    Build the index of the metadata collected by *analysis*, and add it to its data files.
+
+    Returns the number of distributions indexed.
+    """
+    if not is_py38:
+        logger.warning("The metadata index requires importlib.metadata (Python >= 3.8); not building it.")
+        return 0
+    index = build_index(analysis.datas)
+    index_file = os.path.join(CONF['workpath'], 'importlib_metadata.json')
+    with open(index_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    analysis.datas.append((INDEX_NAME, index_file, 'DATA'))
+    logger.info("Indexed the metadata of %d distributions into %s.", len(index), INDEX_NAME)
+    return len(index)
@@ -0,0 +1,163 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+"""
+Static (non-importing) alternatives to :func:`PyInstaller.utils.hooks.get_module_attribute`.
+
+PyInstaller's helper starts an isolated Python process and imports the whole module just to read one attribute. Most
+of the attributes hooks are interested in are literals assigned at module level, or the module's location, both of
+which can be determined without importing anything. The helpers here do so, and fall back to PyInstaller's helper
+only if the static evaluation fails.
+"""
+
+import ast
+import importlib.machinery
+import sys
+
+from PyInstaller.utils import hooks as hookutils
+from PyInstaller.utils.hooks import is_module_satisfies, logger
+
+
+class _NotStatic(Exception):
+    pass
+
+
+def find_module_spec(module_name):
+    """
+    Locate *module_name* using only the default path-based finder, without importing it or any of its parent packages.
+
+    Returns the module's :class:`importlib.machinery.ModuleSpec` or None if it cannot be found this way (e.g., if it is
+    provided by a custom finder or if a parent package modifies its ``__path__`` at run-time).
+    """
+    spec = None
+    path = sys.path
+    parts = module_name.split(".")
+    for i in range(len(parts)):
+        spec = importlib.machinery.PathFinder.find_spec(".".join(parts[:i + 1]), path)
+        if spec is None:
+            return None
+        path = spec.submodule_search_locations
+        if path is None and i < len(parts) - 1:
+            return None
+    return spec
+
+
+def _is_mutated(tree, name):
+    """
+    Check whether module-level *name* may be rebound or modified in place anywhere in the module, other than by its
+    module-level assignments.
+    """
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Global) and name in node.names:
+            return True
+        if isinstance(node, (ast.AugAssign, ast.Delete)):
+            targets = node.targets if isinstance(node, ast.Delete) else [node.target]
+            if any(isinstance(target, ast.Name) and target.id == name for target in targets):
+                return True
+        # name.append(...), name[key] = ..., name.attr = ...
+        if isinstance(node, (ast.Attribute, ast.Subscript)) and isinstance(node.value, ast.Name) \
+                and node.value.id == name:
+            if isinstance(node, ast.Subscript) and isinstance(node.ctx, ast.Load):
+                continue
+            return True
+    return False
+
+
+def _static_attribute(module_name, attr_name, depth=0):
+    spec = find_module_spec(module_name)
+    if spec is None:
+        raise _NotStatic("module not found by the path-based finder")
+
+    if attr_name == "__path__" and spec.submodule_search_locations is not None:
+        return list(spec.submodule_search_locations)
+    if attr_name == "__file__" and spec.has_location:
+        return spec.origin
+
+    if not spec.origin or not spec.origin.endswith(tuple(importlib.machinery.SOURCE_SUFFIXES)):
+        raise _NotStatic("not a source module")
+    with open(spec.origin, "rb") as f:
+        tree = ast.parse(f.read(), spec.origin)
+
+    # Only unconditional module-level bindings are considered. Any binding inside if/try blocks or loops makes the
+    # value depend on run-time conditions.
+    bindings = []
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            if any(isinstance(target, ast.Name) and target.id == attr_name for target in node.targets):
+                bindings.append(node)
+        elif isinstance(node, ast.AnnAssign):
+            if isinstance(node.target, ast.Name) and node.target.id == attr_name and node.value is not None:
+                bindings.append(node)
+        elif isinstance(node, ast.ImportFrom):
+            if any(alias.name == "*" for alias in node.names):
+                raise _NotStatic("star import")
+            if any((alias.asname or alias.name) == attr_name for alias in node.names):
+                bindings.append(node)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) and node.name == attr_name:
+            raise _NotStatic("not a literal")
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and node.id == attr_name and isinstance(node.ctx, ast.Store) and \
+                not any(node in ast.walk(binding) for binding in bindings):
+            raise _NotStatic("conditionally bound")
+    if len(bindings) != 1 or _is_mutated(tree, attr_name):
+        raise _NotStatic("bound or modified more than once")
+
+    binding = bindings[0]
+    if isinstance(binding, ast.ImportFrom):
+        # Follow `from .submodule import attr`, a common pattern for __version__ and the like.
+        if depth > 3:
+            raise _NotStatic("import chain too long")
+        alias = next(alias for alias in binding.names if (alias.asname or alias.name) == attr_name)
+        if binding.level:
+            package = module_name if spec.submodule_search_locations is not None else module_name.rpartition(".")[0]
+            parts = package.split(".")
+            if binding.level > len(parts):
+                raise _NotStatic("relative import beyond top-level package")
+            source = ".".join(parts[:len(parts) - binding.level + 1] + ([binding.module] if binding.module else []))
+        else:
+            source = binding.module
+        return _static_attribute(source, alias.name, depth + 1)
+
+    try:
+        return ast.literal_eval(binding.value)
+    except (ValueError, TypeError):
+        raise _NotStatic("not a literal")
+
+
+def _imported_attribute(module_name, attr_name):
+    if is_module_satisfies("pyinstaller >= 5.0"):
+        return hookutils.get_module_attribute(module_name, attr_name)
+    # PyInstaller 4.x returns the str() of the attribute: evaluate its repr() instead.
+    output = hookutils.exec_statement(
+        f"import importlib; print(repr(getattr(importlib.import_module({module_name!r}), {attr_name!r})))"
+    )
+    try:
+        return ast.literal_eval(output.strip())
+    except (ValueError, TypeError, SyntaxError) as e:
+        raise AttributeError(f"Failed to retrieve attribute {attr_name} from module {module_name}") from e
+
+
+def get_module_attribute(module_name, attr_name):
+    """
+    Return the value of attribute *attr_name* of module *module_name*.
+
+    The attribute is evaluated statically if it is the module's ``__path__`` or ``__file__``, or if it is bound exactly
+    once, unconditionally, at module level to a literal expression (possibly through a chain of ``from ... import``
+    statements). Otherwise, this falls back to :func:`PyInstaller.utils.hooks.get_module_attribute`, which imports the
+    module in an isolated process and raises :class:`AttributeError` if the attribute cannot be retrieved. With
+    PyInstaller < 5.0, the module is imported by :func:`PyInstaller.utils.hooks.exec_statement` instead, and only
+    attributes whose value is a literal can be retrieved.
+    """
+    try:
+        return _static_attribute(module_name, attr_name)
+    except (_NotStatic, OSError, SyntaxError, ImportError) as e:
+        logger.debug("Cannot evaluate %s.%s statically (%s); importing %s.", module_name, attr_name, e, module_name)
+    return _imported_attribute(module_name, attr_name)
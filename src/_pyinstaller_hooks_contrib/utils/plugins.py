@@ -0,0 +1,179 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+"""
+Selection of the dynamically loaded plugins (backends, extensions, ...) collected by a hook.
+
+Hooks of libraries which load their plugins by name at run-time collect all of them as hidden imports, together with
+whatever optional dependencies they import. The plugins to collect can be restricted via the hooks configuration of
+the library's top-level package::
+
+    hooksconfig={
+        "rdflib": {
+            # Plugin module names, relative to the package holding the plugins. A package selects all plugins in it.
+            "plugins": ["parsers.notation3", "serializers.turtle", "sparql"],
+        },
+    }
+
+All plugins are collected if ``plugins`` is not set. Otherwise, the build log lists the modules which are not
+collected because of the excluded plugins. Plugins which are imported by the rest of the library or by the
+application are collected regardless.
+"""
+
+import ast
+import functools
+import importlib.machinery
+import os
+import sys
+import sysconfig
+
+from PyInstaller.utils.hooks import get_hook_config, is_module_or_submodule, logger
+
+from _pyinstaller_hooks_contrib.utils.module_attributes import find_module_spec
+
+
+@functools.lru_cache(maxsize=None)
+def _is_stdlib(top_level):
+    """
+    Check whether *top_level* is a module of the standard library, which is not worth reporting, nor scanning.
+    """
+    if hasattr(sys, "stdlib_module_names"):  # python >= 3.10
+        return top_level in sys.stdlib_module_names
+    if top_level in sys.builtin_module_names:
+        return True
+    # The module is located in the standard library directories of the base installation (with the site-packages
+    # directory excluded, as it may be one of their subdirectories).
+    spec = find_module_spec(top_level)
+    if spec is None or not spec.origin or not os.path.isabs(spec.origin):
+        return False
+    paths = sysconfig.get_paths()
+    origin = os.path.normcase(os.path.realpath(spec.origin))
+
+    def is_in(*keys):
+        directories = {os.path.normcase(os.path.realpath(paths[key])) for key in keys}
+        return any(origin.startswith(directory + os.sep) for directory in directories)
+
+    return is_in("stdlib", "platstdlib") and not is_in("purelib", "platlib")
+
+
+def _imported_names(name, spec):
+    """
+    List the (absolute) names of the modules which may be imported by the source of module *name*.
+    """
+    with open(spec.origin, "rb") as f:
+        tree = ast.parse(f.read(), spec.origin)
+    package = name if spec.submodule_search_locations is not None else name.rpartition(".")[0]
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                parts = package.split(".")
+                if node.level > len(parts):
+                    continue
+                base = ".".join(parts[:len(parts) - node.level + 1] + ([node.module] if node.module else []))
+            else:
+                base = node.module
+            names.append(base)
+            # "from package import name" may import submodule package.name.
+            names += [f"{base}.{alias.name}" for alias in node.names if alias.name != "*"]
+    return names
+
+
+def _import_closure(names, is_known):
+    """
+    Statically determine the modules transitively imported by the modules *names*, skipping the standard library and
+    the modules for which *is_known* returns True.
+
+    Only the package of *names* is scanned; other packages are reported by their top-level name, so that this is cheap
+    enough to run in every build. Returns the set of module names and the set of other top-level packages.
+    """
+    package = names[0].partition(".")[0] if names else None
+    closure = set()
+    others = set()
+    todo = list(names)
+    while todo:
+        name = todo.pop()
+        top_level = name.partition(".")[0]
+        if name in closure or top_level in others or _is_stdlib(top_level) or is_known(name):
+            continue
+        if top_level != package:
+            if not is_known(top_level) and find_module_spec(top_level) is not None:
+                others.add(top_level)
+            continue
+        spec = find_module_spec(name)
+        if spec is None:
+            continue
+        closure.add(name)
+        if "." in name:
+            todo.append(name.rpartition(".")[0])
+        if spec.origin and spec.origin.endswith(tuple(importlib.machinery.SOURCE_SUFFIXES)):
+            try:
+                todo += _imported_names(name, spec)
+            except (OSError, SyntaxError):
+                pass
+    return closure, others
+
+
+def _log_avoided_modules(hook_api, package, selected, excluded):
+    def is_known(name):
+        return hook_api.module_graph.find_node(name) is not None
+
+    modules, others = _import_closure(excluded, is_known)
+    selected_modules, selected_others = _import_closure(selected, is_known)
+    modules -= selected_modules
+    others -= selected_others
+    if modules or others:
+        logger.info(
+            "hook-%s: the excluded plugins do not pull in %d modules of %s and the packages: %s", package,
+            len(modules), package, ", ".join(sorted(others)) or "none"
+        )
+        logger.debug("hook-%s: modules not collected: %s", package, sorted(modules))
+
+
+def select_plugins(hook_api, package, namespace, plugins):
+    """
+    Return the names from *plugins*, the full names of the plugin modules in package *namespace*, which are selected by
+    the ``plugins`` option in the hooks configuration of *package*.
+    """
+    selection = get_hook_config(hook_api, package, "plugins")
+    if selection is None:
+        return list(plugins)
+    if isinstance(selection, str):
+        selection = [selection]
+
+    def relative_name(name):
+        return name[len(namespace) + 1:]
+
+    prefixes = []
+    for entry in selection:
+        prefix = f"{namespace}.{entry}"
+        if any(is_module_or_submodule(name, prefix) for name in plugins):
+            prefixes.append(prefix)
+        else:
+            logger.warning(
+                "hook-%s: unknown plugin %r in hooksconfig; available plugins: %s", package, entry,
+                ", ".join(relative_name(name) for name in plugins if name != namespace)
+            )
+
+    def is_selected(name):
+        # Parent packages of the selected plugins are imported anyway.
+        return any(is_module_or_submodule(name, prefix) or is_module_or_submodule(prefix, name) for prefix in prefixes)
+
+    selected = [name for name in plugins if is_selected(name)]
+    excluded = [name for name in plugins if not is_selected(name)]
+    logger.info(
+        "hook-%s: collecting %d of %d plugin modules; excluded: %s", package, len(selected), len(plugins),
+        ", ".join(relative_name(name) for name in excluded if name != namespace) or "none"
+    )
+    _log_avoided_modules(hook_api, package, selected, excluded)
+    return selected
@@ -0,0 +1,58 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+"""
+Build-time preprocessing of data files which libraries parse at run-time.
+
+Some libraries parse large text or JSON data files on import or first use. Their hooks can offer to do the parsing at
+build time instead: a *builder* function, run in an isolated process, pickles the parsed data into an output directory
+which is collected as ``_pyi_precompiled/<package>``. A runtime hook then feeds the unpickled data to the library.
+Runtime hooks must do nothing if that directory does not exist.
+
+The preprocessing is opt-in, per package::
+
+    hooksconfig={
+        "langdetect": {
+            "precompile_data": True,
+        },
+    }
+"""
+
+import os
+import shutil
+
+from PyInstaller.config import CONF
+from PyInstaller.utils.hooks import get_hook_config, is_module_satisfies, logger
+
+PRECOMPILED_DIR = '_pyi_precompiled'
+
+
+def precompile_data(hook_api, package, builder, *args):
+    """
+    If enabled for *package* in the hooks configuration, call ``builder(output_dir, *args)`` in an isolated process.
+
+    Returns the list of ``datas`` entries collecting *output_dir* as ``_pyi_precompiled/<package>``, which is empty if
+    the preprocessing is disabled, or not supported (PyInstaller < 5.0).
+    """
+    if not get_hook_config(hook_api, package, "precompile_data"):
+        return []
+    if not is_module_satisfies('pyinstaller >= 5.0'):
+        logger.warning("hook-%s: precompile_data requires PyInstaller >= 5.0; it is ignored.", package)
+        return []
+    from PyInstaller import isolated
+
+    output_dir = os.path.join(CONF['workpath'], PRECOMPILED_DIR, package)
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.makedirs(output_dir)
+
+    logger.info("hook-%s: precompiling data files.", package)
+    isolated.call(builder, output_dir, *args)
+    return [(output_dir, os.path.join(PRECOMPILED_DIR, package))]
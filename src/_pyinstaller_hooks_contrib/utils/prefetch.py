@@ -0,0 +1,239 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+"""
+Speculative computation of the expensive queries of the hooks, in the background.
+
+PyInstaller runs the hooks one after the other, as it finds their modules, and the hooks which collect the submodules
+of large packages or import them to query them (e.g., those of astropy, spacy, thinc or cassandra) block the build while
+their isolated subprocesses run. With prefetching enabled, the first of these hooks to run starts a pool of threads,
+which computes the :data:`QUERIES` of all of them, for the packages which are installed, while the build goes on. Each
+hook then picks up the results of its queries through :func:`prefetched`. A query which has not started yet when its
+hook needs it is computed by the hook itself.
+
+The log messages of a prefetched query are held back until its hook picks it up. Once all the hooks ran, i.e., when
+PyInstaller starts looking for the dynamic libraries, the pending queries are cancelled. The hits and misses are
+reported in the build log by the next call to :func:`prefetched` (i.e., in the next Analysis of a spec file), or when
+PyInstaller exits.
+
+The queries run the packages in isolated subprocesses, as the hooks do in the main thread. On POSIX, the pipes of an
+isolated subprocess are inheritable until it is started, so that a subprocess started meanwhile by another thread would
+inherit them, and keep them open: the subprocesses are therefore started one at a time, once prefetching started.
+
+Prefetching is opt-in, as it imports the installed packages in the background, whether the application uses them or
+not. It is enabled by setting the environment variable ``PYINSTALLER_HOOKS_PREFETCH`` to the number of threads of the
+pool, e.g., ``4``.
+"""
+
+import atexit
+import concurrent.futures
+import functools
+import logging
+import os
+import threading
+
+from PyInstaller.utils import hooks as hookutils
+from PyInstaller.utils.hooks import is_module_satisfies, logger
+
+from _pyinstaller_hooks_contrib.utils import module_attributes
+
+# The queries prefetched for each installed top-level package, as (function, args, kwargs) tuples.
+QUERIES = {
+    'astropy': [
+        (hookutils.collect_submodules, ('astropy',), {}),
+        (hookutils.collect_data_files, ('astropy',), {}),
+        (hookutils.collect_data_files, ('astropy',), {'include_py_files': True}),
+    ],
+    'cassandra': [
+        (hookutils.collect_submodules, ('cassandra',), {}),
+    ],
+    'sentry_sdk': [
+        (module_attributes.get_module_attribute, ('sentry_sdk.integrations', '_AUTO_ENABLING_INTEGRATIONS'), {}),
+    ],
+    'spacy': [
+        (hookutils.collect_submodules, ('spacy',), {}),
+        (hookutils.collect_data_files, ('spacy',), {}),
+    ],
+    'thinc': [
+        (hookutils.collect_submodules, ('thinc',), {}),
+        (hookutils.collect_data_files, ('thinc',), {}),
+    ],
+}
+
+# The message logged by PyInstaller once all the hooks ran.
+_HOOKS_DONE_MESSAGE = 'Looking for dynamic libraries'
+
+_prefetcher = None
+_spawn_lock = threading.Lock()
+
+
+def _key(function, args, kwargs):
+    # Functions are identified by their names, so that the wrappers of the helpers (e.g., in scripts/benchmark-hooks.py)
+    # match them.
+    return repr((function.__module__, function.__name__, args, sorted(kwargs.items())))
+
+
+def _workers():
+    value = os.environ.get('PYINSTALLER_HOOKS_PREFETCH', '')
+    try:
+        return max(int(value or 0), 0)
+    except ValueError:
+        logger.warning("Invalid PYINSTALLER_HOOKS_PREFETCH=%r: expected a number of threads.", value)
+        return 0
+
+
+def _serialize_isolated():
+    """
+    Start the isolated subprocesses of all the threads one at a time, for the rest of the build.
+    """
+    if not is_module_satisfies('pyinstaller >= 5.0'):
+        # No isolated subprocesses: the queries run theirs with the subprocess module, whose pipes are not inherited.
+        return
+    from PyInstaller import isolated
+
+    enter = isolated.Python.__enter__
+    if getattr(enter, 'serialized', False):
+        return
+
+    @functools.wraps(enter)
+    def __enter__(self):
+        with _spawn_lock:
+            return enter(self)
+
+    __enter__.serialized = True
+    isolated.Python.__enter__ = __enter__
+
+
+class _Prefetch:
+    """
+    A query computed in the background, with the log records it emitted.
+    """
+    def __init__(self):
+        self.future = None
+        self.records = []
+        self.used = False
+
+
+class _Prefetcher(logging.Filter):
+    """
+    The pool computing the queries, and the log filter holding back their records and detecting the end of the hooks.
+    """
+    def __init__(self, workers):
+        super().__init__()
+        self.pool = concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix='pyi-hooks-prefetch')
+        self.prefetches = {}
+        self.capturing = {}
+        self.hits = self.waits = self.misses = 0
+        self.hooks_done = False
+        _serialize_isolated()
+        self.handlers = logging.getLogger().handlers + logging.getLogger('PyInstaller').handlers
+        for handler in self.handlers:
+            handler.addFilter(self)
+
+        for package, queries in QUERIES.items():
+            if module_attributes.find_module_spec(package) is None:
+                continue
+            for function, args, kwargs in queries:
+                prefetch = _Prefetch()
+                prefetch.future = self.pool.submit(self._run, prefetch, function, args, kwargs)
+                self.prefetches[_key(function, args, kwargs)] = prefetch
+        logger.info("Prefetching %d hook queries in %d threads.", len(self.prefetches), workers)
+
+    def _run(self, prefetch, function, args, kwargs):
+        self.capturing[threading.get_ident()] = prefetch.records
+        try:
+            return function(*args, **kwargs)
+        finally:
+            del self.capturing[threading.get_ident()]
+
+    def filter(self, record):
+        records = self.capturing.get(threading.get_ident())
+        if records is not None:
+            # The filter is called by each handler.
+            if not records or records[-1] is not record:
+                records.append(record)
+            return False
+        if record.msg == _HOOKS_DONE_MESSAGE and not self.hooks_done:
+            # Called while the record is being handled: only cancel the pending queries, and report them later.
+            self.hooks_done = True
+            for prefetch in self.prefetches.values():
+                if not prefetch.used:
+                    prefetch.future.cancel()
+        return True
+
+    def get(self, function, args, kwargs):
+        prefetch = self.prefetches.get(_key(function, args, kwargs))
+        if prefetch is None or prefetch.used:
+            self.misses += 1
+            return function(*args, **kwargs)
+        prefetch.used = True
+        if prefetch.future.cancel():
+            self.misses += 1
+            return function(*args, **kwargs)
+        if prefetch.future.done():
+            self.hits += 1
+        else:
+            self.waits += 1
+        try:
+            return prefetch.future.result()
+        finally:
+            for record in prefetch.records:
+                logging.getLogger(record.name).handle(record)
+
+    def _remove_filter(self, future=None):
+        # This may be called while the handlers iterate over their filters: replace their lists.
+        if all(prefetch.future.done() for prefetch in self.prefetches.values()):
+            for handler in self.handlers:
+                handler.filters = [f for f in handler.filters if f is not self]
+
+    def shutdown(self):
+        unused = [prefetch for prefetch in self.prefetches.values() if not prefetch.used]
+        cancelled = sum(prefetch.future.cancel() for prefetch in unused)
+        # The queries which are still running are left to complete in the background, and their results and log records
+        # are dropped.
+        self.pool.shutdown(wait=False)
+        for prefetch in self.prefetches.values():
+            prefetch.future.add_done_callback(self._remove_filter)
+        logger.info(
+            "Prefetched hook queries: %d hits, %d waited for, %d misses, %d unused, %d cancelled.", self.hits,
+            self.waits, self.misses, len(unused) - cancelled, cancelled
+        )
+
+
+def prefetched(function, *args, **kwargs):
+    """
+    Return ``function(*args, **kwargs)``, from the background computation of the query if it was prefetched.
+
+    The first call starts the prefetching, if it is enabled.
+    """
+    global _prefetcher
+    if _prefetcher is not None and _prefetcher.hooks_done:
+        finish()
+    if _prefetcher is None:
+        workers = _workers()
+        if not workers:
+            return function(*args, **kwargs)
+        _prefetcher = _Prefetcher(workers)
+    return _prefetcher.get(function, args, kwargs)
+
+
+def finish():
+    """
+    Cancel the queries which were not used yet, and report the hits and misses. The next call to :func:`prefetched`
+    starts over, e.g., for the next Analysis of a spec file.
+    """
+    global _prefetcher
+    if _prefetcher is not None:
+        prefetcher, _prefetcher = _prefetcher, None
+        prefetcher.shutdown()
+
+
+atexit.register(finish)
@@ -0,0 +1,128 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+"""
+Collection of versioned shared libraries once, under the name they are loaded by.
+
+Packages which bundle their own shared libraries often ship each of them under several names: the development name
+(``libarrow.so``), the SONAME which the dynamic linker looks up (``libarrow.so.1500``) and the full version
+(``libarrow.so.1500.0.0``), either as symbolic links or, in wheels, as copies. Only the SONAME is needed at run-time.
+:func:`collect_by_soname` reduces each such chain to that name. The SONAME is read from the ELF dynamic section;
+for other formats (e.g., macOS ``libarrow.1500.dylib``), the name with a single version component is kept.
+"""
+
+import os
+import re
+import struct
+from collections import defaultdict
+
+from _pyinstaller_hooks_contrib.utils.dedup import find_duplicates
+
+_SHT_DYNAMIC = 6
+_DT_NULL = 0
+_DT_SONAME = 14
+
+_SINGLE_VERSION = re.compile(r'(\.so\.\d+|\.\d+\.dylib)$')
+_VERSIONED = re.compile(r'(\.so(\.\d+)+|(\.\d+)+\.dylib)$')
+
+
+def elf_soname(path):
+    """
+    Return the SONAME of the ELF shared library *path*, or None if it is not an ELF file or it has no SONAME.
+    """
+    try:
+        with open(path, 'rb') as f:
+            ident = f.read(16)
+            if len(ident) < 16 or ident[:4] != b'\x7fELF':
+                return None
+            is_64 = ident[4] == 2
+            endian = '<' if ident[5] == 1 else '>'
+            # The location of the section headers, in the ELF header.
+            if is_64:
+                f.seek(0x28)
+                shoff, = struct.unpack(endian + 'Q', f.read(8))
+                f.seek(0x3A)
+            else:
+                f.seek(0x20)
+                shoff, = struct.unpack(endian + 'I', f.read(4))
+                f.seek(0x2E)
+            shentsize, shnum = struct.unpack(endian + 'HH', f.read(4))
+
+            # (type, offset, size, link) of each section.
+            header_format = endian + ('IIQQQQIIQQ' if is_64 else 'IIIIIIIIII')
+            sections = []
+            for i in range(shnum):
+                f.seek(shoff + i * shentsize)
+                header = struct.unpack(header_format, f.read(struct.calcsize(header_format)))
+                sections.append((header[1], header[4], header[5], header[6]))
+
+            for section_type, offset, size, link in sections:
+                if section_type != _SHT_DYNAMIC:
+                    continue
+                f.seek(offset)
+                data = f.read(size)
+                entry_format = endian + ('qQ' if is_64 else 'iI')
+                data = data[:len(data) - len(data) % struct.calcsize(entry_format)]
+                for tag, value in struct.iter_unpack(entry_format, data):
+                    if tag == _DT_NULL:
+                        break
+                    if tag == _DT_SONAME:
+                        f.seek(sections[link][1] + value)
+                        return f.read(256).split(b'\0', 1)[0].decode('utf-8')
+    except (OSError, IndexError, struct.error, UnicodeDecodeError):
+        pass
+    return None
+
+
+def _runtime_name(names, soname):
+    if soname in names:
+        return soname
+    for pattern in (_SINGLE_VERSION, _VERSIONED):
+        candidates = sorted((name for name in names if pattern.search(name)), key=len)
+        if candidates:
+            return candidates[0]
+    return min(names, key=len)
+
+
+def collect_by_soname(binaries):
+    """
+    Reduce the (source, destination directory) tuples of *binaries* to one per shared library, under its SONAME.
+
+    Entries which are symbolic links to the same file, or copies with identical content, in the same destination
+    directory are considered as one library. The entry whose name is the SONAME of that library is kept, or else the
+    one with a single version component. Other entries are kept as they are.
+    """
+    # Group the entries by destination directory and real file.
+    groups = defaultdict(list)
+    for src, dest in binaries:
+        groups[(os.path.normpath(dest), os.path.realpath(src))].append(src)
+
+    # Merge the groups of copies.
+    merged = {key: key for key in groups}
+    by_dest = defaultdict(list)
+    for dest, real in groups:
+        by_dest[dest].append((real, real))
+    for dest, toc in by_dest.items():
+        for duplicates in find_duplicates(toc):
+            first = (dest, duplicates[0][1])
+            for _, real in duplicates[1:]:
+                merged[(dest, real)] = first
+
+    libraries = defaultdict(list)
+    for key, sources in groups.items():
+        libraries[merged[key]] += sources
+
+    result = []
+    for (dest, real), sources in libraries.items():
+        by_name = {os.path.basename(src): src for src in sources}
+        name = _runtime_name(by_name, elf_soname(real))
+        result.append((by_name[name], dest))
+    return sorted(result)
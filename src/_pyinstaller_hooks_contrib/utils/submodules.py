@@ -0,0 +1,93 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+"""
+Submodule collection which skips unwanted subtrees before looking at them.
+
+:func:`PyInstaller.utils.hooks.collect_submodules` imports every (sub)package it scans in an isolated process, and only
+then applies the hook's filter. Hooks which drop test suites or other large subtrees thus pay for importing them first.
+Moreover, the filter is also used to decide whether to descend into a subpackage, so a filter which selects modules
+by name (e.g., ``lambda name: name.endswith('.handlers')``) never reaches modules nested in subpackages whose names do
+not match.
+
+:func:`collect_submodules` here separates the two concerns: *prune* rules are applied while enumerating the package
+tree, and a pruned subpackage is neither imported nor walked; *filter* selects which of the remaining names are
+returned.
+"""
+
+import importlib.machinery
+import pkgutil
+
+from PyInstaller.utils import hooks as hookutils
+from PyInstaller.utils.hooks import is_module_or_submodule, logger
+
+from _pyinstaller_hooks_contrib.utils.module_attributes import find_module_spec
+
+
+def _make_pruner(prune):
+    if isinstance(prune, str) or callable(prune):
+        prune = [prune]
+    prefixes = [rule for rule in prune if isinstance(rule, str)]
+    predicates = [rule for rule in prune if not isinstance(rule, str)]
+
+    def is_pruned(name):
+        return any(is_module_or_submodule(name, prefix) for prefix in prefixes) or \
+            any(predicate(name) for predicate in predicates)
+
+    return is_pruned
+
+
+def collect_submodules(package, prune=(), filter=lambda name: True):
+    """
+    Return the sorted names of *package* and all its submodules, except for those excluded by *prune* or *filter*.
+
+    *prune* is a rule or a list of rules. A rule is either a module name, which excludes that module and, if it is a
+    package, all its submodules; or a callable which takes a module name and returns True to exclude that module and its
+    submodules. Pruned subpackages are not scanned at all.
+
+    *filter* is a callable which takes a module name and returns True if the module should be included in the result.
+    Unlike the filter of :func:`PyInstaller.utils.hooks.collect_submodules`, it does not prevent scanning of the
+    submodules of excluded packages.
+
+    The package tree is enumerated from the file system without importing anything. If *package* cannot be located
+    that way (e.g., because it is provided by a custom finder), this falls back to
+    :func:`PyInstaller.utils.hooks.collect_submodules`, which still honours the prune rules before importing a
+    subpackage.
+    """
+    is_pruned = _make_pruner(prune)
+
+    spec = find_module_spec(package)
+    if spec is None:
+        logger.debug("collect_submodules - %s not found on the file system; importing it.", package)
+        names = hookutils.collect_submodules(package, filter=lambda name: not is_pruned(name))
+        return [name for name in names if filter(name)]
+
+    submodules = []
+    todo = [(package, spec.submodule_search_locations)]
+    while todo:
+        name, paths = todo.pop()
+        if filter(name):
+            submodules.append(name)
+        if not paths:
+            continue
+        for _, subname, ispkg in pkgutil.iter_modules(paths, name + '.'):
+            if is_pruned(subname):
+                logger.debug("collect_submodules - pruned %s", subname)
+                continue
+            if ispkg:
+                subspec = importlib.machinery.PathFinder.find_spec(subname, paths)
+                todo.append((subname, subspec.submodule_search_locations if subspec else None))
+            elif filter(subname):
+                submodules.append(subname)
+
+    submodules.sort()
+    logger.debug("collect_submodules - found submodules: %s", submodules)
+    return submodules
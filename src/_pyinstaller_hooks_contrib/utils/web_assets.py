@@ -0,0 +1,85 @@
+# ------------------------------------------------------------------
+# Copyright (c) 2022 PyInstaller Development Team.
+#
+# This file is distributed under the terms of the GNU General Public
+# License (version 2.0 or later).
+#
+# The full license is available in LICENSE.GPL.txt, distributed with
+# this software.
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+# ------------------------------------------------------------------
+"""
+Filtering of the static web assets collected by the hooks of dashboarding and plotting libraries.
+
+Libraries like dash, bokeh and panel ship their JavaScript and CSS bundles both minified and unminified, along with
+source maps and test fixtures. In production mode they serve only the minified bundles; the others are used by their
+debugging/development modes. :func:`slim_web_assets` drops these development assets, unless told otherwise via the hooks
+configuration::
+
+    hooksconfig={
+        "web_assets": {
+            # Keep the development assets of all packages (True), or of the listed packages (default: False).
+            "keep_dev_assets": ["dash"],
+        },
+    }
+
+The development assets are needed for, e.g., ``dash.Dash.run(debug=True)``, or bokeh's ``Resources(minified=False)``.
+"""
+
+import os
+
+from PyInstaller.utils.hooks import get_hook_config, logger
+
+# Unminified file types which have a minified counterpart named *.min.<ext>.
+_MINIFIABLE_EXTENSIONS = ('.js', '.css')
+
+_TEST_DIRECTORIES = ('test', 'tests')
+
+
+def _is_dev_asset(src, dest, unminified_dirs):
+    """
+    Check whether the data file *src*, collected into *dest*, is only used in development mode.
+    """
+    filename = os.path.basename(src)
+    if filename.endswith(('.map', '.dev.js')):
+        return True
+    dest = os.path.normpath(dest)
+    if any(part in _TEST_DIRECTORIES for part in dest.split(os.sep)):
+        return True
+    base, ext = os.path.splitext(filename)
+    if dest in unminified_dirs and ext in _MINIFIABLE_EXTENSIONS and not base.endswith('.min'):
+        return os.path.isfile(os.path.join(os.path.dirname(src), base + '.min' + ext))
+    return False
+
+
+def slim_web_assets(hook_api, package, datas, unminified_dirs=()):
+    """
+    Remove the development web assets (source maps, ``*.dev.js`` bundles and test data) from the list of ``datas``
+    entries collected for *package*, unless configured otherwise.
+
+    *unminified_dirs* lists the destination directories (e.g., ``"bokeh/server/static/js"``) in which the library picks
+    either the minified or the unminified variant of its bundles, depending on its production/development mode. The
+    unminified variants of the files with a ``*.min.js`` or ``*.min.css`` counterpart in these directories are removed
+    as well. Vendored third-party files are often referenced by their unminified names, so this is not done elsewhere.
+    """
+    unminified_dirs = {os.path.normpath(path) for path in unminified_dirs}
+    keep = get_hook_config(hook_api, "web_assets", "keep_dev_assets")
+    if keep is True or (isinstance(keep, (list, tuple)) and package in keep):
+        return datas
+
+    kept = []
+    removed = set()
+    for src, dest in datas:
+        if _is_dev_asset(src, dest, unminified_dirs):
+            removed.add(src)
+        else:
+            kept.append((src, dest))
+
+    if removed:
+        logger.info(
+            "hook-%s: not collecting %d development web assets (%.1f MB). Set hooksconfig['web_assets']"
+            "['keep_dev_assets'] to keep them.", package, len(removed),
+            sum(os.path.getsize(src) for src in removed) / 1024 / 1024
+        )
+    return kept